@@ -0,0 +1,98 @@
+# benchmarks/memory_vector_index.py
+"""Benchmark the local memory vector index against brute-force search.
+
+Brute force is the per-row Python cosine loop the SQLite fallback used
+before the index: it is timed on up to --python-max vectors and
+extrapolated linearly beyond that. The index is built in a temporary
+directory (memory-mapped) and timed for top-k queries.
+
+Usage:
+    python -m benchmarks.memory_vector_index
+    python -m benchmarks.memory_vector_index --sizes 10000 100000 1000000 --dimensions 384
+"""
+
+import argparse
+import heapq
+import math
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+
+from maios.core.memory.vector_index import VectorIndex
+
+# Vectors added per call while building, as the index sync does
+BUILD_BATCH = 10_000
+
+
+def python_cosine_distance(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return 1.0 - dot / norm
+
+
+def python_search(rows: list[list[float]], query: list[float], k: int) -> list[int]:
+    scored = ((i, python_cosine_distance(query, row)) for i, row in enumerate(rows))
+    return [i for i, _ in heapq.nsmallest(k, scored, key=lambda pair: pair[1])]
+
+
+def time_queries(search, queries: np.ndarray) -> float:
+    """Median milliseconds per query."""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(size: int, dimensions: int, k: int, queries: int, python_max: int) -> None:
+    rng = np.random.default_rng(size)
+    query_vectors = rng.standard_normal((queries, dimensions)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(directory)
+        start = time.perf_counter()
+        for offset in range(0, size, BUILD_BATCH):
+            count = min(BUILD_BATCH, size - offset)
+            vectors = rng.standard_normal((count, dimensions)).astype(np.float32)
+            index.add([uuid4() for _ in range(count)], vectors)
+        index.flush()
+        build_s = time.perf_counter() - start
+        file_mb = sum(f.stat().st_blocks * 512 for f in Path(directory).iterdir()) / 1e6
+
+        index_ms = time_queries(lambda q: index.search(q, k), query_vectors)
+        start = time.perf_counter()
+        VectorIndex(directory)
+        reopen_ms = (time.perf_counter() - start) * 1000
+
+    sample = min(size, python_max)
+    rows = rng.standard_normal((sample, dimensions)).tolist()
+    python_ms = time_queries(lambda q: python_search(rows, q.tolist(), k), query_vectors[:3])
+    python_ms *= size / sample
+    estimated = " (extrapolated)" if sample < size else ""
+
+    print(f"vectors: {size:,} x {dimensions}")
+    print(f"  build:        {build_s:.1f} s, {file_mb:.0f} MB on disk, reopen {reopen_ms:.0f} ms")
+    print(f"  index top-{k}: {index_ms:.2f} ms/query")
+    print(f"  brute force:  {python_ms:.1f} ms/query{estimated}")
+    print(f"  speedup:      {python_ms / index_ms:.0f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--python-max", type=int, default=10_000, help="Largest brute-force run")
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.dimensions, args.k, args.queries, args.python_max)
+
+
+if __name__ == "__main__":
+    main()
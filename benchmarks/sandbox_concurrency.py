@@ -0,0 +1,75 @@
+# benchmarks/sandbox_concurrency.py
+"""Benchmark concurrent sandbox executions.
+
+Runs N snippets that each sleep for T seconds and reports wall time. With
+executions off the event loop, wall time should be close to
+ceil(N / SANDBOX_MAX_CONCURRENT) * T rather than N * T.
+
+Usage:
+    python -m benchmarks.sandbox_concurrency -n 8 -t 2 --max-concurrent 8
+    python -m benchmarks.sandbox_concurrency --fake   # no Docker needed
+"""
+
+import argparse
+import asyncio
+import math
+import time
+from unittest.mock import MagicMock
+
+from maios.sandbox.manager import SandboxManager
+from maios.sandbox.models import ExecutionRequest
+
+
+def fake_client(delay: float) -> MagicMock:
+    """Docker client stand-in whose containers block for ``delay`` seconds."""
+    client = MagicMock()
+
+    def create(**kwargs):
+        container = MagicMock()
+        container.id = "benchmark-container"
+        container.wait.side_effect = lambda timeout=None: time.sleep(delay) or {"StatusCode": 0}
+        container.logs.return_value = b""
+        return container
+
+    client.containers.create.side_effect = create
+    return client
+
+
+async def run(count: int, seconds: float, max_concurrent: int, fake: bool) -> None:
+    manager = SandboxManager(max_concurrent=max_concurrent, use_pool=False, backend="docker")
+    if fake:
+        manager.docker._client = fake_client(seconds)
+
+    request = ExecutionRequest(
+        language="python",
+        code=f"import time; time.sleep({seconds})",
+        timeout_seconds=int(seconds) + 30,
+    )
+
+    start = time.monotonic()
+    results = await asyncio.gather(*(manager.execute_code(request) for _ in range(count)))
+    elapsed = time.monotonic() - start
+    manager.shutdown()
+
+    failures = [r.error or r.stderr for r in results if not r.is_success()]
+    ideal = math.ceil(count / max_concurrent) * seconds
+    print(f"executions:     {count} x {seconds}s (max concurrent {max_concurrent})")
+    print(f"wall time:      {elapsed:.2f}s")
+    print(f"sequential:     {count * seconds:.2f}s")
+    print(f"ideal bounded:  {ideal:.2f}s")
+    if failures:
+        print(f"failures:       {len(failures)} (first: {failures[0]})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=8)
+    parser.add_argument("-t", "--seconds", type=float, default=1.0)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--fake", action="store_true", help="Use a fake Docker client")
+    args = parser.parse_args()
+    asyncio.run(run(args.count, args.seconds, args.max_concurrent, args.fake))
+
+
+if __name__ == "__main__":
+    main()
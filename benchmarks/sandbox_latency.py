@@ -0,0 +1,64 @@
+# benchmarks/sandbox_latency.py
+"""Benchmark sandbox latency per backend and with or without the warm pool.
+
+Runs a trivial snippet repeatedly and reports p50/p95 latency. The Docker
+backend needs a daemon with the sandbox images pulled.
+
+Usage:
+    python -m benchmarks.sandbox_latency -n 50
+    python -m benchmarks.sandbox_latency -n 20 --no-pool
+    python -m benchmarks.sandbox_latency -n 50 --backend namespace
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from maios.sandbox.manager import SandboxManager
+from maios.sandbox.models import ExecutionRequest
+
+
+async def run(count: int, use_pool: bool, language: str, backend: str) -> None:
+    manager = SandboxManager(max_concurrent=1, use_pool=use_pool, backend=backend)
+    code = "print('ok')" if language == "python" else "console.log('ok')"
+    request = ExecutionRequest(language=language, code=code)
+
+    if use_pool and backend == "docker":
+        # Exclude the one-off warm-up cost from the measured runs
+        await manager.execute_code(request)
+
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        result = await manager.execute_code(request)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not result.is_success():
+            print(f"run failed: {result.error or result.stderr}")
+            break
+
+    pool_stats = manager.pool_stats()
+    manager.shutdown()
+
+    latencies.sort()
+    mode = backend if backend != "docker" else ("warm pool" if use_pool else "one-off containers")
+    print(f"mode:   {mode} ({language})")
+    print(f"runs:   {len(latencies)}")
+    print(f"p50:    {statistics.median(latencies):.1f} ms")
+    print(f"p95:    {latencies[int(len(latencies) * 0.95) - 1]:.1f} ms")
+    if pool_stats:
+        print(f"pool:   hits={pool_stats['hits']} misses={pool_stats['misses']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--count", type=int, default=50)
+    parser.add_argument("--language", choices=["python", "javascript"], default="python")
+    parser.add_argument("--no-pool", action="store_true", help="Use one-off containers")
+    parser.add_argument("--backend", choices=["docker", "namespace"], default="docker")
+    args = parser.parse_args()
+    asyncio.run(run(args.count, not args.no_pool, args.language, args.backend))
+
+
+if __name__ == "__main__":
+    main()
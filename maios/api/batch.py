@@ -0,0 +1,139 @@
+# maios/api/batch.py
+"""Helpers for batch create/update endpoints.
+
+Items are validated one by one so a bad item is reported by its index
+instead of failing the whole request. Valid items are then written with a
+single multi-row ``INSERT ... RETURNING`` (or one executemany ``UPDATE``).
+"""
+
+import datetime
+from collections.abc import Iterable
+from typing import Any, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select, update
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from maios.models.schemas import BatchItemError
+
+# Maximum number of items accepted by a single batch request
+MAX_BATCH_SIZE = 1000
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic validation error into one readable line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'item'}: {e['msg']}" for e in error.errors()
+    )
+
+
+def validate_creates(
+    raw_items: list[Any],
+    schema: type[BaseModel],
+    model: type[SQLModel],
+) -> tuple[list[tuple[int, dict[str, Any]]], list[BatchItemError]]:
+    """Validate create payloads against the API schema and the table model.
+
+    Returns:
+        (index, row) pairs ready for insert, and errors for invalid items
+    """
+    rows: list[tuple[int, dict[str, Any]]] = []
+    errors: list[BatchItemError] = []
+
+    for index, raw in enumerate(raw_items):
+        try:
+            data = schema.model_validate(raw)
+            rows.append((index, model.model_validate(data.model_dump()).model_dump()))
+        except ValidationError as e:
+            errors.append(BatchItemError(index=index, error=format_validation_error(e)))
+
+    return rows, errors
+
+
+def validate_updates(
+    raw_items: list[Any],
+    schema: type[BaseModel],
+) -> tuple[list[tuple[int, UUID, dict[str, Any]]], list[BatchItemError]]:
+    """Validate update payloads; each must carry an ``id`` that appears only once.
+
+    Returns:
+        (index, id, changes) triples, and errors for invalid items
+    """
+    updates: list[tuple[int, UUID, dict[str, Any]]] = []
+    errors: list[BatchItemError] = []
+    seen: set[UUID] = set()
+
+    for index, raw in enumerate(raw_items):
+        try:
+            data = schema.model_validate(raw)
+        except ValidationError as e:
+            errors.append(BatchItemError(index=index, error=format_validation_error(e)))
+            continue
+
+        changes = data.model_dump(exclude_unset=True)
+        item_id = changes.pop("id")
+        if item_id in seen:
+            errors.append(BatchItemError(index=index, id=item_id, error="Duplicate id in batch"))
+            continue
+
+        seen.add(item_id)
+        updates.append((index, item_id, changes))
+
+    return updates, errors
+
+
+async def existing_ids(
+    session: AsyncSession,
+    model: type[SQLModel],
+    ids: Iterable[UUID],
+) -> set[UUID]:
+    """Return which of the given primary keys exist, in one query."""
+    wanted = set(ids)
+    if not wanted:
+        return set()
+
+    result = await session.execute(select(model.id).where(model.id.in_(wanted)))
+    return set(result.scalars().all())
+
+
+async def bulk_insert(
+    session: AsyncSession,
+    model: type[ModelT],
+    rows: list[dict[str, Any]],
+) -> list[ModelT]:
+    """Insert rows with one multi-row INSERT ... RETURNING, preserving order."""
+    if not rows:
+        return []
+
+    result = await session.execute(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        rows,
+    )
+    return list(result.scalars().all())
+
+
+async def bulk_update(
+    session: AsyncSession,
+    model: type[ModelT],
+    updates: list[dict[str, Any]],
+) -> list[ModelT]:
+    """Apply per-row changes by primary key and return the fresh rows in order.
+
+    Each dict must contain ``id``; ``updated_at`` is set on every row.
+    """
+    if not updates:
+        return []
+
+    now = datetime.datetime.utcnow()
+    await session.execute(update(model), [{**changes, "updated_at": now} for changes in updates])
+
+    ids = [changes["id"] for changes in updates]
+    result = await session.execute(
+        select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    by_id = {row.id: row for row in result.scalars().all()}
+    return [by_id[item_id] for item_id in ids]
@@ -0,0 +1,17 @@
+# maios/api/dependencies.py
+"""Shared FastAPI dependencies for MAIOS routes."""
+
+from typing import Optional
+
+from fastapi import Header
+
+
+def use_cache(cache_control: Optional[str] = Header(None)) -> bool:
+    """Whether this request may be served from the entity cache.
+
+    Clients bypass the cache with ``Cache-Control: no-cache`` (or ``no-store``).
+    """
+    if cache_control is None:
+        return True
+    directives = {d.strip().lower() for d in cache_control.split(",")}
+    return not directives & {"no-cache", "no-store"}
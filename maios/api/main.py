@@ -3,10 +3,11 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket
 
-from maios.api.routes import agents, health, health_detailed, projects
+from maios.api.routes import agents, health, health_detailed, memories, projects, tasks
 from maios.api.websocket import websocket_endpoint
 from maios.core.config import settings
-from maios.core.database import close_db, init_db
+from maios.core.database import close_db, get_engine, init_db
+from maios.core.memory.access import get_access_tracker
 from maios.core.redis import close_redis
 
 
@@ -15,8 +16,13 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     await init_db()
+    health_detailed.health_monitor.start()
+    access_tracker = get_access_tracker(get_engine().sync_engine)
+    access_tracker.start()
     yield
     # Shutdown
+    await health_detailed.health_monitor.stop()
+    await access_tracker.stop()
     await close_db()
     await close_redis()
 
@@ -33,6 +39,8 @@ app.include_router(health.router, tags=["health"])
 app.include_router(health_detailed.router, tags=["health"])
 app.include_router(projects.router, tags=["projects"])
 app.include_router(agents.router, tags=["agents"])
+app.include_router(tasks.router, tags=["tasks"])
+app.include_router(memories.router, tags=["memories"])
 
 
 @app.get("/")
@@ -0,0 +1,63 @@
+# maios/api/pagination.py
+"""Keyset (cursor) pagination helpers for list endpoints.
+
+List endpoints order rows by ``(created_at, id)`` descending and seek past
+the last row of the previous page, so every page costs one index range scan
+regardless of how deep it is. The cursor is an opaque, URL-safe token.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode a row position as an opaque cursor."""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor into its row position.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def apply_keyset(query: Select, model: Any, cursor: Optional[str], limit: int) -> Select:
+    """Order a query by (created_at, id) descending and seek past the cursor.
+
+    Fetches one extra row so the caller can tell whether another page exists.
+    """
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def split_page(rows: Sequence[T], limit: int) -> tuple[list[T], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    if len(rows) <= limit:
+        return list(rows), None
+
+    page = list(rows[:limit])
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
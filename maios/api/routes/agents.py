@@ -2,16 +2,34 @@
 """Agents API routes for MAIOS."""
 
 import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from maios.api.batch import (
+    MAX_BATCH_SIZE,
+    bulk_insert,
+    bulk_update,
+    existing_ids,
+    validate_creates,
+    validate_updates,
+)
+from maios.api.dependencies import use_cache
+from maios.api.pagination import NEXT_CURSOR_HEADER, apply_keyset, split_page
+from maios.core.cache import entity_cache
 from maios.core.database import get_session
 from maios.models.agent import Agent, AgentStatus
-from maios.models.schemas import AgentCreate, AgentRead, AgentUpdate
+from maios.models.schemas import (
+    AgentBatchUpdate,
+    AgentCreate,
+    AgentRead,
+    AgentUpdate,
+    BatchItemError,
+    BatchResult,
+)
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
@@ -39,35 +57,107 @@ async def create_agent(
     return agent
 
 
+@router.post("/batch", response_model=BatchResult[AgentRead])
+async def create_agents_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> BatchResult:
+    """Create many agents with a single multi-row insert.
+
+    Invalid items are reported in ``errors`` by index; the rest are created.
+    """
+    rows, errors = validate_creates(items, AgentCreate, Agent)
+    agents = await bulk_insert(session, Agent, [row for _, row in rows])
+    await session.commit()
+    return BatchResult[AgentRead](items=agents, errors=errors)
+
+
+@router.patch("/batch", response_model=BatchResult[AgentRead])
+async def update_agents_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> BatchResult:
+    """Update many agents by ID.
+
+    Each item carries the ``id`` of the agent and the fields to change.
+    Unknown IDs and invalid items are reported in ``errors`` by index.
+    """
+    updates, errors = validate_updates(items, AgentBatchUpdate)
+    found = await existing_ids(session, Agent, [item_id for _, item_id, _ in updates])
+
+    changes = []
+    for index, item_id, data in updates:
+        if item_id not in found:
+            errors.append(BatchItemError(index=index, id=item_id, error="Agent not found"))
+            continue
+        changes.append({"id": item_id, **data})
+
+    agents = await bulk_update(session, Agent, changes)
+    await session.commit()
+    await entity_cache.invalidate(Agent, *(change["id"] for change in changes))
+    errors.sort(key=lambda e: e.index)
+    return BatchResult[AgentRead](items=agents, errors=errors)
+
+
 @router.get("", response_model=list[AgentRead])
 async def list_agents(
+    response: Response,
     status: Optional[AgentStatus] = Query(None, description="Filter by agent status"),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous page's X-Next-Cursor header"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True, description="Offset pagination (ignored when cursor is set)"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     session: AsyncSession = Depends(get_session),
 ) -> list[Agent]:
-    """List all agents with optional filtering and pagination."""
+    """List agents newest first, with optional filtering and keyset pagination.
+
+    When more agents are available, the cursor for the next page is returned
+    in the X-Next-Cursor response header.
+    """
     query = select(Agent)
 
     if status is not None:
         query = query.where(Agent.status == status)
 
-    query = query.offset(skip).limit(limit).order_by(Agent.created_at.desc())
+    try:
+        query = apply_keyset(query, Agent, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if cursor is None and skip:
+        query = query.offset(skip)
 
     result = await session.execute(query)
-    agents = result.scalars().all()
-    return list(agents)
+    agents, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return agents
 
 
 @router.get("/{agent_id}", response_model=AgentRead)
 async def get_agent(
     agent_id: UUID,
+    cached: bool = Depends(use_cache),
     session: AsyncSession = Depends(get_session),
-) -> Agent:
-    """Get a specific agent by ID."""
+) -> Agent | AgentRead:
+    """Get a specific agent by ID.
+
+    Served from the entity cache when possible; send
+    ``Cache-Control: no-cache`` to read from the database.
+    """
+    if cached:
+        hit = await entity_cache.get(Agent, agent_id, AgentRead)
+        if hit is not None:
+            return hit
+
     agent = await session.get(Agent, agent_id)
     if agent is None:
         raise HTTPException(status_code=404, detail="Agent not found")
+
+    await entity_cache.set(Agent, agent, AgentRead)
     return agent
 
 
@@ -90,4 +180,5 @@ async def update_agent(
     session.add(agent)
     await session.commit()
     await session.refresh(agent)
+    await entity_cache.invalidate(Agent, agent.id)
     return agent
@@ -1,37 +1,213 @@
-"""Detailed health API routes for MAIOS."""
+"""Detailed health API routes for MAIOS.
 
+Task, agent and Docker health are collected into one snapshot by a
+background refresher started with the app, and endpoints serve that
+snapshot from memory. Each response reports when the snapshot was taken
+and its age; pass ``?fresh=1`` to force a refresh first.
+"""
+
+import asyncio
+import logging
+import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from maios.core.database import async_session, engine
+from maios.core.cache import entity_cache
+from maios.core.config import settings
+from maios.core.database import async_session, get_pool_status
+from maios.core.memory.query_cache import memory_query_cache
 from maios.sandbox import sandbox_manager
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/health", tags=["health"])
 
+# Task statuses counted as active work
+ACTIVE_TASK_STATUSES = ("pending", "assigned", "in_progress")
+
+
+async def collect_health_snapshot() -> dict[str, Any]:
+    """Collect task, agent and Docker health in one pass.
+
+    Runs one GROUP BY per table and pings Docker off the event loop.
+    Database failures are recorded in the snapshot rather than raised.
+    """
+    from maios.models.agent import Agent
+    from maios.models.task import Task
+
+    started = time.perf_counter()
+    snapshot: dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc),
+        "database": {"healthy": False, "error": None},
+        "tasks": None,
+        "agents": None,
+    }
+
+    try:
+        async with async_session() as session:
+            task_result = await session.execute(
+                select(Task.status, func.count(Task.id)).group_by(Task.status)
+            )
+            task_counts = {str(row[0].value): row[1] for row in task_result.all()}
+
+            agent_result = await session.execute(
+                select(
+                    Agent.status,
+                    func.count(Agent.id),
+                    func.sum(Agent.tasks_completed),
+                    func.sum(Agent.tasks_failed),
+                )
+                .where(Agent.is_active == True)
+                .group_by(Agent.status)
+            )
+            agent_rows = agent_result.all()
+
+        agent_counts = {str(row[0].value): row[1] for row in agent_rows}
+        snapshot["tasks"] = {
+            "by_status": task_counts,
+            "total": sum(task_counts.values()),
+            "active": sum(task_counts.get(s, 0) for s in ACTIVE_TASK_STATUSES),
+        }
+        snapshot["agents"] = {
+            "by_status": agent_counts,
+            "total": sum(agent_counts.values()),
+            "working": agent_counts.get("working", 0),
+            "tasks_completed": sum(row[2] or 0 for row in agent_rows),
+            "tasks_failed": sum(row[3] or 0 for row in agent_rows),
+        }
+        snapshot["database"]["healthy"] = True
+    except Exception as e:
+        logger.warning(f"Health snapshot database query failed: {e}")
+        snapshot["database"]["error"] = str(e)
+
+    # Docker SDK calls block, so keep them off the event loop
+    docker_healthy = await asyncio.to_thread(sandbox_manager.is_healthy)
+    containers: dict[str, Any] = {"items": [], "error": None}
+    if docker_healthy:
+        try:
+            containers["items"] = await asyncio.to_thread(sandbox_manager.list_active_containers)
+        except Exception as e:
+            containers["error"] = str(e)
+    else:
+        containers["error"] = "Docker daemon not available"
+
+    snapshot["docker"] = {"healthy": docker_healthy}
+    snapshot["containers"] = containers
+    snapshot["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return snapshot
+
+
+class HealthMonitor:
+    """Keeps an in-memory health snapshot refreshed on an interval.
+
+    Concurrent refreshes are coalesced: callers that arrive while one is
+    running wait for it and share its result. When the background loop is
+    not running (e.g. app started without its lifespan) every read
+    collects a new snapshot.
+    """
+
+    def __init__(self, interval_seconds: Optional[float] = None):
+        self._interval_seconds = interval_seconds
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._refreshing: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def interval_seconds(self) -> float:
+        """Seconds between background refreshes."""
+        if self._interval_seconds is not None:
+            return self._interval_seconds
+        return settings.health_refresh_interval_seconds
+
+    @property
+    def running(self) -> bool:
+        """Whether the background refresh loop is active."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def snapshot(self) -> Optional[dict[str, Any]]:
+        """The last collected snapshot, if any."""
+        return self._snapshot
+
+    async def refresh(self) -> dict[str, Any]:
+        """Collect a new snapshot, joining a refresh already in progress."""
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._collect())
+        # Shield so one cancelled caller does not abort the shared refresh
+        return await asyncio.shield(self._refreshing)
+
+    async def _collect(self) -> dict[str, Any]:
+        try:
+            self._snapshot = await collect_health_snapshot()
+            return self._snapshot
+        finally:
+            self._refreshing = None
+
+    async def get(self, fresh: bool = False) -> dict[str, Any]:
+        """Return the current snapshot, refreshing if asked or not yet available."""
+        if fresh or self._snapshot is None or not self.running:
+            return await self.refresh()
+        return self._snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health snapshot refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the background refresh loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        """Stop the background refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global health monitor instance
+health_monitor = HealthMonitor()
+
+
+def _staleness(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """Timestamp and age fields for a response built from a snapshot."""
+    generated_at: datetime = snapshot["generated_at"]
+    age = (datetime.now(timezone.utc) - generated_at).total_seconds()
+    return {
+        "timestamp": generated_at.isoformat(),
+        "age_seconds": round(max(age, 0.0), 3),
+    }
+
+
+def _require_database(snapshot: dict[str, Any]) -> None:
+    if not snapshot["database"]["healthy"]:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
 
 @router.get("/status")
-async def system_health() -> dict[str, Any]:
+async def system_health(
+    fresh: bool = Query(False, description="Refresh the snapshot before responding"),
+) -> dict[str, Any]:
     """Get overall system health status.
 
     Returns health status of all major components:
-    - Database connectivity
+    - Database connectivity and connection pool usage
     - Docker sandbox availability
     """
-    # Check database
-    database_healthy = False
-    try:
-        async with engine.connect() as conn:
-            await conn.execute(select(1))
-        database_healthy = True
-    except Exception as e:
-        pass
-
-    # Check Docker
-    docker_healthy = sandbox_manager.is_healthy()
+    snapshot = await health_monitor.get(fresh=fresh)
+    database_healthy = snapshot["database"]["healthy"]
+    docker_healthy = snapshot["docker"]["healthy"]
 
     # Determine overall status
     if database_healthy:
@@ -41,11 +217,12 @@ async def system_health() -> dict[str, Any]:
 
     return {
         "status": overall_status,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **_staleness(snapshot),
         "components": {
             "database": {
                 "status": "healthy" if database_healthy else "unhealthy",
                 "type": "postgresql",
+                "pool": get_pool_status(),
             },
             "docker": {
                 "status": "healthy" if docker_healthy else "unavailable",
@@ -55,153 +232,105 @@ async def system_health() -> dict[str, Any]:
     }
 
 
+@router.get("/database")
+async def database_health() -> dict[str, Any]:
+    """Get database connection pool health.
+
+    Returns pool size, checked-out connections, saturation and
+    checkout wait times for this process.
+    """
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "pool": get_pool_status(),
+    }
+
+
 @router.get("/tasks")
-async def task_health() -> dict[str, Any]:
+async def task_health(
+    fresh: bool = Query(False, description="Refresh the snapshot before responding"),
+) -> dict[str, Any]:
     """Get task health summary.
 
     Returns counts of tasks by status.
     """
-    from maios.models.task import Task, TaskStatus
-
-    async with async_session() as session:
-        # Count by status
-        result = await session.execute(
-            select(Task.status, func.count(Task.id)).group_by(Task.status)
-        )
-        status_counts = {str(row[0].value): row[1] for row in result.all()}
-
-        # Get active task count
-        active_result = await session.execute(
-            select(func.count(Task.id)).where(
-                Task.status.in_([
-                    TaskStatus.PENDING,
-                    TaskStatus.ASSIGNED,
-                    TaskStatus.IN_PROGRESS,
-                ])
-            )
-        )
-        active_count = active_result.scalar() or 0
-
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "by_status": status_counts,
-            "total": sum(status_counts.values()),
-            "active": active_count,
-        }
+    snapshot = await health_monitor.get(fresh=fresh)
+    _require_database(snapshot)
+    return {**_staleness(snapshot), **snapshot["tasks"]}
 
 
 @router.get("/agents")
-async def agent_health() -> dict[str, Any]:
+async def agent_health(
+    fresh: bool = Query(False, description="Refresh the snapshot before responding"),
+) -> dict[str, Any]:
     """Get agent health summary.
 
     Returns counts of agents by status and health metrics.
     """
-    from maios.models.agent import Agent, AgentStatus
-
-    async with async_session() as session:
-        # Count by status
-        result = await session.execute(
-            select(Agent.status, func.count(Agent.id))
-            .where(Agent.is_active == True)
-            .group_by(Agent.status)
-        )
-        status_counts = {str(row[0].value): row[1] for row in result.all()}
-
-        # Get working agents
-        working_result = await session.execute(
-            select(func.count(Agent.id)).where(
-                Agent.is_active == True,
-                Agent.status == AgentStatus.WORKING,
-            )
-        )
-        working_count = working_result.scalar() or 0
-
-        # Get total active
-        total_result = await session.execute(
-            select(func.count(Agent.id)).where(Agent.is_active == True)
-        )
-        total_active = total_result.scalar() or 0
-
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "by_status": status_counts,
-            "total": total_active,
-            "working": working_count,
-        }
+    snapshot = await health_monitor.get(fresh=fresh)
+    _require_database(snapshot)
+    agents = snapshot["agents"]
+    return {
+        **_staleness(snapshot),
+        "by_status": agents["by_status"],
+        "total": agents["total"],
+        "working": agents["working"],
+    }
 
 
 @router.get("/containers")
-async def container_health() -> dict[str, Any]:
+async def container_health(
+    fresh: bool = Query(False, description="Refresh the snapshot before responding"),
+) -> dict[str, Any]:
     """Get sandbox container health.
 
     Returns information about active sandbox containers.
     """
-    try:
-        containers = sandbox_manager.list_active_containers()
-        docker_healthy = sandbox_manager.is_healthy()
-
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "docker_available": docker_healthy,
-            "active_containers": len(containers),
-            "containers": containers,
-        }
-    except Exception as e:
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "docker_available": False,
-            "error": str(e),
-            "active_containers": 0,
-            "containers": [],
-        }
+    snapshot = await health_monitor.get(fresh=fresh)
+    containers = snapshot["containers"]
+    response = {
+        **_staleness(snapshot),
+        "docker_available": snapshot["docker"]["healthy"],
+        "active_containers": len(containers["items"]),
+        "containers": containers["items"],
+    }
+    if containers["error"]:
+        response["error"] = containers["error"]
+    return response
 
 
 @router.get("/metrics")
-async def system_metrics() -> dict[str, Any]:
+async def system_metrics(
+    fresh: bool = Query(False, description="Refresh the snapshot before responding"),
+) -> dict[str, Any]:
     """Get aggregated system metrics.
 
     Returns combined metrics for tasks, agents, and system.
     """
-    from maios.models.agent import Agent
-    from maios.models.task import Task, TaskStatus
-
-    async with async_session() as session:
-        # Task metrics
-        task_result = await session.execute(
-            select(Task.status, func.count(Task.id)).group_by(Task.status)
-        )
-        task_counts = {str(row[0].value): row[1] for row in task_result.all()}
-
-        # Agent metrics
-        agent_result = await session.execute(
-            select(
-                func.count(Agent.id).label("total"),
-                func.sum(Agent.tasks_completed).label("completed"),
-                func.sum(Agent.tasks_failed).label("failed"),
-            ).where(Agent.is_active == True)
-        )
-        agent_row = agent_result.one()
-        agent_total = agent_row.total or 0
-        tasks_completed = agent_row.completed or 0
-        tasks_failed = agent_row.failed or 0
-
-        # Calculate success rate
-        total_tasks = tasks_completed + tasks_failed
-        success_rate = round(tasks_completed / max(total_tasks, 1) * 100, 1)
-
-        return {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "tasks": {
-                "by_status": task_counts,
-                "total": sum(task_counts.values()),
-            },
-            "agents": {
-                "total": agent_total,
-                "tasks_completed": tasks_completed,
-                "tasks_failed": tasks_failed,
-                "success_rate": success_rate,
-            },
-            "system": {
-                "docker_available": sandbox_manager.is_healthy(),
-            },
-        }
+    snapshot = await health_monitor.get(fresh=fresh)
+    _require_database(snapshot)
+    tasks = snapshot["tasks"]
+    agents = snapshot["agents"]
+
+    # Calculate success rate
+    total_tasks = agents["tasks_completed"] + agents["tasks_failed"]
+    success_rate = round(agents["tasks_completed"] / max(total_tasks, 1) * 100, 1)
+
+    return {
+        **_staleness(snapshot),
+        "tasks": {
+            "by_status": tasks["by_status"],
+            "total": tasks["total"],
+        },
+        "agents": {
+            "total": agents["total"],
+            "tasks_completed": agents["tasks_completed"],
+            "tasks_failed": agents["tasks_failed"],
+            "success_rate": success_rate,
+        },
+        "system": {
+            "docker_available": snapshot["docker"]["healthy"],
+            "snapshot_duration_ms": snapshot["duration_ms"],
+        },
+        "cache": entity_cache.stats.snapshot(),
+        "memory_query_cache": memory_query_cache.stats.snapshot(),
+    }
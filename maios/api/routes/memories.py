@@ -0,0 +1,45 @@
+# maios/api/routes/memories.py
+"""Memories API routes for MAIOS."""
+
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from maios.api.batch import MAX_BATCH_SIZE, validate_creates
+from maios.core.database import get_session
+from maios.core.memory import MemoryService
+from maios.models.memory import MemoryEntry
+from maios.models.schemas import MemoryBatchResult, MemoryCreate
+
+router = APIRouter(prefix="/api/memories", tags=["memories"])
+
+
+@router.post("/batch", response_model=MemoryBatchResult)
+async def store_memories_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> MemoryBatchResult:
+    """Store many memories with a single multi-row insert.
+
+    Invalid items are reported in ``errors`` by index; the rest are stored
+    and their ids returned in request order.
+    """
+    rows, errors = validate_creates(items, MemoryCreate, MemoryEntry)
+    ids = await MemoryService(session).store_many([row for _, row in rows])
+    await session.commit()
+    return MemoryBatchResult(ids=ids, errors=errors)
+
+
+@router.delete("/projects/{project_id}")
+async def delete_project_memories(
+    project_id: UUID,
+    session: AsyncSession = Depends(get_session),
+) -> dict[str, int]:
+    """Delete all memories of a finished project.
+
+    With memories partitioned by project this drops the project's partition.
+    """
+    deleted = await MemoryService(session).delete_project(project_id)
+    return {"deleted": deleted}
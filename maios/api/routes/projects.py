@@ -2,16 +2,34 @@
 """Projects API routes for MAIOS."""
 
 import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from maios.api.batch import (
+    MAX_BATCH_SIZE,
+    bulk_insert,
+    bulk_update,
+    existing_ids,
+    validate_creates,
+    validate_updates,
+)
+from maios.api.dependencies import use_cache
+from maios.api.pagination import NEXT_CURSOR_HEADER, apply_keyset, split_page
+from maios.core.cache import entity_cache
 from maios.core.database import get_session
 from maios.models.project import Project, ProjectStatus
-from maios.models.schemas import ProjectCreate, ProjectRead, ProjectUpdate
+from maios.models.schemas import (
+    BatchItemError,
+    BatchResult,
+    ProjectBatchUpdate,
+    ProjectCreate,
+    ProjectRead,
+    ProjectUpdate,
+)
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -35,35 +53,107 @@ async def create_project(
     return project
 
 
+@router.post("/batch", response_model=BatchResult[ProjectRead])
+async def create_projects_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> BatchResult:
+    """Create many projects with a single multi-row insert.
+
+    Invalid items are reported in ``errors`` by index; the rest are created.
+    """
+    rows, errors = validate_creates(items, ProjectCreate, Project)
+    projects = await bulk_insert(session, Project, [row for _, row in rows])
+    await session.commit()
+    return BatchResult[ProjectRead](items=projects, errors=errors)
+
+
+@router.patch("/batch", response_model=BatchResult[ProjectRead])
+async def update_projects_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> BatchResult:
+    """Update many projects by ID.
+
+    Each item carries the ``id`` of the project and the fields to change.
+    Unknown IDs and invalid items are reported in ``errors`` by index.
+    """
+    updates, errors = validate_updates(items, ProjectBatchUpdate)
+    found = await existing_ids(session, Project, [item_id for _, item_id, _ in updates])
+
+    changes = []
+    for index, item_id, data in updates:
+        if item_id not in found:
+            errors.append(BatchItemError(index=index, id=item_id, error="Project not found"))
+            continue
+        changes.append({"id": item_id, **data})
+
+    projects = await bulk_update(session, Project, changes)
+    await session.commit()
+    await entity_cache.invalidate(Project, *(change["id"] for change in changes))
+    errors.sort(key=lambda e: e.index)
+    return BatchResult[ProjectRead](items=projects, errors=errors)
+
+
 @router.get("", response_model=list[ProjectRead])
 async def list_projects(
+    response: Response,
     status: Optional[ProjectStatus] = Query(None, description="Filter by project status"),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, ge=1, le=100, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous page's X-Next-Cursor header"
+    ),
+    skip: int = Query(
+        0, ge=0, deprecated=True, description="Offset pagination (ignored when cursor is set)"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     session: AsyncSession = Depends(get_session),
 ) -> list[Project]:
-    """List all projects with optional filtering and pagination."""
+    """List projects newest first, with optional filtering and keyset pagination.
+
+    When more projects are available, the cursor for the next page is returned
+    in the X-Next-Cursor response header.
+    """
     query = select(Project)
 
     if status is not None:
         query = query.where(Project.status == status)
 
-    query = query.offset(skip).limit(limit).order_by(Project.created_at.desc())
+    try:
+        query = apply_keyset(query, Project, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if cursor is None and skip:
+        query = query.offset(skip)
 
     result = await session.execute(query)
-    projects = result.scalars().all()
-    return list(projects)
+    projects, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return projects
 
 
 @router.get("/{project_id}", response_model=ProjectRead)
 async def get_project(
     project_id: UUID,
+    cached: bool = Depends(use_cache),
     session: AsyncSession = Depends(get_session),
-) -> Project:
-    """Get a specific project by ID."""
+) -> Project | ProjectRead:
+    """Get a specific project by ID.
+
+    Served from the entity cache when possible; send
+    ``Cache-Control: no-cache`` to read from the database.
+    """
+    if cached:
+        hit = await entity_cache.get(Project, project_id, ProjectRead)
+        if hit is not None:
+            return hit
+
     project = await session.get(Project, project_id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
+
+    await entity_cache.set(Project, project, ProjectRead)
     return project
 
 
@@ -86,4 +176,5 @@ async def update_project(
     session.add(project)
     await session.commit()
     await session.refresh(project)
+    await entity_cache.invalidate(Project, project.id)
     return project
@@ -0,0 +1,105 @@
+# maios/api/routes/tasks.py
+"""Tasks API routes for MAIOS."""
+
+from typing import Any
+
+from fastapi import APIRouter, Body, Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from maios.api.batch import (
+    MAX_BATCH_SIZE,
+    bulk_insert,
+    bulk_update,
+    existing_ids,
+    validate_creates,
+    validate_updates,
+)
+from maios.core.database import get_session
+from maios.models.agent import Agent
+from maios.models.project import Project
+from maios.models.schemas import (
+    BatchItemError,
+    BatchResult,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskRead,
+)
+from maios.models.task import Task
+
+router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+
+
+@router.post("/batch", response_model=BatchResult[TaskRead])
+async def create_tasks_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> BatchResult:
+    """Create many tasks with a single multi-row insert.
+
+    Referenced projects, parent tasks and agents are checked up front so a
+    dangling reference fails only its own item. Invalid items are reported
+    in ``errors`` by index; the rest are created.
+    """
+    rows, errors = validate_creates(items, TaskCreate, Task)
+
+    projects = await existing_ids(session, Project, [row["project_id"] for _, row in rows])
+    parents = await existing_ids(
+        session, Task, [row["parent_task_id"] for _, row in rows if row["parent_task_id"]]
+    )
+    agents = await existing_ids(
+        session, Agent, [row["assigned_agent_id"] for _, row in rows if row["assigned_agent_id"]]
+    )
+
+    valid_rows = []
+    for index, row in rows:
+        if row["project_id"] not in projects:
+            error = "Project not found"
+        elif row["parent_task_id"] and row["parent_task_id"] not in parents:
+            error = "Parent task not found"
+        elif row["assigned_agent_id"] and row["assigned_agent_id"] not in agents:
+            error = "Agent not found"
+        else:
+            valid_rows.append(row)
+            continue
+        errors.append(BatchItemError(index=index, error=error))
+
+    tasks = await bulk_insert(session, Task, valid_rows)
+    await session.commit()
+    errors.sort(key=lambda e: e.index)
+    return BatchResult[TaskRead](items=tasks, errors=errors)
+
+
+@router.patch("/batch", response_model=BatchResult[TaskRead])
+async def update_tasks_batch(
+    items: list[dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    session: AsyncSession = Depends(get_session),
+) -> BatchResult:
+    """Update many tasks by ID.
+
+    Each item carries the ``id`` of the task and the fields to change.
+    Unknown IDs, unknown agents and invalid items are reported in
+    ``errors`` by index.
+    """
+    updates, errors = validate_updates(items, TaskBatchUpdate)
+    found = await existing_ids(session, Task, [item_id for _, item_id, _ in updates])
+    agents = await existing_ids(
+        session,
+        Agent,
+        [data["assigned_agent_id"] for _, _, data in updates if data.get("assigned_agent_id")],
+    )
+
+    changes = []
+    for index, item_id, data in updates:
+        if item_id not in found:
+            error = "Task not found"
+        elif data.get("assigned_agent_id") and data["assigned_agent_id"] not in agents:
+            error = "Agent not found"
+        else:
+            changes.append({"id": item_id, **data})
+            continue
+        errors.append(BatchItemError(index=index, id=item_id, error=error))
+
+    tasks = await bulk_update(session, Task, changes)
+    await session.commit()
+    errors.sort(key=lambda e: e.index)
+    return BatchResult[TaskRead](items=tasks, errors=errors)
@@ -1,8 +1,14 @@
 # maios/api/websocket.py
+import asyncio
 import json
+from contextlib import aclosing
 from typing import Any
+from uuid import uuid4
 
 from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from maios.sandbox import ExecutionRequest, sandbox_manager
 
 
 class ConnectionManager:
@@ -35,9 +41,51 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+async def stream_execution(run_id: str, message: dict[str, Any], websocket: WebSocket):
+    """Run code in the sandbox and forward its output as it is produced.
+
+    Sends ``execution_output`` messages per chunk, then one
+    ``execution_result`` with the exit code and any dropped output.
+    """
+    try:
+        request = ExecutionRequest(
+            language=message.get("language", "python"),
+            code=message.get("code", ""),
+            timeout_seconds=message.get("timeout", 30),
+        )
+    except ValidationError as e:
+        await manager.send_message(
+            {"type": "execution_result", "id": run_id, "exit_code": 1, "error": str(e)},
+            websocket,
+        )
+        return
+
+    stream = sandbox_manager.stream_code(request)
+    async with aclosing(stream.__aiter__()) as chunks:
+        async for chunk in chunks:
+            await manager.send_message(
+                {"type": "execution_output", "id": run_id, **chunk.model_dump()},
+                websocket,
+            )
+
+    result = stream.result
+    await manager.send_message(
+        {
+            "type": "execution_result",
+            "id": run_id,
+            "exit_code": result.exit_code,
+            "duration_ms": result.duration_ms,
+            "error": result.error,
+            "dropped_chars": stream.dropped_chars,
+        },
+        websocket,
+    )
+
+
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint handler."""
     await manager.connect(websocket)
+    runs: dict[str, asyncio.Task] = {}
     try:
         while True:
             data = await websocket.receive_text()
@@ -46,6 +94,16 @@ async def websocket_endpoint(websocket: WebSocket):
             # Handle different message types
             if message.get("type") == "ping":
                 await manager.send_message({"type": "pong"}, websocket)
+            elif message.get("type") == "execute":
+                # Run in the background so the connection keeps handling messages
+                run_id = str(message.get("id") or uuid4())
+                task = asyncio.create_task(stream_execution(run_id, message, websocket))
+                runs[run_id] = task
+                task.add_done_callback(lambda _, run_id=run_id: runs.pop(run_id, None))
+            elif message.get("type") == "cancel":
+                task = runs.get(str(message.get("id")))
+                if task:
+                    task.cancel()
             else:
                 # Echo back for now (will be replaced with event routing)
                 await manager.send_message(
@@ -54,3 +112,6 @@ async def websocket_endpoint(websocket: WebSocket):
                 )
     except WebSocketDisconnect:
         manager.disconnect(websocket)
+    finally:
+        for task in runs.values():
+            task.cancel()
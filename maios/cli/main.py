@@ -1,4 +1,6 @@
 # maios/cli/main.py
+import os
+
 import typer
 from rich.console import Console
 
@@ -53,11 +55,53 @@ def server():
 def worker():
     """Start a Celery worker."""
     console.print("[bold cyan]Starting MAIOS worker...[/bold cyan]")
+    os.environ.setdefault("PROCESS_ROLE", "worker")
     from maios.workers.celery_app import app as celery_app
 
     celery_app.worker_main(["worker", "--loglevel=info"])
 
 
+@app.command("migrate-embeddings")
+def migrate_embeddings():
+    """Rewrite stored memory embeddings in the configured storage format."""
+    import asyncio
+
+    from maios.core.database import async_session, close_db
+    from maios.core.memory.storage import migrate_embeddings as run_migration
+
+    async def migrate() -> int:
+        try:
+            return await run_migration(async_session)
+        finally:
+            await close_db()
+
+    count = asyncio.run(migrate())
+    console.print(f"[green]Migrated {count} embeddings[/green]")
+
+
+@app.command("rebuild-search-index")
+def rebuild_search_index():
+    """Rebuild the SQLite memory full-text index; run after VACUUM."""
+    import asyncio
+
+    from maios.core.database import async_session, close_db
+    from maios.core.memory.service import MemoryService
+
+    async def rebuild() -> bool:
+        try:
+            async with async_session() as session:
+                rebuilt = await MemoryService(session).rebuild_search_index()
+                await session.commit()
+                return rebuilt
+        finally:
+            await close_db()
+
+    if asyncio.run(rebuild()):
+        console.print("[green]Rebuilt the memory search index[/green]")
+    else:
+        console.print("Nothing to rebuild: the database is not SQLite")
+
+
 @app.command()
 def version_cmd():
     """Show version information."""
@@ -1,5 +1,5 @@
 from typing import Optional
-import httpx
+
 import typer
 from rich.console import Console
 from rich.table import Table
@@ -12,6 +12,8 @@ API_BASE = "http://localhost:8000/api"
 @app.command("list")
 def list_projects():
     """List all projects."""
+    import httpx
+
     try:
         response = httpx.get(f"{API_BASE}/projects")
         response.raise_for_status()
@@ -49,6 +51,8 @@ def create_project(
     request: Optional[str] = typer.Option(None, "--request", "-r"),
 ):
     """Create a new project."""
+    import httpx
+
     payload = {"name": name}
     if description:
         payload["description"] = description
@@ -72,6 +76,8 @@ def project_status(
     project_id: str = typer.Argument(..., help="Project ID"),
 ):
     """Show project status."""
+    import httpx
+
     try:
         response = httpx.get(f"{API_BASE}/projects/{project_id}")
         response.raise_for_status()
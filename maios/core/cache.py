@@ -0,0 +1,176 @@
+# maios/core/cache.py
+"""Redis read-through cache for single-entity reads.
+
+Entries hold the API read schema serialized as compact JSON, keyed by table
+name and primary key. Writers call ``invalidate`` after committing. If Redis
+is unreachable the cache steps aside for a short backoff and callers fall
+through to the database. Invalidations are still attempted while backing
+off, and entries written soon after an error get a short TTL, since an
+invalidation racing the error may have been lost.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Optional, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+from sqlmodel import SQLModel
+
+from maios.core.config import settings
+from maios.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+ReadT = TypeVar("ReadT", bound=BaseModel)
+
+# Seconds to bypass the cache after a Redis error
+ERROR_BACKOFF_SECONDS = 5.0
+
+# Entries written within this many seconds of a Redis error expire after
+# RECOVERY_TTL_SECONDS instead of the configured TTL
+RECOVERY_WINDOW_SECONDS = 60.0
+RECOVERY_TTL_SECONDS = 5
+
+
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        """Increment a counter by name."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the counters as a JSON-serializable dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "sets": self.sets,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+
+class EntityCache:
+    """Read-through cache of API read schemas for table rows."""
+
+    def __init__(self, prefix: str = "maios:entity"):
+        self.prefix = prefix
+        self.stats = CacheStats()
+        self._retry_at = 0.0
+        self._error_at: Optional[float] = None
+
+    def key(self, model: type[SQLModel], entity_id: UUID) -> str:
+        """Build the cache key for a row."""
+        return f"{self.prefix}:{model.__tablename__}:{entity_id}"
+
+    @property
+    def available(self) -> bool:
+        """Whether the cache is enabled and not backing off after an error."""
+        return settings.cache_enabled and time.monotonic() >= self._retry_at
+
+    @property
+    def ttl_seconds(self) -> int:
+        """TTL for entries written now; short while recovering from an error."""
+        recovering = (
+            self._error_at is not None
+            and time.monotonic() - self._error_at < RECOVERY_WINDOW_SECONDS
+        )
+        if recovering:
+            return min(RECOVERY_TTL_SECONDS, settings.cache_ttl_seconds)
+        return settings.cache_ttl_seconds
+
+    def _record_error(self, action: str, error: Exception) -> None:
+        self.stats.incr("errors")
+        self._error_at = time.monotonic()
+        self._retry_at = self._error_at + ERROR_BACKOFF_SECONDS
+        logger.warning(
+            f"Entity cache {action} failed, bypassing for {ERROR_BACKOFF_SECONDS}s: {error}"
+        )
+
+    async def get(
+        self,
+        model: type[SQLModel],
+        entity_id: UUID,
+        schema: type[ReadT],
+    ) -> Optional[ReadT]:
+        """Get a cached read schema, or None on a miss."""
+        if not self.available:
+            return None
+
+        key = self.key(model, entity_id)
+        try:
+            raw = await get_redis_client().get(key)
+        except Exception as e:
+            self._record_error("get", e)
+            return None
+
+        if raw is not None:
+            try:
+                cached = schema.model_validate_json(raw)
+            except ValidationError as e:
+                # Written by an older schema (or corrupted); replace it from the database
+                logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                await self._delete([key])
+            else:
+                self.stats.incr("hits")
+                return cached
+
+        self.stats.incr("misses")
+        return None
+
+    async def set(
+        self,
+        model: type[SQLModel],
+        entity: SQLModel,
+        schema: type[BaseModel],
+    ) -> None:
+        """Cache a row as its read schema."""
+        if not self.available:
+            return
+
+        payload = schema.model_validate(entity, from_attributes=True).model_dump_json()
+        try:
+            await get_redis_client().set(
+                self.key(model, entity.id), payload, ex=self.ttl_seconds
+            )
+            self.stats.incr("sets")
+        except Exception as e:
+            self._record_error("set", e)
+
+    async def invalidate(self, model: type[SQLModel], *entity_ids: UUID) -> None:
+        """Drop cached rows after they change.
+
+        Attempted even while backing off, so a stale entry is not served for
+        its full TTL once Redis answers again.
+        """
+        if not entity_ids or not settings.cache_enabled:
+            return
+
+        if await self._delete([self.key(model, i) for i in entity_ids]):
+            self.stats.incr("invalidations", len(entity_ids))
+
+    async def _delete(self, keys: list[str]) -> bool:
+        try:
+            await get_redis_client().delete(*keys)
+            return True
+        except Exception as e:
+            self._record_error("invalidate", e)
+            return False
+
+
+# Global entity cache instance
+entity_cache = EntityCache()
@@ -1,4 +1,6 @@
 # maios/core/config.py
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,9 +20,93 @@ class Settings(BaseSettings):
     # Database
     database_url: str
 
+    # Connection pool (overrides the per-role defaults in maios.core.database)
+    process_role: str = "api"  # api, worker or beat
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_timeout_seconds: Optional[float] = None
+    db_pool_recycle_seconds: Optional[int] = None
+    db_pool_pre_ping: Optional[bool] = None
+
     # Redis
     redis_url: str
 
+    # Entity read cache (Redis)
+    cache_enabled: bool = True
+    cache_ttl_seconds: int = 60
+
+    # Sandbox: docker, or for dev/CI only namespace (Linux subprocess, weaker
+    # isolation) or auto (docker, else namespace)
+    sandbox_backend: str = "docker"
+    # User the namespace backend drops to when the worker runs as root
+    sandbox_namespace_user: str = "nobody"
+    # Sandboxes run at once per process; extra executions queue
+    sandbox_max_concurrent: int = 4
+    # Pre-started containers, sized per (language, container type); each serves one run
+    sandbox_pool_enabled: bool = True
+    sandbox_pool_min_size: int = 1
+    sandbox_pool_max_size: int = 4
+    sandbox_pool_idle_ttl_seconds: float = 300.0
+    # Unread streamed output kept per run before the oldest chunks are dropped
+    sandbox_stream_buffer_chars: int = 1_000_000
+
+    # Health snapshot refreshed in the background by the API process
+    health_refresh_interval_seconds: float = 15.0
+
+    # Memory semantic search: HNSW candidate list size (pgvector hnsw.ef_search)
+    memory_hnsw_ef_search: int = 100
+    # Without pgvector: directory for the memory-mapped vector index, locked by
+    # one process (others keep theirs in memory); unset keeps it in memory, rebuilt
+    # from the database on first search
+    memory_index_dir: Optional[str] = None
+    # Without pgvector: embedding column format, "float32", "float16" (half the
+    # size) or "int8" (a quarter, quantized); existing rows convert with
+    # `maios migrate-embeddings`
+    memory_embedding_storage: str = "float32"
+    # PostgreSQL only: partition the memoryentry table, "project" (one partition
+    # per project, dropped by detaching it) or "time" (monthly by created_at);
+    # applies when the table is created
+    memory_partitioning: Optional[str] = None
+    # MemoryService.store_many: rows at which PostgreSQL imports switch to COPY
+    memory_copy_threshold: int = 5000
+    # MemoryService.store/store_many: importance added to a shared (semantic or
+    # procedural) memory each time its content is stored again in its scope
+    memory_dedup_importance_boost: float = 0.05
+    # MemoryService.iter_*: rows fetched per server-side cursor round trip
+    memory_stream_fetch_size: int = 1000
+    # MemoryService.search/get_recent: seconds results are served from Redis (0 disables)
+    memory_query_cache_ttl_seconds: float = 10.0
+    # MemoryService.recall: age at which a memory's recency signal halves
+    memory_recall_half_life_days: float = 7.0
+    # Background embedding of new memories: provider name (or module:Class),
+    # memories per provider call, batches in flight, batches per run, run interval
+    memory_embedding_provider: str = "hashing"
+    memory_embedding_batch_size: int = 64
+    memory_embedding_concurrency: int = 2
+    memory_embedding_max_batches: int = 200
+    memory_embedding_interval_seconds: float = 60.0
+    # Memory access counts are buffered and written in batches: longest wait
+    # before a flush, and buffered memories that force an earlier one
+    memory_access_flush_interval_seconds: float = 5.0
+    memory_access_max_pending: int = 10000
+    # Memory consolidation: run interval, rows per batch, cosine distance for
+    # near duplicates, importance half-life, age at which task episodes are
+    # summarized, age and importance of cold episodes that get pruned, and an
+    # optional directory pruned rows are archived to (JSON Lines)
+    memory_consolidation_interval_seconds: float = 3600.0
+    memory_consolidation_batch_size: int = 500
+    memory_dedup_distance: float = 0.05
+    memory_importance_half_life_days: float = 30.0
+    memory_summarize_after_days: float = 7.0
+    memory_cold_after_days: float = 90.0
+    memory_cold_importance: float = 0.1
+    memory_archive_dir: Optional[str] = None
+    # Redis working memory: age at which an item ranks as half as important,
+    # idle expiry of an agent's items, and saving evicted items as episodic
+    working_memory_half_life_seconds: float = 600.0
+    working_memory_ttl_seconds: int = 86400
+    working_memory_spill: bool = False
+
     # Application
     task_timeout_minutes: int = 30
     multi_tenant_mode: bool = False
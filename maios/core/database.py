@@ -1,36 +1,210 @@
 # maios/core/database.py
+import enum
+import threading
+import time
 from collections.abc import AsyncGenerator
+from typing import Any, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
 
 from maios.core.config import settings
 
 
-def create_engine(database_url: str):
-    """Create async database engine."""
+class ProcessRole(str, enum.Enum):
+    """Kind of process the engine is built for (selects the pool profile)."""
+
+    API = "api"
+    WORKER = "worker"
+    BEAT = "beat"
+
+
+# Pool profiles by process role
+POOL_PROFILES = {
+    ProcessRole.API: {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    ProcessRole.WORKER: {
+        "pool_size": 2,  # Celery runs one task at a time per child process
+        "max_overflow": 3,
+        "pool_timeout": 60.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    ProcessRole.BEAT: {
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": 30.0,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+    },
+}
+
+
+class PoolStats:
+    """Checkout wait-time counters for a connection pool."""
+
+    def __init__(self, max_overflow: int = 0):
+        self.max_overflow = max_overflow
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        """Record a successful checkout and how long it waited."""
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up waiting for a connection."""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the counters as a JSON-serializable dict."""
+        with self._lock:
+            avg_wait = self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats(max_overflow=kwargs.get("max_overflow", 10))
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def get_process_role() -> ProcessRole:
+    """Get the configured process role, defaulting to the API server."""
+    try:
+        return ProcessRole(settings.process_role.lower())
+    except ValueError:
+        return ProcessRole.API
+
+
+def get_pool_options(role: Optional[ProcessRole] = None) -> dict[str, Any]:
+    """Get pool options for a role, with any explicit settings applied on top."""
+    options = dict(POOL_PROFILES[role or get_process_role()])
+
+    overrides = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
+
+
+def create_engine(database_url: str, role: Optional[ProcessRole] = None) -> AsyncEngine:
+    """Create async database engine with a pool sized for the process role."""
+    if database_url.startswith("sqlite"):
+        # SQLite picks its own pool class; queue pool options don't apply
+        return create_async_engine(database_url, echo=settings.log_level == "DEBUG")
+
     return create_async_engine(
         database_url,
         echo=settings.log_level == "DEBUG",
-        poolclass=NullPool,  # Better for async with pgvector
+        poolclass=InstrumentedQueuePool,
+        **get_pool_options(role),
     )
 
 
-# Create engine from settings
-engine = create_async_engine(
-    settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=settings.log_level == "DEBUG",
-    poolclass=NullPool,
-)
+# Engine and session factory are built on first use so that importing this
+# module (CLI, forked workers, tests) never touches settings or the driver.
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
 
-# Session factory
-async_session = async_sessionmaker(
-    engine,
-    class_=SQLModelAsyncSession,
-    expire_on_commit=False,
-)
+
+def get_engine() -> AsyncEngine:
+    """Get the global database engine, creating it if necessary."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+        )
+    return _engine
+
+
+def get_session_factory() -> async_sessionmaker:
+    """Get the global session factory, creating it if necessary."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(
+            get_engine(),
+            class_=SQLModelAsyncSession,
+            expire_on_commit=False,
+        )
+    return _session_factory
+
+
+def async_session(**kwargs) -> SQLModelAsyncSession:
+    """Open a new session from the global session factory."""
+    return get_session_factory()(**kwargs)
+
+
+def __getattr__(name: str):
+    # Backward compatibility for ``from maios.core.database import engine``
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_pool_status(db_engine: Optional[AsyncEngine] = None) -> dict[str, Any]:
+    """Get connection pool occupancy and checkout wait statistics."""
+    pool = (db_engine or get_engine()).pool
+    status: dict[str, Any] = {"type": pool.__class__.__name__, "role": get_process_role().value}
+
+    if not isinstance(pool, InstrumentedQueuePool):
+        return status
+
+    capacity = pool.size() + max(pool.stats.max_overflow, 0)
+    checked_out = pool.checkedout()
+    status.update(
+        {
+            "size": pool.size(),
+            "max_overflow": pool.stats.max_overflow,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+            **pool.stats.snapshot(),
+        }
+    )
+    return status
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -46,10 +220,23 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 
 async def init_db():
     """Initialize database tables."""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
 async def close_db():
-    """Close database connections."""
-    await engine.dispose()
+    """Close database connections (no-op if the engine was never created)."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_factory = None
+
+
+def reset_engine_after_fork() -> None:
+    """Drop pooled connections inherited from a parent process.
+
+    Must be called in forked children; the parent keeps using its sockets.
+    """
+    if _engine is not None:
+        _engine.sync_engine.dispose(close=False)
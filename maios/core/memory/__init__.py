@@ -1,3 +1,4 @@
 from maios.core.memory.service import MemoryService
+from maios.core.memory.working import WorkingMemory, WorkingMemoryItem
 
-__all__ = ["MemoryService"]
+__all__ = ["MemoryService", "WorkingMemory", "WorkingMemoryItem"]
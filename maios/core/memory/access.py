@@ -0,0 +1,247 @@
+# maios/core/memory/access.py
+"""Coalesced memory access tracking.
+
+Reads are recorded in an in-process buffer instead of updating the row
+each time. The buffer is written out as one executemany UPDATE
+(``access_count = access_count + n``) every ``interval_seconds``, or
+sooner once ``max_pending`` memories are waiting. Until then, memories
+loaded through ``MemoryService`` have their pending accesses overlaid on
+the loaded values, so ``get_relevance_score`` sees near-real-time counts.
+
+Each process keeps one buffer per database engine. The API flushes it
+from a background loop started with the app. Celery workers run no loop
+between tasks, so they flush after every task and when a worker process
+shuts down. Elsewhere a flush is scheduled by the next ``record`` once one
+is due, and ``flush`` can be awaited directly.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, inspect, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from maios.core.config import settings
+from maios.models.memory import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+# InstanceState.info key: (loaded access_count, pending count overlaid on it)
+OVERLAY_KEY = "maios_access_overlay"
+
+# (count, last accessed) per memory
+Pending = dict[UUID, tuple[int, datetime]]
+
+
+def _merge(into: Pending, items: Pending) -> None:
+    for memory_id, (count, last) in items.items():
+        if memory_id in into:
+            old_count, old_last = into[memory_id]
+            into[memory_id] = (old_count + count, max(old_last, last))
+        else:
+            into[memory_id] = (count, last)
+
+
+class AccessTracker:
+    """Buffers memory accesses and writes them in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval_seconds: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """Create a tracker.
+
+        Args:
+            session_factory: Opens the session each flush writes with
+            interval_seconds: Flush period; defaults to the configured one
+            max_pending: Buffered memories that trigger an early flush
+        """
+        self._interval_seconds = interval_seconds
+        self._max_pending = max_pending
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._pending: Pending = {}
+        self._inflight: Pending = {}  # Taken by a flush, not yet committed
+        self._flushing: Optional[asyncio.Future] = None
+        self._last_flush = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self.flushed = 0  # Accesses written since start
+
+    @property
+    def interval_seconds(self) -> float:
+        """Longest time an access waits in the buffer."""
+        if self._interval_seconds is not None:
+            return self._interval_seconds
+        return settings.memory_access_flush_interval_seconds
+
+    @property
+    def max_pending(self) -> int:
+        """Buffered memories that trigger an early flush."""
+        if self._max_pending is not None:
+            return self._max_pending
+        return settings.memory_access_max_pending
+
+    def record(self, memory_id: UUID, at: Optional[datetime] = None) -> None:
+        """Buffer one access, scheduling a flush if one is due."""
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            _merge(self._pending, {memory_id: (1, at)})
+            due = (
+                len(self._pending) >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.interval_seconds
+            )
+
+        if due and self._flushing is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No loop to flush on; the next flush picks it up
+            asyncio.ensure_future(self.flush())
+
+    def pending(self, memory_id: UUID) -> tuple[int, Optional[datetime]]:
+        """Accesses recorded but not yet committed, and the latest of them."""
+        with self._lock:
+            merged: Pending = {}
+            for source in (self._inflight, self._pending):
+                if memory_id in source:
+                    _merge(merged, {memory_id: source[memory_id]})
+        return merged.get(memory_id, (0, None))
+
+    def overlay(self, memories: Iterable[MemoryEntry]) -> None:
+        """Show pending accesses on loaded memories without marking them dirty."""
+        for memory in memories:
+            count, last = self.pending(memory.id)
+            state = inspect(memory)
+            seen = state.info.get(OVERLAY_KEY)
+            if seen is not None and memory.access_count == seen[0] + seen[1]:
+                base = seen[0]
+            else:
+                base = memory.access_count  # First overlay, or reloaded since
+
+            if count or seen is not None:
+                set_committed_value(memory, "access_count", base + count)
+                state.info[OVERLAY_KEY] = (base, count)
+            if last is not None and (
+                memory.last_accessed is None or as_utc(memory.last_accessed) < last
+            ):
+                set_committed_value(memory, "last_accessed", last)
+
+    async def flush(self) -> int:
+        """Write buffered accesses, joining a flush already in progress.
+
+        Returns:
+            Number of memories updated
+        """
+        if self._flushing is None:
+            self._flushing = asyncio.ensure_future(self._flush())
+        return await asyncio.shield(self._flushing)
+
+    async def _flush(self) -> int:
+        try:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+                self._last_flush = time.monotonic()
+            if not batch:
+                return 0
+
+            try:
+                await self._write(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} memory accesses: {e}")
+                with self._lock:
+                    _merge(self._pending, batch)  # Retry with the next flush
+                return 0
+
+            self.flushed += sum(count for count, _ in batch.values())
+            return len(batch)
+        finally:
+            with self._lock:
+                self._inflight = {}
+            self._flushing = None
+
+    async def _write(self, batch: Pending) -> None:
+        table = MemoryEntry.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("memory_id"))
+            .values(
+                access_count=table.c.access_count + bindparam("count"),
+                last_accessed=bindparam("last"),
+            )
+        )
+        params = [
+            {"memory_id": memory_id, "count": count, "last": last}
+            for memory_id, (count, last) in batch.items()
+        ]
+
+        async with self._session_factory() as session:
+            await session.execute(stmt, params)
+            await session.commit()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="memory-access-flush")
+
+    async def stop(self) -> None:
+        """Stop the background loop and flush what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (as SQLite returns them) as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# One tracker per engine, so separate databases (and test engines) never share one
+_trackers: "weakref.WeakKeyDictionary[Engine, AccessTracker]" = weakref.WeakKeyDictionary()
+_trackers_lock = threading.Lock()
+
+
+def get_access_tracker(engine: Engine) -> AccessTracker:
+    """Get the access tracker for a database engine, creating it if necessary."""
+    with _trackers_lock:
+        tracker = _trackers.get(engine)
+        if tracker is None:
+            engine_ref = weakref.ref(engine)  # The tracker must not keep its engine alive
+
+            def factory() -> AsyncSession:
+                return AsyncSession(AsyncEngine(engine_ref()), expire_on_commit=False)
+
+            tracker = _trackers[engine] = AccessTracker(factory)
+        return tracker
+
+
+async def flush_access_trackers() -> int:
+    """Flush the trackers of every engine in this process.
+
+    Returns:
+        Number of memories updated
+    """
+    with _trackers_lock:
+        trackers = list(_trackers.values())
+    return sum([await tracker.flush() for tracker in trackers])
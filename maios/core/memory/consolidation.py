@@ -0,0 +1,386 @@
+# maios/core/memory/consolidation.py
+"""Periodic consolidation of the memory table.
+
+One run goes through these steps in order:
+
+1. Exact duplicates: memories with the same content, type, agent and
+   project are merged into the oldest one.
+2. Near duplicates: embedded memories created since the previous run that
+   lie within ``memory_dedup_distance`` of an older memory in the same
+   scope are merged into it.
+3. Decay: episodic importance halves for every
+   ``memory_importance_half_life_days`` a memory goes unaccessed.
+4. Summaries: a task's episodic memories older than
+   ``memory_summarize_after_days`` are replaced by one semantic summary.
+5. Pruning: cold episodic memories (importance under
+   ``memory_cold_importance``, unaccessed for ``memory_cold_after_days``)
+   are deleted. When ``memory_archive_dir`` is set they are first appended
+   to a JSON Lines file there.
+
+Every step works through the table in batches and commits each one, so a
+run never holds long locks. An interrupted run carries on from what is
+left the next time.
+"""
+
+import json
+import logging
+import textwrap
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from maios.core.config import settings
+from maios.core.memory.access import as_utc
+from maios.core.memory.query_cache import memory_query_cache
+from maios.core.memory.service import MemoryService
+from maios.models.memory import MemoryEntry, MemoryType, SharedMemoryAgent
+
+logger = logging.getLogger(__name__)
+
+# Neighbours checked per memory when looking for near duplicates
+DEDUP_NEIGHBOURS = 5
+
+# Episodes a task needs before they are worth summarizing
+MIN_EPISODES_PER_SUMMARY = 3
+
+# Episodes folded into one summary; a longer task gets several
+MAX_EPISODES_PER_SUMMARY = 200
+
+# Episodes quoted in an extractive summary, and the length of each line
+SUMMARY_ITEMS = 5
+SUMMARY_LINE_CHARS = 200
+
+# Tag added to semantic memories created from episodes
+SUMMARY_TAG = "summary"
+
+Summarizer = Callable[[list[MemoryEntry]], Awaitable[str]]
+
+
+async def summarize_extractive(memories: list[MemoryEntry]) -> str:
+    """Summarize episodes by quoting the most important ones in order."""
+    top = sorted(memories, key=lambda m: m.importance, reverse=True)[:SUMMARY_ITEMS]
+    top.sort(key=lambda m: m.created_at)
+    lines = [f"Summary of {len(memories)} episodic memories:"]
+    lines += [f"- {textwrap.shorten(m.content, SUMMARY_LINE_CHARS)}" for m in top]
+    return "\n".join(lines)
+
+
+@dataclass
+class ConsolidationStats:
+    """Counters for one consolidation run."""
+
+    merged: int = 0
+    near_merged: int = 0
+    decayed: int = 0
+    summaries: int = 0
+    summarized: int = 0
+    pruned: int = 0
+    archived: int = 0
+    duration_seconds: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the counters as a JSON-serializable dict."""
+        return {**asdict(self), "duration_seconds": round(self.duration_seconds, 3)}
+
+
+def _last_used():
+    """When a memory was last accessed, or created if it never was."""
+    return func.coalesce(MemoryEntry.last_accessed, MemoryEntry.created_at)
+
+
+class MemoryConsolidator:
+    """Deduplicates, decays, summarizes and prunes memories."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        summarizer: Optional[Summarizer] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Create a consolidator.
+
+        Args:
+            session_factory: Opens a new session (one per batch)
+            summarizer: Turns a task's episodes into summary text; defaults
+                to ``summarize_extractive``
+            batch_size: Rows (or groups) handled per transaction
+        """
+        self._session_factory = session_factory
+        self.summarizer = summarizer or summarize_extractive
+        self.batch_size = batch_size or settings.memory_consolidation_batch_size
+
+    async def run(self) -> ConsolidationStats:
+        """Run every consolidation step once."""
+        stats = ConsolidationStats()
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+
+        await self.merge_duplicates(stats)
+        await self.merge_near_duplicates(now, stats)
+        await self.decay(now, stats)
+        await self.summarize(now, stats)
+        await self.prune(now, stats)
+        # Merges, decay and pruning change rows across every scope
+        await memory_query_cache.invalidate_all()
+
+        stats.duration_seconds = time.perf_counter() - started
+        logger.info(f"Memory consolidation finished: {stats.snapshot()}")
+        return stats
+
+    # Helpers
+
+    async def _delete(
+        self, session: AsyncSession, ids: list[UUID], keeper: Optional[MemoryEntry] = None
+    ) -> None:
+        """Delete memories by id and queue them for the vector index.
+
+        Agents the memories were shared with are moved to ``keeper``, if
+        given; its embedding may have been filled from a duplicate, so it is
+        re-read as well.
+        """
+        await session.execute(delete(MemoryEntry).where(MemoryEntry.id.in_(ids)))
+        shared = await session.execute(
+            delete(SharedMemoryAgent)
+            .where(SharedMemoryAgent.memory_id.in_(ids))
+            .returning(SharedMemoryAgent.agent_id)
+        )
+        service = MemoryService(session)
+        if keeper is not None:
+            await service.share_with(keeper.id, set(shared.scalars()) - {keeper.agent_id})
+        service.reindex(written=[keeper.id] if keeper is not None else [], deleted=ids)
+
+    @staticmethod
+    def _merge_fields(keeper: MemoryEntry, duplicates: list[MemoryEntry]) -> None:
+        """Fold duplicates' importance, accesses, tags and keywords into the keeper."""
+        group = [keeper, *duplicates]
+        keeper.importance = max(m.importance for m in group)
+        # An increment, so accesses still buffered for the keeper are not counted twice
+        keeper.access_count = MemoryEntry.access_count + sum(m.access_count for m in duplicates)
+        accessed = [as_utc(m.last_accessed) for m in group if m.last_accessed is not None]
+        keeper.last_accessed = max(accessed) if accessed else None
+        keeper.tags = list(dict.fromkeys(tag for m in group for tag in m.tags))
+        keeper.keywords = list(dict.fromkeys(word for m in group for word in m.keywords))
+        if keeper.embedding is None:
+            keeper.embedding = next(
+                (m.embedding for m in duplicates if m.embedding is not None), None
+            )
+
+    def _archive(self, memories: list[MemoryEntry], stats: ConsolidationStats) -> None:
+        """Append memories to today's archive file, if archiving is configured."""
+        if not settings.memory_archive_dir or not memories:
+            return
+        directory = Path(settings.memory_archive_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"memoryentry-{datetime.now(timezone.utc):%Y-%m-%d}.jsonl"
+        with path.open("a", encoding="utf-8") as f:
+            for memory in memories:
+                record = memory.model_dump(mode="json")
+                f.write(json.dumps(record) + "\n")
+        stats.archived += len(memories)
+
+    # Steps
+
+    async def merge_duplicates(self, stats: ConsolidationStats) -> None:
+        """Merge memories with identical content within the same scope."""
+        scope = (
+            MemoryEntry.agent_id,
+            MemoryEntry.project_id,
+            MemoryEntry.memory_type,
+            MemoryEntry.content,
+        )
+        groups_stmt = (
+            select(*scope).group_by(*scope).having(func.count() > 1).limit(self.batch_size)
+        )
+
+        while True:
+            async with self._session_factory() as session:
+                groups = (await session.execute(groups_stmt)).all()
+                for agent_id, project_id, memory_type, content in groups:
+                    result = await session.execute(
+                        select(MemoryEntry)
+                        .where(
+                            MemoryEntry.agent_id.is_not_distinct_from(agent_id),
+                            MemoryEntry.project_id.is_not_distinct_from(project_id),
+                            MemoryEntry.memory_type == memory_type,
+                            MemoryEntry.content == content,
+                        )
+                        .order_by(MemoryEntry.created_at, MemoryEntry.id)
+                    )
+                    keeper, *duplicates = result.scalars().all()
+                    self._merge_fields(keeper, duplicates)
+                    await self._delete(session, [m.id for m in duplicates], keeper)
+                    stats.merged += len(duplicates)
+                await session.commit()
+
+            if len(groups) < self.batch_size:
+                return
+
+    async def merge_near_duplicates(self, now: datetime, stats: ConsolidationStats) -> None:
+        """Merge recent memories into older ones with nearly the same embedding.
+
+        Looks at memories created within two consolidation intervals, so
+        consecutive runs overlap.
+        """
+        since = now - timedelta(seconds=2 * settings.memory_consolidation_interval_seconds)
+        threshold = settings.memory_dedup_distance
+        last_id: Optional[UUID] = None
+
+        while True:
+            stmt = select(MemoryEntry).where(
+                MemoryEntry.embedding.is_not(None), MemoryEntry.created_at >= since
+            )
+            if last_id is not None:
+                stmt = stmt.where(MemoryEntry.id > last_id)
+            stmt = stmt.order_by(MemoryEntry.id).limit(self.batch_size)
+
+            async with self._session_factory() as session:
+                service = MemoryService(session)
+                batch = list((await session.execute(stmt)).scalars())
+                for memory in batch:
+                    neighbours = await service.search_semantic(
+                        memory.embedding,
+                        k=DEDUP_NEIGHBOURS + 1,
+                        agent_id=memory.agent_id,
+                        project_id=memory.project_id,
+                        memory_type=memory.memory_type,
+                    )
+                    older = [
+                        other
+                        for other, distance in neighbours
+                        if distance <= threshold
+                        and other.agent_id == memory.agent_id
+                        and other.project_id == memory.project_id
+                        and (other.created_at, other.id) < (memory.created_at, memory.id)
+                    ]
+                    if older:
+                        keeper = min(older, key=lambda m: (m.created_at, m.id))
+                        self._merge_fields(keeper, [memory])
+                        await self._delete(session, [memory.id], keeper)
+                        stats.near_merged += 1
+                await session.commit()
+
+            if len(batch) < self.batch_size:
+                return
+            last_id = batch[-1].id
+
+    async def decay(self, now: datetime, stats: ConsolidationStats) -> None:
+        """Decay the importance of episodic memories idle since the last run."""
+        interval = settings.memory_consolidation_interval_seconds
+        half_life = settings.memory_importance_half_life_days * 86400
+        factor = 0.5 ** (interval / half_life)
+        idle = (
+            MemoryEntry.memory_type == MemoryType.EPISODIC,
+            _last_used() < now - timedelta(seconds=interval),
+            MemoryEntry.importance > 0,
+        )
+        last_id: Optional[UUID] = None
+
+        while True:
+            stmt = select(MemoryEntry.id).where(*idle)
+            if last_id is not None:
+                stmt = stmt.where(MemoryEntry.id > last_id)
+            stmt = stmt.order_by(MemoryEntry.id).limit(self.batch_size)
+
+            async with self._session_factory() as session:
+                ids = list((await session.execute(stmt)).scalars())
+                if ids:
+                    await session.execute(
+                        update(MemoryEntry)
+                        .where(MemoryEntry.id.in_(ids))
+                        .values(importance=MemoryEntry.importance * factor)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await session.commit()
+            stats.decayed += len(ids)
+
+            if len(ids) < self.batch_size:
+                return
+            last_id = ids[-1]
+
+    async def summarize(self, now: datetime, stats: ConsolidationStats) -> None:
+        """Replace each task's old episodes with a semantic summary."""
+        old_episodes = (
+            MemoryEntry.memory_type == MemoryType.EPISODIC,
+            MemoryEntry.task_id.is_not(None),
+            MemoryEntry.created_at < now - timedelta(days=settings.memory_summarize_after_days),
+        )
+        scope = (MemoryEntry.agent_id, MemoryEntry.project_id, MemoryEntry.task_id)
+        groups_stmt = (
+            select(*scope)
+            .where(*old_episodes)
+            .group_by(*scope)
+            .having(func.count() >= MIN_EPISODES_PER_SUMMARY)
+            .limit(self.batch_size)
+        )
+
+        while True:
+            async with self._session_factory() as session:
+                groups = (await session.execute(groups_stmt)).all()
+
+            for agent_id, project_id, task_id in groups:
+                async with self._session_factory() as session:
+                    result = await session.execute(
+                        select(MemoryEntry)
+                        .where(
+                            *old_episodes,
+                            MemoryEntry.agent_id.is_not_distinct_from(agent_id),
+                            MemoryEntry.project_id.is_not_distinct_from(project_id),
+                            MemoryEntry.task_id == task_id,
+                        )
+                        .order_by(MemoryEntry.created_at)
+                        .limit(MAX_EPISODES_PER_SUMMARY)
+                    )
+                    episodes = list(result.scalars())
+                    content = await self.summarizer(episodes)
+
+                    await MemoryService(session).store(
+                        content,
+                        memory_type=MemoryType.SEMANTIC,
+                        agent_id=agent_id,
+                        project_id=project_id,
+                        task_id=task_id,
+                        team_id=episodes[0].team_id,
+                        importance=max(m.importance for m in episodes),
+                        keywords=list(dict.fromkeys(word for m in episodes for word in m.keywords)),
+                        tags=[SUMMARY_TAG, *(tag for m in episodes for tag in m.tags)],
+                    )
+                    self._archive(episodes, stats)
+                    await self._delete(session, [m.id for m in episodes])
+                    await session.commit()
+                stats.summaries += 1
+                stats.summarized += len(episodes)
+
+            if len(groups) < self.batch_size:
+                return
+
+    async def prune(self, now: datetime, stats: ConsolidationStats) -> None:
+        """Delete cold episodic memories, archiving them first if configured."""
+        stmt = (
+            select(MemoryEntry)
+            .where(
+                MemoryEntry.memory_type == MemoryType.EPISODIC,
+                MemoryEntry.importance < settings.memory_cold_importance,
+                _last_used() < now - timedelta(days=settings.memory_cold_after_days),
+            )
+            .order_by(MemoryEntry.id)
+            .limit(self.batch_size)
+        )
+
+        while True:
+            async with self._session_factory() as session:
+                cold = list((await session.execute(stmt)).scalars())
+                if cold:
+                    self._archive(cold, stats)
+                    await self._delete(session, [m.id for m in cold])
+                    await session.commit()
+            stats.pruned += len(cold)
+
+            if len(cold) < self.batch_size:
+                return
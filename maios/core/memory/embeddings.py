@@ -0,0 +1,93 @@
+# maios/core/memory/embeddings.py
+"""Embedding providers for memory content.
+
+Providers turn batches of text into vectors of ``dimensions`` floats. The
+active one is chosen by ``settings.memory_embedding_provider``: either a
+registered name or a ``module:Class`` path to an ``EmbeddingProvider``
+subclass, so deployments can plug in a hosted model without code changes
+here.
+"""
+
+import hashlib
+import importlib
+import math
+import re
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from maios.core.config import settings
+from maios.models.memory import EMBEDDING_DIMENSIONS
+
+
+class EmbeddingProvider(ABC):
+    """Turns text into fixed-width vectors."""
+
+    name: str = "base"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts, one vector per text in order."""
+
+
+class HashingEmbedder(EmbeddingProvider):
+    """Deterministic, offline bag-of-words embedder (feature hashing).
+
+    Lowercased word unigrams and bigrams are hashed into signed buckets and
+    the result is L2-normalized, so texts sharing words land close together
+    under cosine distance. No model or network access is needed, which
+    makes it suitable for development, tests and air-gapped installs.
+    """
+
+    name = "hashing"
+
+    def embed_one(self, text: str) -> list[float]:
+        """Embed a single text."""
+        words = re.findall(r"\w+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+        vector = [0.0] * self.dimensions
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # Low bits pick the bucket, the top bit the sign (limits collision bias)
+            vector[value % self.dimensions] += -1.0 if value >> 63 else 1.0
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+PROVIDERS: dict[str, type[EmbeddingProvider]] = {
+    HashingEmbedder.name: HashingEmbedder,
+}
+
+
+def get_embedding_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """Create the configured embedding provider.
+
+    Args:
+        name: Registered provider name or ``module:Class`` path; defaults to
+            ``settings.memory_embedding_provider``
+
+    Raises:
+        ValueError: If the name is neither registered nor importable
+    """
+    name = name or settings.memory_embedding_provider
+    if name in PROVIDERS:
+        return PROVIDERS[name]()
+
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown embedding provider: {name}")
+    try:
+        provider_class = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot load embedding provider {name}: {e}") from e
+    if not (isinstance(provider_class, type) and issubclass(provider_class, EmbeddingProvider)):
+        raise ValueError(f"{name} is not an EmbeddingProvider")
+    return provider_class()
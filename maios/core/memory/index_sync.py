@@ -0,0 +1,200 @@
+# maios/core/memory/index_sync.py
+"""Keeping per-process vector indexes in step with the database.
+
+Without pgvector every process holds its own ``VectorIndex``. Writes do not
+touch an index directly: they queue the memories they changed, and
+``MemoryService.sync_vector_index`` re-reads those rows before the next
+semantic search. Other processes learn of a write from a change log, a
+Redis stream of the memory ids each committed write touched; a sync reads
+the entries past the index's ``log_position`` as well.
+
+Queued changes follow the writing session's transaction. Written
+embeddings are queued at once, so the session's own searches see them;
+deletions are queued once the session commits, so a rollback never drops
+live rows; and a rollback queues every id again, undoing whatever the
+session's own syncs picked up. Ids are published when the session commits.
+
+An index that fell further behind than the stream keeps is reloaded in
+full. If Redis is unreachable, reads step aside for a short backoff (the
+local queue still works); a publish that fails makes the next one carry a
+reset marker that sends every process to a full reload.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from maios.core.cache import ERROR_BACKOFF_SECONDS
+from maios.core.memory.vector_index import VectorIndex
+from maios.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Entries kept in the stream; an index further behind reloads in full
+CHANGE_LOG_MAXLEN = 10000
+
+# Entries read per sync; an index with more pending reloads in full instead
+CHANGE_LOG_READ_LIMIT = 1000
+
+
+@dataclass
+class ChangeLogRead:
+    """Changes past a log position.
+
+    ``ids`` is None when the changes cannot be listed (no position yet, or
+    entries lost), so the index must be checked in full.
+    """
+
+    position: str
+    ids: Optional[set[UUID]]
+
+
+def _stream_id(position: str) -> tuple[int, int]:
+    milliseconds, _, sequence = position.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class IndexChangeLog:
+    """Shared log of memories whose embeddings changed, plus per-session tracking."""
+
+    def __init__(self, key: str = "maios:memory-index:changes"):
+        self.key = key
+        self._retry_at = 0.0
+        # Set when a publish failed; the next one tells readers to reload
+        self._lost = False
+        self._info_key = f"{key}:pending"
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def available(self) -> bool:
+        """Whether the log is not backing off after an error."""
+        return time.monotonic() >= self._retry_at
+
+    def _record_error(self, action: str, error: Exception) -> None:
+        self._retry_at = time.monotonic() + ERROR_BACKOFF_SECONDS
+        logger.warning(f"Vector index change log {action} failed: {error}")
+
+    def track(
+        self,
+        session: AsyncSession,
+        index: VectorIndex,
+        written: Iterable[UUID] = (),
+        deleted: Iterable[UUID] = (),
+    ) -> None:
+        """Queue a session's changes to memories' embeddings for an index.
+
+        Args:
+            session: Session the write was made in
+            index: This process's index
+            written: Memories whose embeddings were set
+            deleted: Memories that were deleted
+        """
+        written, deleted = set(written), set(deleted)
+        index.recheck(written)
+
+        sync_session = session.sync_session
+        pending = sync_session.info.get(self._info_key)
+        if pending is None:
+            pending = sync_session.info[self._info_key] = {}
+            event.listen(sync_session, "after_commit", self._after_commit)
+            event.listen(sync_session, "after_rollback", self._after_rollback)
+        pending_written, pending_deleted = pending.setdefault(index, (set(), set()))
+        pending_written.update(written)
+        pending_deleted.update(deleted)
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info[self._info_key]
+        if not pending:
+            return
+        changed: set[UUID] = set()
+        for index, (written, deleted) in pending.items():
+            index.recheck(deleted)
+            changed |= written | deleted
+        pending.clear()
+        task = asyncio.ensure_future(self.publish(changed))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _after_rollback(self, session: Session) -> None:
+        pending = session.info[self._info_key]
+        for index, (written, deleted) in pending.items():
+            index.recheck(written | deleted)
+        pending.clear()
+
+    async def wait_pending(self) -> None:
+        """Wait for publishes scheduled by commits to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def publish(self, ids: Iterable[UUID]) -> None:
+        """Append changed memories to the log."""
+        fields = {"ids": ",".join(memory_id.hex for memory_id in ids)}
+        if not fields["ids"]:
+            return
+        if self._lost:
+            fields["reset"] = "1"
+
+        # Attempted even while backing off: a lost entry leaves other indexes stale
+        try:
+            await get_redis_client().xadd(
+                self.key, fields, maxlen=CHANGE_LOG_MAXLEN, approximate=True
+            )
+            self._lost = False
+        except Exception as e:
+            self._lost = True
+            self._record_error("publish", e)
+
+    async def read(self, position: Optional[str]) -> Optional[ChangeLogRead]:
+        """Read the changes past a position in one round trip.
+
+        Returns None while Redis is unavailable.
+        """
+        if not self.available:
+            return None
+
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.xlen(self.key)
+                pipe.xrange(self.key, "-", "+", count=1)
+                pipe.xrevrange(self.key, "+", "-", count=1)
+                if position is not None:
+                    pipe.xrange(self.key, f"({position}", "+", count=CHANGE_LOG_READ_LIMIT)
+                length, first, last, *rest = await pipe.execute()
+        except Exception as e:
+            self._record_error("read", e)
+            return None
+
+        tip = last[0][0] if last else "0-0"
+        if position is None:
+            return ChangeLogRead(tip, None)
+
+        entries = rest[0]
+        # Approximate trimming keeps at least MAXLEN entries, so a shorter stream was never trimmed
+        trimmed = bool(first) and _stream_id(first[0][0]) > _stream_id(position)
+        lost = (
+            (trimmed and length >= CHANGE_LOG_MAXLEN)
+            or (not last and position != "0-0")  # The stream itself is gone
+            or len(entries) >= CHANGE_LOG_READ_LIMIT
+            or any("reset" in fields for _, fields in entries)
+        )
+        if lost:
+            return ChangeLogRead(tip, None)
+
+        ids = {
+            UUID(hex=memory_id)
+            for _, fields in entries
+            for memory_id in fields["ids"].split(",")
+        }
+        return ChangeLogRead(entries[-1][0] if entries else position, ids)
+
+
+# Global change log instance
+vector_index_changes = IndexChangeLog()
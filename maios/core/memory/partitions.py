@@ -0,0 +1,112 @@
+# maios/core/memory/partitions.py
+"""Partition management for a partitioned memoryentry table (PostgreSQL).
+
+With ``settings.memory_partitioning`` set, the table is created partitioned
+(see ``maios.models.memory.partition_for``). Partitions are created on
+demand before memories are stored in them, on a connection of their own so
+the parent table's lock is not held for the rest of the storing
+transaction. Queries filtering on the partition key (``project_id`` or
+``created_at``) are pruned to the matching partitions by PostgreSQL.
+"""
+
+import logging
+import threading
+import weakref
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import Engine, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from maios.models.memory import partition_for, partition_scheme
+
+logger = logging.getLogger(__name__)
+
+# Partitions known to exist, per engine
+_known: "weakref.WeakKeyDictionary[Engine, set[str]]" = weakref.WeakKeyDictionary()
+_known_lock = threading.Lock()
+
+
+def _known_partitions(engine: Engine) -> set[str]:
+    with _known_lock:
+        known = _known.get(engine)
+        if known is None:
+            known = _known[engine] = set()
+        return known
+
+
+def partitioned(session: AsyncSession) -> Optional[str]:
+    """Get the partitioning scheme in effect for a session's database."""
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    return partition_scheme()
+
+
+async def ensure_partitions(session: AsyncSession, rows: Iterable[dict[str, Any]]) -> None:
+    """Create any missing partitions the rows will be stored in.
+
+    Args:
+        session: Session the rows will be stored with
+        rows: Memory rows with ``project_id`` and ``created_at``
+    """
+    scheme = partitioned(session)
+    if scheme is None:
+        return
+
+    engine = session.get_bind()
+    known = _known_partitions(engine)
+    missing = {}
+    for row in rows:
+        created_at = row.get("created_at") or datetime.now(timezone.utc)
+        name, ddl = partition_for(scheme, row.get("project_id"), created_at)
+        if name not in known:
+            missing[name] = ddl
+    if not missing:
+        return
+
+    async with AsyncEngine(engine).connect() as conn:
+        for name, ddl in missing.items():
+            try:
+                await conn.execute(text(ddl))
+                await conn.commit()
+            except exc.DBAPIError:
+                # Another process may have created it between our check and CREATE
+                await conn.rollback()
+                exists = await conn.scalar(
+                    text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+                )
+                if not exists:
+                    raise
+            known.add(name)
+            logger.info(f"Created memory partition {name}")
+
+
+async def drop_project_partition(session: AsyncSession, project_id: UUID) -> Optional[int]:
+    """Detach and drop a project's partition.
+
+    Runs outside the session's transaction: ``DETACH PARTITION
+    CONCURRENTLY`` cannot run inside one, and it never blocks queries on
+    other projects.
+
+    Returns:
+        Number of memories dropped, or None when memories are not
+        partitioned by project
+    """
+    if partitioned(session) != "project":
+        return None
+
+    engine = session.get_bind()
+    name, _ = partition_for("project", project_id, datetime.now(timezone.utc))
+    async with AsyncEngine(engine).connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}):
+            return 0
+        count = await conn.scalar(text(f"SELECT count(*) FROM {name}"))
+        await conn.execute(text(f"ALTER TABLE memoryentry DETACH PARTITION {name} CONCURRENTLY"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+
+    _known_partitions(engine).discard(name)
+    logger.info(f"Dropped memory partition {name} ({count} memories)")
+    return count
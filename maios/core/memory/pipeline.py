@@ -0,0 +1,213 @@
+# maios/core/memory/pipeline.py
+"""Batch embedding pipeline for memories without an embedding.
+
+A reader pages through ``embedding IS NULL`` rows by primary key and hands
+batches to a few workers through a bounded queue; workers embed each batch
+with the configured provider and write it back with one executemany
+UPDATE, committing per batch. The bounded queue is the backpressure: the
+reader never runs more than ``concurrency`` batches ahead of the provider.
+
+Runs are resumable by construction: committed batches no longer match
+``embedding IS NULL``, so an interrupted run simply continues from the
+remaining rows next time. Batches the provider keeps failing on are
+skipped for this run and retried on the next.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from maios.core.config import settings
+from maios.core.memory.embeddings import EmbeddingProvider, get_embedding_provider
+from maios.core.memory.service import MemoryService
+from maios.models.memory import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+# Attempts per batch before it is left for the next run
+MAX_ATTEMPTS = 3
+
+# First retry delay; doubles per attempt
+RETRY_BACKOFF_SECONDS = 1.0
+
+Batch = list[tuple[UUID, str]]
+
+
+@dataclass
+class EmbeddingRunStats:
+    """Counters and timings for one pipeline run."""
+
+    batches: int = 0
+    embedded: int = 0
+    failed: int = 0
+    retries: int = 0
+    # Rows given the embedding of an identical content in the same batch
+    reused: int = 0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    duration_seconds: float = 0.0
+    # True when the run stopped at max_batches with rows possibly left
+    more_pending: bool = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return counters plus throughput as a JSON-serializable dict."""
+        return {
+            "batches": self.batches,
+            "embedded": self.embedded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "reused": self.reused,
+            "embed_seconds": round(self.embed_seconds, 3),
+            "write_seconds": round(self.write_seconds, 3),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "rows_per_second": (
+                round(self.embedded / self.duration_seconds, 1) if self.duration_seconds else 0.0
+            ),
+            "more_pending": self.more_pending,
+        }
+
+
+class EmbeddingPipeline:
+    """Embeds memories whose ``embedding`` is NULL, in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        provider: Optional[EmbeddingProvider] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_batches: Optional[int] = None,
+    ):
+        """Create a pipeline.
+
+        Args:
+            session_factory: Opens a new session (one per page read and per batch write)
+            provider: Embedding provider; defaults to the configured one
+            batch_size: Memories per provider call and per UPDATE
+            concurrency: Batches embedded at once
+            max_batches: Batches per run before stopping (None for no limit)
+        """
+        self._session_factory = session_factory
+        self.provider = provider or get_embedding_provider()
+        self.batch_size = batch_size or settings.memory_embedding_batch_size
+        self.concurrency = concurrency or settings.memory_embedding_concurrency
+        self.max_batches = (
+            max_batches if max_batches is not None else settings.memory_embedding_max_batches
+        )
+
+    async def run(self) -> EmbeddingRunStats:
+        """Embed pending memories until none are left or max_batches is reached."""
+        stats = EmbeddingRunStats()
+        started = time.perf_counter()
+        queue: asyncio.Queue[Optional[Batch]] = asyncio.Queue(maxsize=self.concurrency)
+
+        workers = [asyncio.create_task(self._work(queue, stats)) for _ in range(self.concurrency)]
+        try:
+            await self._read(queue, stats)
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+        stats.duration_seconds = time.perf_counter() - started
+        logger.info(
+            f"Embedded {stats.embedded} memories in {stats.duration_seconds:.1f}s "
+            f"({stats.failed} failed, {stats.batches} batches)"
+        )
+        return stats
+
+    async def _read(self, queue: asyncio.Queue, stats: EmbeddingRunStats) -> None:
+        """Page through pending rows by id and enqueue them as batches."""
+        last_id: Optional[UUID] = None
+        pages = 0
+        while self.max_batches is None or pages < self.max_batches:
+            stmt = select(MemoryEntry.id, MemoryEntry.content).where(
+                MemoryEntry.embedding.is_(None)
+            )
+            if last_id is not None:
+                stmt = stmt.where(MemoryEntry.id > last_id)
+            stmt = stmt.order_by(MemoryEntry.id).limit(self.batch_size)
+
+            async with self._session_factory() as session:
+                rows = (await session.execute(stmt)).all()
+            if not rows:
+                return
+
+            last_id = rows[-1].id
+            pages += 1
+            # Blocks while workers are busy
+            await queue.put([(row.id, row.content) for row in rows])
+            if len(rows) < self.batch_size:
+                return
+
+        stats.more_pending = True
+
+    async def _work(self, queue: asyncio.Queue, stats: EmbeddingRunStats) -> None:
+        while (batch := await queue.get()) is not None:
+            try:
+                await self._process(batch, stats)
+            except Exception as e:
+                stats.failed += len(batch)
+                logger.error(f"Embedding batch of {len(batch)} memories failed: {e}")
+
+    async def _embed(self, texts: list[str], stats: EmbeddingRunStats) -> list[list[float]]:
+        """Call the provider, retrying with exponential backoff."""
+        delay = RETRY_BACKOFF_SECONDS
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            started = time.perf_counter()
+            try:
+                vectors = await self.provider.embed(texts)
+                break
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                stats.retries += 1
+                logger.warning(f"Embedding provider failed (attempt {attempt}), retrying: {e}")
+            finally:
+                stats.embed_seconds += time.perf_counter() - started
+            await asyncio.sleep(delay)
+            delay *= 2
+
+        if len(vectors) != len(texts):
+            raise ValueError(f"Provider returned {len(vectors)} vectors for {len(texts)} texts")
+        return vectors
+
+    async def _process(self, batch: Batch, stats: EmbeddingRunStats) -> None:
+        ids = [memory_id for memory_id, _ in batch]
+        # Identical contents (e.g. the same fact in several projects) are embedded once
+        texts = list(dict.fromkeys(content for _, content in batch))
+        by_text = dict(zip(texts, await self._embed(texts, stats)))
+        vectors = [by_text[content] for _, content in batch]
+        stats.reused += len(batch) - len(texts)
+
+        valid = [
+            (memory_id, vector)
+            for memory_id, vector in zip(ids, vectors)
+            if len(vector) == self.provider.dimensions
+        ]
+        stats.failed += len(batch) - len(valid)
+        if not valid:
+            return
+
+        started = time.perf_counter()
+        async with self._session_factory() as session:
+            # Bulk UPDATE by primary key; skips rows embedded meanwhile by set_embedding
+            await session.execute(
+                update(MemoryEntry)
+                .where(MemoryEntry.embedding.is_(None))
+                .execution_options(synchronize_session=None),
+                [{"id": memory_id, "embedding": vector} for memory_id, vector in valid],
+            )
+            MemoryService(session).reindex(written=[memory_id for memory_id, _ in valid])
+            await session.commit()
+        stats.write_seconds += time.perf_counter() - started
+
+        stats.batches += 1
+        stats.embedded += len(valid)
@@ -0,0 +1,251 @@
+# maios/core/memory/query_cache.py
+"""Redis cache of memory query results.
+
+Results of ``MemoryService.search`` and ``get_recent`` are cached for a few
+seconds, keyed by query and filters. Each entry records the generation
+counters of the scopes it was read from: the agent, the project, or (for
+unscoped queries) all memories, plus an epoch for wholesale invalidation.
+Writers bump the counters of the scopes they touch, so an entry whose
+counters moved on is a miss, without tracking which entries a write affects.
+
+Counters are bumped after the writing session commits: bumping earlier
+would let a read racing the commit cache the old rows under the new
+counters. If Redis is unreachable the cache steps aside like
+``EntityCache``; invalidations are still attempted, and one that fails
+makes this process bypass the cache until it manages to bump the epoch.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from maios.core.cache import ERROR_BACKOFF_SECONDS, CacheStats
+from maios.core.config import settings
+from maios.core.redis import get_redis_client
+from maios.models.memory import MemoryEntry
+from maios.models.types import pack_embedding, unpack_embedding
+
+logger = logging.getLogger(__name__)
+
+# Generation counters outlive any entry read under them
+GENERATION_TTL_SECONDS = 86400
+
+
+@dataclass
+class QueryLookup:
+    """Outcome of a cache lookup; ``memories`` is None on a miss."""
+
+    key: str
+    generations: list[str]
+    memories: Optional[list[MemoryEntry]]
+
+
+class MemoryQueryCache:
+    """Short-lived cache of memory query results with generation-counter invalidation."""
+
+    def __init__(self, prefix: str = "maios:memory-query"):
+        self.prefix = prefix
+        self.stats = CacheStats()
+        self._retry_at = 0.0
+        # Set when an invalidation was lost; cleared by a successful epoch bump
+        self._stale = False
+        self._info_key = f"{prefix}:pending"
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is configured on."""
+        return settings.cache_enabled and settings.memory_query_cache_ttl_seconds > 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the cache is enabled and not backing off after an error."""
+        return self.enabled and time.monotonic() >= self._retry_at
+
+    def _record_error(self, action: str, error: Exception) -> None:
+        self.stats.incr("errors")
+        self._retry_at = time.monotonic() + ERROR_BACKOFF_SECONDS
+        logger.warning(
+            f"Memory query cache {action} failed, bypassing for {ERROR_BACKOFF_SECONDS}s: {error}"
+        )
+
+    def generation_keys(self, agent_id: Optional[UUID], project_id: Optional[UUID]) -> list[str]:
+        """Counters a query over these scopes depends on."""
+        keys = [f"{self.prefix}:epoch"]
+        if agent_id is not None:
+            keys.append(f"{self.prefix}:gen:agent:{agent_id}")
+        if project_id is not None:
+            keys.append(f"{self.prefix}:gen:project:{project_id}")
+        if agent_id is None and project_id is None:
+            keys.append(f"{self.prefix}:gen:all")
+        return keys
+
+    def key(self, kind: str, params: dict[str, Any]) -> str:
+        """Build the cache key for a query."""
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.prefix}:{kind}:{digest}"
+
+    async def get(
+        self,
+        kind: str,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        **params: Any,
+    ) -> Optional[QueryLookup]:
+        """Look up a query's results in one round trip.
+
+        Returns None when the cache is unavailable; otherwise a lookup to
+        pass to ``set`` after a miss.
+        """
+        if not self.available:
+            return None
+        if self._stale:
+            await self.invalidate_all()
+            if self._stale:
+                return None
+
+        key = self.key(kind, {"agent_id": agent_id, "project_id": project_id, **params})
+        generation_keys = self.generation_keys(agent_id, project_id)
+        try:
+            *generations, raw = await get_redis_client().mget(*generation_keys, key)
+        except Exception as e:
+            self._record_error("get", e)
+            return None
+
+        generations = [g or "0" for g in generations]
+        if raw is not None:
+            entry = json.loads(raw)
+            if entry["generations"] == generations:
+                self.stats.incr("hits")
+                return QueryLookup(key, generations, [self._load(row) for row in entry["memories"]])
+
+        self.stats.incr("misses")
+        return QueryLookup(key, generations, None)
+
+    async def set(self, lookup: QueryLookup, memories: list[MemoryEntry]) -> None:
+        """Cache a query's results under the generations seen before it ran."""
+        if not self.available:
+            return
+
+        payload = json.dumps(
+            {"generations": lookup.generations, "memories": [self._dump(m) for m in memories]},
+            separators=(",", ":"),
+        )
+        try:
+            await get_redis_client().set(
+                lookup.key, payload, px=int(settings.memory_query_cache_ttl_seconds * 1000)
+            )
+            self.stats.incr("sets")
+        except Exception as e:
+            self._record_error("set", e)
+
+    async def invalidate(
+        self,
+        agent_ids: Iterable[Optional[UUID]] = (),
+        project_ids: Iterable[Optional[UUID]] = (),
+    ) -> None:
+        """Expire cached results over the given agents and projects (and unscoped ones)."""
+        await self._bump(self._scope_keys(agent_ids, project_ids))
+
+    async def invalidate_all(self) -> None:
+        """Expire every cached result."""
+        await self._bump([f"{self.prefix}:epoch"])
+
+    def invalidate_on_commit(
+        self,
+        session: AsyncSession,
+        agent_ids: Iterable[Optional[UUID]] = (),
+        project_ids: Iterable[Optional[UUID]] = (),
+        everything: bool = False,
+    ) -> None:
+        """Expire cached results over these scopes once the session commits.
+
+        Args:
+            session: Session the write was made in
+            agent_ids: Agents whose memories changed
+            project_ids: Projects whose memories changed
+            everything: Expire every cached result instead
+        """
+        sync_session = session.sync_session
+        pending = sync_session.info.get(self._info_key)
+        if pending is None:
+            pending = sync_session.info[self._info_key] = set()
+            event.listen(sync_session, "after_commit", self._after_commit)
+        if everything:
+            pending.add(f"{self.prefix}:epoch")
+        else:
+            pending.update(self._scope_keys(agent_ids, project_ids))
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info[self._info_key]
+        if not pending:
+            return
+        keys = sorted(pending)
+        pending.clear()
+        task = asyncio.ensure_future(self._bump(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def wait_pending(self) -> None:
+        """Wait for invalidations scheduled by commits to finish."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def _scope_keys(
+        self, agent_ids: Iterable[Optional[UUID]], project_ids: Iterable[Optional[UUID]]
+    ) -> list[str]:
+        keys = [f"{self.prefix}:gen:all"]
+        keys += [f"{self.prefix}:gen:agent:{a}" for a in set(agent_ids) if a is not None]
+        keys += [f"{self.prefix}:gen:project:{p}" for p in set(project_ids) if p is not None]
+        return keys
+
+    async def _bump(self, keys: list[str]) -> None:
+        # Attempted even while backing off: a lost bump leaves stale entries
+        if not self.enabled:
+            return
+
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incr(key)
+                    pipe.expire(key, GENERATION_TTL_SECONDS)
+                await pipe.execute()
+            self.stats.incr("invalidations", len(keys))
+            if f"{self.prefix}:epoch" in keys:
+                self._stale = False
+        except Exception as e:
+            self._stale = True
+            self._record_error("invalidate", e)
+
+    @staticmethod
+    def _dump(memory: MemoryEntry) -> dict[str, Any]:
+        row = memory.model_dump(mode="json", exclude={"embedding"})
+        if memory.embedding is not None:
+            packed = pack_embedding(memory.embedding, "float32")
+            row["embedding"] = base64.b64encode(packed).decode()
+        return row
+
+    @staticmethod
+    def _load(row: dict[str, Any]) -> MemoryEntry:
+        embedding = row.pop("embedding", None)
+        memory = MemoryEntry.model_validate(row)
+        if embedding is not None:
+            memory.embedding = unpack_embedding(base64.b64decode(embedding))
+        # A detached copy of the stored row, so sessions can merge it without loading
+        make_transient_to_detached(memory)
+        return memory
+
+
+# Global memory query cache instance
+memory_query_cache = MemoryQueryCache()
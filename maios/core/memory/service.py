@@ -1,20 +1,231 @@
 """Memory service for managing agent memories."""
 
+import json
+import logging
+import math
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    type_coerce,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB, REGCONFIG, TSVECTOR
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from maios.models.memory import MemoryEntry, MemoryType
+from maios.core.config import settings
+from maios.core.memory.access import AccessTracker, as_utc, get_access_tracker
+from maios.core.memory.index_sync import vector_index_changes
+from maios.core.memory.partitions import drop_project_partition, ensure_partitions
+from maios.core.memory.query_cache import MemoryQueryCache, memory_query_cache
+from maios.core.memory.vector_index import VectorIndex, get_vector_index
+from maios.core.memory.working import WorkingMemory, WorkingMemoryItem, working_memory
+from maios.models.memory import (
+    FTS_CONFIG,
+    SQLITE_FTS_REBUILD,
+    MemoryEntry,
+    MemoryType,
+    SharedMemoryAgent,
+    content_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# pgvector rejects hnsw.ef_search above this
+MAX_EF_SEARCH = 1000
+
+# Share of a search result's score from text relevance; the rest is get_relevance_score()
+TEXT_RANK_WEIGHT = 0.7
+
+# Text matches fetched per requested result, re-ordered by the blended score
+SEARCH_CANDIDATE_FACTOR = 4
+
+# Rows per batch when loading embeddings into the local vector index
+INDEX_SYNC_BATCH = 1000
+
+# pgvector's own hnsw.ef_search default; recall only overrides it for more candidates
+PGVECTOR_DEFAULT_EF_SEARCH = 40
+
+
+@dataclass(frozen=True)
+class RecallWeights:
+    """Weight of each signal in a recall score."""
+
+    text: float = 0.35
+    vector: float = 0.35
+    recency: float = 0.1
+    importance: float = 0.15
+    access: float = 0.05
+
+
+@dataclass
+class RecallResult:
+    """A recalled memory with its blended score and the unweighted signals behind it."""
+
+    memory: MemoryEntry
+    score: float
+    scores: dict[str, float]
+
+
+def normalize_tags(tags: list[str]) -> list[str]:
+    """Lowercase and strip tags, dropping blanks and duplicates (order kept)."""
+    return list(dict.fromkeys(t for t in (tag.lower().strip() for tag in tags) if t))
+
+
+def fts_match_query(query: str) -> Optional[str]:
+    """Build an FTS5 MATCH expression requiring every word of a free-text query.
+
+    Words are quoted so FTS5 syntax in user input is matched literally.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+def tag_filter(tags: list[str], match_all: bool, dialect: str):
+    """WHERE clause matching memories with any (or all) of the tags."""
+    if dialect == "postgresql":
+        column = type_coerce(MemoryEntry.tags, JSONB)
+        values = postgresql.array(tags)
+        return column.has_all(values) if match_all else column.has_any(values)
+
+    each = func.json_each(MemoryEntry.tags).table_valued("value")
+    if not match_all:
+        return exists(select(1).select_from(each).where(each.c.value.in_(tags)))
+    matched = (
+        select(func.count(func.distinct(each.c.value)))
+        .select_from(each)
+        .where(each.c.value.in_(tags))
+        .scalar_subquery()
+    )
+    return matched == len(tags)
+
+
+def agent_filter(agent_id: UUID):
+    """WHERE clause matching an agent's memories, including shared ones held by another agent."""
+    shared = select(SharedMemoryAgent.memory_id).where(SharedMemoryAgent.agent_id == agent_id)
+    return or_(MemoryEntry.agent_id == agent_id, MemoryEntry.id.in_(shared))
 
 
 class MemoryService:
     """Service for managing agent memories."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        vector_index: Optional[VectorIndex] = None,
+        query_cache: Optional[MemoryQueryCache] = None,
+        working: Optional[WorkingMemory] = None,
+    ):
         self._session = session
+        self._vector_index = vector_index
+        self.query_cache = query_cache or memory_query_cache
+        # Holds MemoryType.WORKING memories; they never reach the database
+        self.working = working or working_memory
+        # After a write, reads bypass the query cache to see this session's changes
+        self._wrote = False
+
+    @property
+    def dialect(self) -> str:
+        """Name of the database dialect the session is bound to."""
+        return self._session.get_bind().dialect.name
+
+    @property
+    def vector_index(self) -> Optional[VectorIndex]:
+        """Local vector index for semantic search, or None when pgvector serves it."""
+        if self._vector_index is None and self.dialect != "postgresql":
+            self._vector_index = get_vector_index(self._session.get_bind())
+        return self._vector_index
+
+    @property
+    def access_tracker(self) -> AccessTracker:
+        """Buffer of accesses not yet written to the database."""
+        return get_access_tracker(self._session.get_bind())
+
+    def _with_pending_access(self, memories: list[MemoryEntry]) -> list[MemoryEntry]:
+        """Overlay buffered accesses on loaded memories."""
+        self.access_tracker.overlay(memories)
+        return memories
+
+    async def _changed(
+        self,
+        agent_ids: Iterable[Optional[UUID]] = (),
+        project_ids: Iterable[Optional[UUID]] = (),
+    ) -> None:
+        """Invalidate cached query results over the scopes a write touched, on commit."""
+        self._wrote = True
+        self.query_cache.invalidate_on_commit(self._session, agent_ids, project_ids)
+
+    def reindex(self, written: Iterable[UUID] = (), deleted: Iterable[UUID] = ()) -> None:
+        """Queue memories whose embeddings this session changed for the local vector index.
+
+        Written embeddings are re-read at the next sync, so this session's
+        searches see them; deleted memories drop out once the session
+        commits. Other processes are told on commit (see ``index_sync``).
+        """
+        if self.vector_index is not None:
+            vector_index_changes.track(self._session, self.vector_index, written, deleted)
+
+    async def _cached(
+        self,
+        kind: str,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        params: dict[str, Any],
+        run: Callable[[], Awaitable[list[MemoryEntry]]],
+    ) -> list[MemoryEntry]:
+        """Serve a query from the query cache, running and caching it on a miss."""
+        lookup = None
+        if not self._wrote:
+            lookup = await self.query_cache.get(kind, agent_id, project_id, **params)
+        if lookup is not None and lookup.memories is not None:
+            # Attach cached copies as if loaded, without a query
+            memories = [await self._session.merge(m, load=False) for m in lookup.memories]
+            return self._with_pending_access(memories)
+
+        memories = await run()
+        if lookup is not None:
+            await self.query_cache.set(lookup, memories)
+        return memories
+
+    @staticmethod
+    def _filtered(
+        stmt: Select,
+        agent_id: Optional[UUID] = None,
+        project_id: Optional[UUID] = None,
+        memory_type: Optional[MemoryType] = None,
+    ) -> Select:
+        """Apply the common agent/project/type filters to a query."""
+        if agent_id is not None:
+            stmt = stmt.where(agent_filter(agent_id))
+        if project_id is not None:
+            stmt = stmt.where(MemoryEntry.project_id == project_id)
+        if memory_type is not None:
+            stmt = stmt.where(MemoryEntry.memory_type == memory_type)
+        return stmt
 
     async def store(
         self,
@@ -28,29 +239,280 @@ class MemoryService:
         keywords: list[str] | None = None,
         tags: list[str] | None = None,
     ) -> MemoryEntry:
-        """Store a new memory entry."""
-        memory = MemoryEntry(
-            content=content,
-            memory_type=memory_type,
-            agent_id=agent_id,
-            project_id=project_id,
-            task_id=task_id,
-            team_id=team_id,
-            importance=importance,
-            keywords=keywords or [],
-            tags=tags or [],
-        )
-        self._session.add(memory)
-        await self._session.flush()
-        await self._session.refresh(memory)
-        return memory
+        """Store a new memory entry.
+
+        Shared memory types are stored once per content and scope: storing
+        the same content again returns the existing entry with its
+        importance bumped, which may belong to another agent of the
+        project (see ``store_many``).
+
+        Working memories go to the agent's working memory in Redis instead
+        (see ``get_working_memory``); the entry returned for one is not
+        persisted.
+
+        Raises:
+            ValueError: If a working memory has no agent
+        """
+        if memory_type == MemoryType.WORKING:
+            memory = MemoryEntry(
+                content=content,
+                memory_type=memory_type,
+                agent_id=agent_id,
+                project_id=project_id,
+                task_id=task_id,
+                team_id=team_id,
+                importance=importance,
+                keywords=keywords or [],
+                tags=normalize_tags(tags or []),
+            )
+            await self._put_working([memory.model_dump()])
+            return memory
+
+        (memory_id,) = await self.store_many(
+            [
+                {
+                    "content": content,
+                    "memory_type": memory_type,
+                    "agent_id": agent_id,
+                    "project_id": project_id,
+                    "task_id": task_id,
+                    "team_id": team_id,
+                    "importance": importance,
+                    "keywords": keywords or [],
+                    "tags": tags or [],
+                }
+            ]
+        )
+        # Reloaded, since an existing entry may have been bumped by a bulk UPDATE
+        memory = await self._session.get(MemoryEntry, memory_id, populate_existing=True)
+        return self._with_pending_access([memory])[0]
+
+    async def store_many(self, entries: list[dict[str, Any]]) -> list[UUID]:
+        """Store many memories in one round trip, returning their ids in order.
+
+        Each entry takes the same fields as ``store`` (plus an optional
+        ``embedding``). All entries are validated before anything is
+        written. Rows go out as one multi-row ``INSERT`` (batched by the
+        driver for very long lists; shared-content rows in a second one
+        that skips conflicting rows); on PostgreSQL, imports of at least
+        ``settings.memory_copy_threshold`` rows without embeddings use
+        ``COPY`` instead. Ids are generated client-side, so nothing is
+        read back.
+
+        Working memories are added to their agents' working memory in
+        Redis, keeping their ids; their embeddings and keywords are dropped.
+
+        Shared memory types (``SHARED_MEMORY_TYPES``) are content-addressed:
+        an entry whose content is already stored in its scope (project and
+        type, or agent and type without a project), by any agent or earlier
+        in the same call, is not inserted. Its id is the existing memory's,
+        and that memory's importance is bumped by
+        ``settings.memory_dedup_importance_boost`` instead. When the memory
+        belongs to another agent, the storing agent is recorded in
+        ``SharedMemoryAgent`` so agent-filtered reads still find it.
+
+        Raises:
+            pydantic.ValidationError: If any entry is invalid
+            ValueError: If a working memory has no agent
+        """
+        rows = []
+        for entry in entries:
+            entry = {**entry, "tags": normalize_tags(entry.get("tags") or [])}
+            row = MemoryEntry.model_validate(entry).model_dump()
+            row["content_hash"] = content_hash(
+                row["content"], row["memory_type"], row["project_id"], row["agent_id"]
+            )
+            rows.append(row)
+        if not rows:
+            return []
+
+        ids = [row["id"] for row in rows]
+        working = [row for row in rows if row["memory_type"] == MemoryType.WORKING]
+        if working:
+            await self._put_working(working)
+            rows = [row for row in rows if row["memory_type"] != MemoryType.WORKING]
+            if not rows:
+                return ids
+        scopes = [(row["agent_id"], row["project_id"]) for row in rows]
+        rows, bumped, links = await self._fold_shared(rows, ids)
+        await ensure_partitions(self._session, rows)
+
+        shared = [row for row in rows if row["content_hash"] is not None]
+        rows = [row for row in rows if row["content_hash"] is None]
+        use_copy = (
+            self.dialect == "postgresql"
+            and len(rows) >= settings.memory_copy_threshold
+            and all(row["embedding"] is None for row in rows)
+        )
+        if use_copy:
+            await self._copy_rows(rows)
+        elif rows:
+            await self._session.execute(insert(MemoryEntry), rows)
+        if shared:
+            inserted, lost = await self._insert_shared(shared)
+            rows += inserted
+            if lost:
+                # Stored by another session since _fold_shared looked
+                unstored, raced, raced_links = await self._fold_shared(lost, ids)
+                bumped += raced
+                links += raced_links
+                if unstored:
+                    logger.warning(f"{len(unstored)} shared memories conflicted but were not found")
+        if bumped:
+            await self._session.execute(
+                update(MemoryEntry),
+                [{"id": b["id"], "importance": b["importance"]} for b in bumped],
+            )
+        if links:
+            await self._link_agents(links)
+        await self._changed(
+            [agent for agent, _ in scopes] + [row["agent_id"] for row in bumped],
+            [project for _, project in scopes] + [row["project_id"] for row in bumped],
+        )
+
+        self.reindex(written=[row["id"] for row in rows if row["embedding"] is not None])
+        return ids
+
+    async def _put_working(self, rows: list[dict[str, Any]]) -> None:
+        """Add validated working memory rows to their agents' working memory."""
+        if any(row["agent_id"] is None for row in rows):
+            raise ValueError("Working memories need an agent_id")
+        for row in rows:
+            item = WorkingMemoryItem(
+                id=row["id"],
+                content=row["content"],
+                importance=row["importance"],
+                project_id=row["project_id"],
+                task_id=row["task_id"],
+                tags=row["tags"],
+                created_at=as_utc(row["created_at"]),
+            )
+            await self.working.put_item(row["agent_id"], item, self._session)
+
+    async def _fold_shared(
+        self, rows: list[dict[str, Any]], ids: list[UUID]
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+        """Fold rows of shared content into the memory already holding it.
+
+        Positions of folded rows in ``ids`` get the holder's id. Returns the
+        rows still to insert, importance updates for stored holders, and
+        ``SharedMemoryAgent`` rows for folded rows of other agents.
+        """
+        positions: dict[str, list[int]] = {}
+        for i, row in enumerate(rows):
+            if row["content_hash"] is not None:
+                positions.setdefault(row["content_hash"], []).append(i)
+        if not positions:
+            return rows, [], []
+
+        result = await self._session.execute(
+            select(
+                MemoryEntry.id,
+                MemoryEntry.content_hash,
+                MemoryEntry.importance,
+                MemoryEntry.agent_id,
+                MemoryEntry.project_id,
+            ).where(MemoryEntry.content_hash.in_(list(positions)))
+        )
+        stored = {row.content_hash: row for row in result}
+        slots: dict[UUID, list[int]] = {}
+        for i, row_id in enumerate(ids):
+            slots.setdefault(row_id, []).append(i)
+
+        folded: set[int] = set()
+        bumped = []
+        links: dict[tuple[UUID, UUID], dict[str, Any]] = {}
+        for digest, indexes in positions.items():
+            holder = stored.get(digest)
+            # Without a stored holder, the first row is inserted and holds the rest
+            repeats = indexes if holder is not None else indexes[1:]
+            importance = holder.importance if holder is not None else rows[indexes[0]]["importance"]
+            holder_id = holder.id if holder is not None else rows[indexes[0]]["id"]
+            holder_agent = holder.agent_id if holder is not None else rows[indexes[0]]["agent_id"]
+            for i in repeats:
+                agent_id = rows[i]["agent_id"]
+                if agent_id is not None and agent_id != holder_agent:
+                    links[(agent_id, holder_id)] = {"agent_id": agent_id, "memory_id": holder_id}
+                boosted = max(importance, rows[i]["importance"])
+                importance = min(1.0, boosted + settings.memory_dedup_importance_boost)
+                for slot in slots[rows[i]["id"]]:
+                    ids[slot] = holder_id
+                folded.add(i)
+            if holder is None:
+                rows[indexes[0]]["importance"] = importance
+            else:
+                bumped.append(
+                    {
+                        "id": holder.id,
+                        "importance": importance,
+                        "agent_id": holder.agent_id,
+                        "project_id": holder.project_id,
+                    }
+                )
+
+        return [row for i, row in enumerate(rows) if i not in folded], bumped, list(links.values())
+
+    async def _link_agents(self, links: list[dict[str, Any]]) -> None:
+        """Insert ``SharedMemoryAgent`` rows, skipping ones already recorded."""
+        dialect_insert = postgresql.insert if self.dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(SharedMemoryAgent).on_conflict_do_nothing()
+        await self._session.execute(stmt, links)
+
+    async def share_with(self, memory_id: UUID, agent_ids: Iterable[UUID]) -> None:
+        """Make a shared memory visible to agents other than its owner."""
+        links = [{"agent_id": agent_id, "memory_id": memory_id} for agent_id in set(agent_ids)]
+        if links:
+            await self._link_agents(links)
+            await self._changed([link["agent_id"] for link in links])
+
+    async def _insert_shared(
+        self, rows: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Insert shared-content rows, skipping any that lost a race to an identical one.
+
+        Returns the inserted rows and the skipped ones.
+        """
+        dialect_insert = postgresql.insert if self.dialect == "postgresql" else sqlite.insert
+        result = await self._session.execute(
+            dialect_insert(MemoryEntry).on_conflict_do_nothing().returning(MemoryEntry.id), rows
+        )
+        inserted = set(result.scalars())
+        return (
+            [row for row in rows if row["id"] in inserted],
+            [row for row in rows if row["id"] not in inserted],
+        )
+
+    async def _copy_rows(self, rows: list[dict[str, Any]]) -> None:
+        """Load rows with asyncpg's binary COPY."""
+        columns = [name for name in rows[0] if name != "embedding"]
+        json_columns = {"keywords", "tags"}
+
+        def record(row: dict[str, Any]) -> tuple:
+            values = []
+            for name in columns:
+                value = row[name]
+                if name in json_columns:
+                    value = json.dumps(value)
+                elif name == "memory_type":
+                    value = value.name  # Enums are stored by name
+                values.append(value)
+            return tuple(values)
+
+        connection = await self._session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            MemoryEntry.__tablename__, records=[record(row) for row in rows], columns=columns
+        )
 
     async def get(self, memory_id: UUID) -> MemoryEntry | None:
         """Get a memory by ID."""
         result = await self._session.execute(
             select(MemoryEntry).where(MemoryEntry.id == memory_id)
         )
-        return result.scalar_one_or_none()
+        memory = result.scalar_one_or_none()
+        if memory is not None:
+            self._with_pending_access([memory])
+        return memory
 
     async def search(
         self,
@@ -60,84 +522,456 @@ class MemoryService:
         memory_type: Optional[MemoryType] = None,
         limit: int = 10,
     ) -> list[MemoryEntry]:
-        """Search memories by content (keyword match for now, semantic search later)."""
-        # Escape SQL wildcard characters to prevent unintended pattern matching
-        escaped_query = query.replace("%", "\\%").replace("_", "\\_")
-        search_pattern = f"%{escaped_query}%"
+        """Full-text search over memory content, best matches first.
+
+        Candidates are picked by text relevance from the full-text index
+        (PostgreSQL tsvector, SQLite FTS5), then ordered by a blend of text
+        relevance and ``MemoryEntry.get_relevance_score()``. All query words
+        must match (after stemming).
+
+        Results may be served from the query cache, up to
+        ``settings.memory_query_cache_ttl_seconds`` old.
+        """
+        if limit <= 0:
+            return []
 
-        stmt = select(MemoryEntry).where(
-            MemoryEntry.content.ilike(search_pattern)
+        return await self._cached(
+            "search",
+            agent_id,
+            project_id,
+            {"query": query, "memory_type": memory_type, "limit": limit},
+            lambda: self._search(query, agent_id, project_id, memory_type, limit),
         )
 
-        if agent_id is not None:
-            stmt = stmt.where(MemoryEntry.agent_id == agent_id)
+    async def _search(
+        self,
+        query: str,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        memory_type: Optional[MemoryType],
+        limit: int,
+    ) -> list[MemoryEntry]:
+        match = self._text_match(query, MemoryEntry)
+        if match is None:
+            return []
+        stmt, _ = match
+        stmt = self._filtered(stmt, agent_id, project_id, memory_type).limit(
+            limit * SEARCH_CANDIDATE_FACTOR
+        )
+        result = await self._session.execute(stmt)
+        rows = result.all()
+        self._with_pending_access([memory for memory, _ in rows])
 
-        if project_id is not None:
-            stmt = stmt.where(MemoryEntry.project_id == project_id)
+        scored = []
+        for memory, rank in rows:
+            score = TEXT_RANK_WEIGHT * rank + (1 - TEXT_RANK_WEIGHT) * memory.get_relevance_score()
+            scored.append((score, memory))
 
-        if memory_type is not None:
-            stmt = stmt.where(MemoryEntry.memory_type == memory_type)
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [memory for _, memory in scored[:limit]]
 
-        stmt = stmt.order_by(MemoryEntry.created_at.desc()).limit(limit)
+    async def rebuild_search_index(self) -> bool:
+        """Rebuild the SQLite full-text index from the memoryentry table.
 
-        result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        The index is keyed on memoryentry's implicit rowid, which VACUUM may
+        renumber, so run this after VACUUM. PostgreSQL's generated column
+        needs no rebuild.
 
-    async def get_by_tags(
+        Returns:
+            Whether an index was rebuilt
+        """
+        if self.dialect != "sqlite":
+            return False
+        await self._session.execute(text(SQLITE_FTS_REBUILD))
+        return True
+
+    def _text_match(self, query: str, *columns: Any) -> Optional[tuple[Select, ColumnElement]]:
+        """Select ``columns`` plus a text rank for memories matching a query.
+
+        The rank is in [0, 1), higher is better, and the statement is
+        ordered by it. Returns None if the query has no searchable words.
+        """
+        if self.dialect == "postgresql":
+            tsv = literal_column("memoryentry.content_tsv", TSVECTOR)
+            tsquery = func.websearch_to_tsquery(cast(FTS_CONFIG, REGCONFIG), query)
+            # Normalization 32 scales the rank into [0, 1)
+            text_rank = func.ts_rank_cd(tsv, tsquery, 32)
+            stmt = select(*columns, text_rank.label("text_rank")).where(tsv.op("@@")(tsquery))
+            return stmt.order_by(text_rank.desc()), text_rank
+
+        match = fts_match_query(query)
+        if match is None:
+            return None
+        fts = table("memoryentry_fts", column("rowid"))
+        bm25 = func.bm25(literal_column("memoryentry_fts"))  # Negative, lower is better
+        text_rank = -bm25 / (1 - bm25)
+        stmt = (
+            select(*columns, text_rank.label("text_rank"))
+            .join(fts, fts.c.rowid == literal_column("memoryentry.rowid"))
+            .where(literal_column("memoryentry_fts").op("MATCH")(match))
+        )
+        return stmt.order_by(bm25), text_rank
+
+    async def search_semantic(
         self,
-        tags: list[str],
+        embedding: list[float],
+        k: int = 10,
         agent_id: Optional[UUID] = None,
-        match_all: bool = False,
-        limit: int = 10,
-    ) -> list[MemoryEntry]:
-        """Get memories matching tags."""
-        if not tags:
+        project_id: Optional[UUID] = None,
+        memory_type: Optional[MemoryType] = None,
+    ) -> list[tuple[MemoryEntry, float]]:
+        """Find the memories nearest to an embedding.
+
+        On PostgreSQL this is an HNSW index scan in pgvector. Other
+        databases use the in-process ``VectorIndex``.
+
+        Args:
+            embedding: Query vector
+            k: Number of memories to return
+            agent_id: Only search this agent's memories
+            project_id: Only search this project's memories
+            memory_type: Only search memories of this type
+
+        Returns:
+            (memory, cosine distance) pairs, nearest first. Distance is 0 for
+            the same direction and 2 for the opposite one.
+        """
+        if k <= 0 or embedding is None or len(embedding) == 0:
+            return []
+
+        if self.dialect != "postgresql":
+            return await self._search_semantic_local(
+                embedding, k, agent_id, project_id, memory_type
+            )
+
+        # HNSW returns at most ef_search rows, so widen it for large k
+        ef_search = min(max(k, settings.memory_hnsw_ef_search), MAX_EF_SEARCH)
+        await self._session.execute(
+            select(func.set_config("hnsw.ef_search", str(ef_search), True))
+        )
+
+        distance = MemoryEntry.embedding.cosine_distance(embedding).label("distance")
+        stmt = self._filtered(
+            select(MemoryEntry, distance).where(MemoryEntry.embedding.is_not(None)),
+            agent_id,
+            project_id,
+            memory_type,
+        )
+        result = await self._session.execute(stmt.order_by(distance).limit(k))
+        rows = result.all()
+        self._with_pending_access([memory for memory, _ in rows])
+        return [(memory, float(dist)) for memory, dist in rows]
+
+    async def _search_semantic_local(
+        self,
+        embedding: list[float],
+        k: int,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        memory_type: Optional[MemoryType],
+    ) -> list[tuple[MemoryEntry, float]]:
+        """Nearest neighbours from the local index, checked against the database."""
+        hits = await self._local_vector_hits(embedding, k, agent_id, project_id, memory_type)
+        if not hits:
             return []
 
-        # Normalize tags to lowercase
-        normalized_tags = [tag.lower().strip() for tag in tags]
+        result = await self._session.execute(
+            self._filtered(
+                select(MemoryEntry).where(MemoryEntry.id.in_([memory_id for memory_id, _ in hits])),
+                agent_id,
+                project_id,
+                memory_type,
+            )
+        )
+        memories = {m.id: m for m in self._with_pending_access(list(result.scalars()))}
+        found = [(memories[memory_id], dist) for memory_id, dist in hits if memory_id in memories]
+        return found[:k]
+
+    async def recall(
+        self,
+        query: str = "",
+        embedding: Optional[list[float]] = None,
+        weights: Optional[RecallWeights] = None,
+        k: int = 10,
+        agent_id: Optional[UUID] = None,
+        project_id: Optional[UUID] = None,
+        memory_type: Optional[MemoryType] = None,
+    ) -> list[RecallResult]:
+        """Recall the memories that best match a query, scored in a single SQL statement.
 
-        if match_all:
-            # Need to match all tags - use JSON contains for each tag
-            # SQLite uses json_each, PostgreSQL uses @> or &&
-            # For SQLite compatibility, we fetch and filter in Python
-            stmt = select(MemoryEntry)
+        Candidates are the best text matches, the nearest embeddings and the
+        most recent memories (``k * SEARCH_CANDIDATE_FACTOR`` of each). One
+        statement scores them by a weighted sum of:
 
-            if agent_id is not None:
-                stmt = stmt.where(MemoryEntry.agent_id == agent_id)
+        - text: full-text rank as in ``search``, divided by the best match's
+        - vector: cosine similarity to ``embedding``
+        - recency: halves every ``settings.memory_recall_half_life_days``
+        - importance
+        - access: ``log(1 + access_count) / 10``, as in ``get_relevance_score``
 
-            result = await self._session.execute(stmt)
-            memories = list(result.scalars().all())
+        Signals a memory lacks (no text match, no embedding) count as 0.
+        Without pgvector the nearest embeddings come from the local vector
+        index and are passed into the statement as literal rows.
 
-            # Filter for memories that have ALL tags
-            filtered = []
-            for memory in memories:
-                memory_tags_lower = [t.lower() for t in memory.tags]
-                if all(tag in memory_tags_lower for tag in normalized_tags):
-                    filtered.append(memory)
+        Args:
+            query: Free-text query; empty to skip text matching
+            embedding: Query vector; None to skip vector matching
+            weights: Signal weights; defaults to ``RecallWeights()``
+            k: Number of memories to return
+            agent_id: Only recall this agent's memories
+            project_id: Only recall this project's memories
+            memory_type: Only recall memories of this type
 
-            return filtered[:limit]
+        Returns:
+            Results with the best score first
+        """
+        if k <= 0:
+            return []
+        weights = weights or RecallWeights()
+        candidates = k * SEARCH_CANDIDATE_FACTOR
+        filters = (agent_id, project_id, memory_type)
+        postgres = self.dialect == "postgresql"
+
+        sources = []
+        text_scores = None
+        match = self._text_match(query, MemoryEntry.id) if query.strip() else None
+        if match is not None:
+            stmt, _ = match
+            matches = self._filtered(stmt, *filters).limit(candidates).cte("text_matches")
+            # Relative to the best match: raw ranks shrink towards 0 on small corpora
+            best = func.nullif(func.max(matches.c.text_rank).over(), 0)
+            text_scores = select(matches.c.id, (matches.c.text_rank / best).label("text_rank")).cte(
+                "text_scores"
+            )
+            sources.append(text_scores)
+
+        vector_scores = None
+        if embedding is not None and len(embedding):
+            vector_scores = await self._vector_scores(embedding, candidates, *filters)
+            if vector_scores is not None:
+                sources.append(vector_scores)
+
+        recent = self._filtered(
+            select(MemoryEntry.id).order_by(MemoryEntry.created_at.desc()), *filters
+        ).limit(candidates).cte("recent")
+        sources.append(recent)
+
+        text = (
+            func.coalesce(text_scores.c.text_rank, 0.0)
+            if text_scores is not None
+            else literal(0.0)
+        )
+        vector = (
+            func.coalesce(vector_scores.c.similarity, 0.0)
+            if vector_scores is not None
+            else literal(0.0)
+        )
+        if postgres:
+            age = func.extract("epoch", func.timezone("UTC", func.now()) - MemoryEntry.created_at)
         else:
-            # Match ANY tag - can use JSON overlap in PostgreSQL
-            # For SQLite compatibility, fetch and filter
-            stmt = select(MemoryEntry)
+            age = (func.julianday("now") - func.julianday(MemoryEntry.created_at)) * 86400
+        half_life = settings.memory_recall_half_life_days * 86400
+        recency = func.exp(-age * (math.log(2) / half_life))
+        least = func.least if postgres else func.min
+        access = least(func.ln(1 + MemoryEntry.access_count) / 10, 1.0)
+        score = (
+            weights.text * text
+            + weights.vector * vector
+            + weights.recency * recency
+            + weights.importance * MemoryEntry.importance
+            + weights.access * access
+        )
 
-            if agent_id is not None:
-                stmt = stmt.where(MemoryEntry.agent_id == agent_id)
+        candidate_ids = union(*(select(source.c.id) for source in sources)).subquery("candidates")
+        stmt = select(
+            MemoryEntry,
+            text.label("text"),
+            vector.label("vector"),
+            recency.label("recency"),
+            access.label("access"),
+            score.label("score"),
+        ).join(candidate_ids, candidate_ids.c.id == MemoryEntry.id)
+        if text_scores is not None:
+            stmt = stmt.outerjoin(text_scores, text_scores.c.id == MemoryEntry.id)
+        if vector_scores is not None:
+            stmt = stmt.outerjoin(vector_scores, vector_scores.c.id == MemoryEntry.id)
 
-            result = await self._session.execute(stmt)
-            memories = list(result.scalars().all())
+        result = await self._session.execute(stmt.order_by(score.desc()).limit(k))
+        rows = result.all()
+        self._with_pending_access([row[0] for row in rows])
+        return [
+            RecallResult(
+                memory=memory,
+                score=float(total),
+                scores={
+                    "text": float(text_rank),
+                    "vector": float(similarity),
+                    "recency": float(fresh),
+                    "importance": memory.importance,
+                    "access": float(accessed),
+                },
+            )
+            for memory, text_rank, similarity, fresh, accessed, total in rows
+        ]
 
-            # Filter for memories that have ANY of the tags
-            filtered = []
-            for memory in memories:
-                memory_tags_lower = [t.lower() for t in memory.tags]
-                if any(tag in memory_tags_lower for tag in normalized_tags):
-                    filtered.append(memory)
+    async def _vector_scores(
+        self,
+        embedding: list[float],
+        limit: int,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        memory_type: Optional[MemoryType],
+    ):
+        """CTE of (id, similarity) for the memories nearest to an embedding.
 
-            # Sort by created_at descending
-            filtered.sort(key=lambda m: m.created_at, reverse=True)
-            return filtered[:limit]
+        On PostgreSQL this is an HNSW scan inside the recall statement.
+        Otherwise the hits come from the local index as literal rows; None
+        if there are none.
+        """
+        if self.dialect == "postgresql":
+            if limit > PGVECTOR_DEFAULT_EF_SEARCH:
+                ef_search = min(max(limit, settings.memory_hnsw_ef_search), MAX_EF_SEARCH)
+                await self._session.execute(
+                    select(func.set_config("hnsw.ef_search", str(ef_search), True))
+                )
+            distance = MemoryEntry.embedding.cosine_distance(embedding)
+            stmt = self._filtered(
+                select(MemoryEntry.id, (1 - distance).label("similarity")).where(
+                    MemoryEntry.embedding.is_not(None)
+                ),
+                agent_id,
+                project_id,
+                memory_type,
+            )
+            return stmt.order_by(distance).limit(limit).cte("vector_scores")
+
+        hits = await self._local_vector_hits(embedding, limit, agent_id, project_id, memory_type)
+        if not hits:
+            return None
+        return union_all(
+            *(
+                select(
+                    literal(memory_id, MemoryEntry.id.type).label("id"),
+                    literal(1.0 - distance, Float).label("similarity"),
+                )
+                for memory_id, distance in hits
+            )
+        ).cte("vector_scores")
+
+    async def _local_vector_hits(
+        self,
+        embedding: list[float],
+        k: int,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        memory_type: Optional[MemoryType],
+    ) -> list[tuple[UUID, float]]:
+        """(id, cosine distance) of the nearest memories in the local vector index."""
+        index = self.vector_index
+        await self.sync_vector_index()
+
+        filtered = agent_id is not None or project_id is not None or memory_type is not None
+        candidates = None
+        if filtered:
+            # Filter columns are indexed, so narrow by id first and score only those rows
+            result = await self._session.execute(
+                self._filtered(
+                    select(MemoryEntry.id).where(MemoryEntry.embedding.is_not(None)),
+                    agent_id,
+                    project_id,
+                    memory_type,
+                )
+            )
+            candidates = list(result.scalars())
+
+        # Over-fetch unfiltered searches in case the index holds rows the database dropped
+        return index.search(embedding, k if filtered else k * 2, candidates)
+
+    async def sync_vector_index(self, force: bool = False) -> None:
+        """Bring the local vector index in step with the database.
+
+        Memories changed since the last sync (queued by this process, or
+        listed in the shared change log) are re-read. On the first sync the
+        index is rebuilt unless it already holds as many embeddings as the
+        database; later syncs rebuild it only when the log cannot list the
+        changes. ``force`` always rebuilds.
+        """
+        index = self.vector_index
+        if index is None:
+            return
+
+        log = await vector_index_changes.read(index.log_position)
+        changed = index.take_rechecks()
+        if log is not None and log.ids is not None:
+            changed |= log.ids
+        # Entries were lost since a known position (None: none known yet)
+        behind = log is not None and log.ids is None and index.log_position is not None
+
+        rebuild = force or (index.synced and behind)
+        if not rebuild:
+            await self._reindex_rows(index, changed)
+        if not rebuild and not index.synced:
+            count = await self._session.scalar(
+                select(func.count())
+                .select_from(MemoryEntry)
+                .where(MemoryEntry.embedding.is_not(None))
+            )
+            rebuild = behind or count != len(index)
+        if rebuild:
+            await self._rebuild_vector_index(index)
+        index.mark_synced(log.position if log is not None else None)
+
+    async def _rebuild_vector_index(self, index: VectorIndex) -> None:
+        """Reload every embedding into the local vector index."""
+        index.clear()
+        result = await self._session.stream(
+            select(MemoryEntry.id, MemoryEntry.embedding).where(MemoryEntry.embedding.is_not(None))
+        )
+        async for rows in result.partitions(INDEX_SYNC_BATCH):
+            dimensions = index.dimensions or len(rows[0].embedding)
+            rows = [row for row in rows if len(row.embedding) == dimensions]
+            index.add([row.id for row in rows], [row.embedding for row in rows])
+        logger.info(f"Loaded {len(index)} embeddings into the memory vector index")
+
+    async def _reindex_rows(self, index: VectorIndex, ids: Iterable[UUID]) -> None:
+        """Re-read some memories' embeddings into the local vector index."""
+        ids = list(ids)
+        for start in range(0, len(ids), INDEX_SYNC_BATCH):
+            batch = ids[start : start + INDEX_SYNC_BATCH]
+            result = await self._session.execute(
+                select(MemoryEntry.id, MemoryEntry.embedding).where(
+                    MemoryEntry.id.in_(batch), MemoryEntry.embedding.is_not(None)
+                )
+            )
+            rows = [row for row in result.all() if len(row.embedding)]
+            dimensions = index.dimensions or (len(rows[0].embedding) if rows else 0)
+            rows = [row for row in rows if len(row.embedding) == dimensions]
+            index.remove(set(batch) - {row.id for row in rows})
+            index.add([row.id for row in rows], [row.embedding for row in rows])
+
+    async def get_by_tags(
+        self,
+        tags: list[str],
+        agent_id: Optional[UUID] = None,
+        match_all: bool = False,
+        limit: int = 10,
+    ) -> list[MemoryEntry]:
+        """Get memories matching tags, newest first.
+
+        Matching happens in the database: JSONB ``?|``/``?&`` (served by a
+        GIN index) on PostgreSQL, ``json_each`` elsewhere.
+        """
+        normalized_tags = sorted({tag.lower().strip() for tag in tags} - {""})
+        if not normalized_tags:
+            return []
+
+        stmt = select(MemoryEntry).where(tag_filter(normalized_tags, match_all, self.dialect))
+        if agent_id is not None:
+            stmt = stmt.where(agent_filter(agent_id))
+
+        stmt = stmt.order_by(MemoryEntry.created_at.desc()).limit(limit)
+        result = await self._session.execute(stmt)
+        return self._with_pending_access(list(result.scalars().all()))
 
     async def get_recent(
         self,
@@ -146,11 +980,29 @@ class MemoryService:
         memory_type: Optional[MemoryType] = None,
         limit: int = 10,
     ) -> list[MemoryEntry]:
-        """Get recent memories."""
+        """Get recent memories.
+
+        Results are served from the query cache like ``search``.
+        """
+        return await self._cached(
+            "recent",
+            agent_id,
+            project_id,
+            {"memory_type": memory_type, "limit": limit},
+            lambda: self._get_recent(agent_id, project_id, memory_type, limit),
+        )
+
+    async def _get_recent(
+        self,
+        agent_id: Optional[UUID],
+        project_id: Optional[UUID],
+        memory_type: Optional[MemoryType],
+        limit: int,
+    ) -> list[MemoryEntry]:
         stmt = select(MemoryEntry)
 
         if agent_id is not None:
-            stmt = stmt.where(MemoryEntry.agent_id == agent_id)
+            stmt = stmt.where(agent_filter(agent_id))
 
         if project_id is not None:
             stmt = stmt.where(MemoryEntry.project_id == project_id)
@@ -161,27 +1013,77 @@ class MemoryService:
         stmt = stmt.order_by(MemoryEntry.created_at.desc()).limit(limit)
 
         result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        return self._with_pending_access(list(result.scalars().all()))
 
     async def access(self, memory_id: UUID) -> bool:
-        """Mark a memory as accessed (increments access_count)."""
-        memory = await self.get(memory_id)
+        """Mark a memory as accessed (increments access_count).
+
+        The increment is buffered and written with other accesses in one
+        batched UPDATE; memories loaded through this service include
+        buffered accesses in ``access_count`` and ``last_accessed``
+        meanwhile. The existence check is served from the session when the
+        memory is already loaded.
+        """
+        memory = await self._session.get(MemoryEntry, memory_id)
         if memory is None:
             return False
 
-        memory.access()
-        await self._session.flush()
+        self.access_tracker.record(memory_id)
+        self._with_pending_access([memory])
         return True
 
     async def delete(self, memory_id: UUID) -> bool:
         """Delete a memory."""
         result = await self._session.execute(
-            delete(MemoryEntry).where(MemoryEntry.id == memory_id)
+            delete(MemoryEntry)
+            .where(MemoryEntry.id == memory_id)
+            .returning(MemoryEntry.agent_id, MemoryEntry.project_id)
         )
+        deleted = result.all()
+        shared = await self._session.execute(
+            delete(SharedMemoryAgent)
+            .where(SharedMemoryAgent.memory_id == memory_id)
+            .returning(SharedMemoryAgent.agent_id)
+        )
+        agent_ids = [row.agent_id for row in deleted] + list(shared.scalars())
         await self._session.flush()
-        return result.rowcount > 0
+        if deleted:
+            self.reindex(deleted=[memory_id])
+            await self._changed(agent_ids, [row.project_id for row in deleted])
+        return len(deleted) > 0
+
+    async def delete_project(self, project_id: UUID) -> int:
+        """Delete all of a project's memories, returning how many were deleted.
+
+        When memories are partitioned by project, the project's partition is
+        detached and dropped instead of deleting its rows; that happens
+        immediately, outside the session's transaction, and leaves the
+        project's ``SharedMemoryAgent`` rows, which then match nothing.
+        """
+        deleted = await drop_project_partition(self._session, project_id)
+        partition_dropped = deleted is not None
+        if deleted is None:
+            result = await self._session.execute(
+                delete(MemoryEntry)
+                .where(MemoryEntry.project_id == project_id)
+                .returning(MemoryEntry.id)
+            )
+            ids = list(result.scalars())
+            await self._session.execute(
+                delete(SharedMemoryAgent).where(SharedMemoryAgent.memory_id.in_(ids))
+            )
+            await self._session.flush()
+            self.reindex(deleted=ids)
+            deleted = len(ids)
 
-    async def set_embedding(self, memory_id: UUID, embedding: list[float]) -> bool:
+        # The project's memories also appear in agent-scoped results
+        self._wrote = True
+        if partition_dropped:
+            await self.query_cache.invalidate_all()
+        self.query_cache.invalidate_on_commit(self._session, everything=True)
+        return deleted
+
+    async def set_embedding(self, memory_id: UUID, embedding: Sequence[float]) -> bool:
         """Set the vector embedding for a memory."""
         memory = await self.get(memory_id)
         if memory is None:
@@ -189,19 +1091,21 @@ class MemoryService:
 
         memory.set_embedding(embedding)
         await self._session.flush()
+        await self._changed([memory.agent_id], [memory.project_id])
+        self.reindex(written=[memory_id])
         return True
 
     async def get_by_agent(self, agent_id: UUID, limit: int = 50) -> list[MemoryEntry]:
         """Get all memories for an agent."""
         stmt = (
             select(MemoryEntry)
-            .where(MemoryEntry.agent_id == agent_id)
+            .where(agent_filter(agent_id))
             .order_by(MemoryEntry.created_at.desc())
             .limit(limit)
         )
 
         result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        return self._with_pending_access(list(result.scalars().all()))
 
     async def get_by_project(self, project_id: UUID, limit: int = 50) -> list[MemoryEntry]:
         """Get all memories for a project."""
@@ -213,15 +1117,76 @@ class MemoryService:
         )
 
         result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        return self._with_pending_access(list(result.scalars().all()))
 
-    async def clear_working_memory(self, agent_id: UUID) -> int:
-        """Clear working memory for an agent (delete all WORKING type memories)."""
-        result = await self._session.execute(
-            delete(MemoryEntry).where(
-                MemoryEntry.agent_id == agent_id,
-                MemoryEntry.memory_type == MemoryType.WORKING,
-            )
+    async def _stream(self, stmt: Select, fetch_size: Optional[int]) -> AsyncIterator[MemoryEntry]:
+        """Yield a query's memories through a server-side cursor, a batch at a time."""
+        result = await self._session.stream_scalars(
+            stmt, execution_options={"yield_per": fetch_size or settings.memory_stream_fetch_size}
         )
-        await self._session.flush()
-        return result.rowcount
+        try:
+            async for batch in result.partitions():
+                for memory in self._with_pending_access(batch):
+                    yield memory
+        finally:
+            await result.close()
+
+    def iter_by_agent(
+        self, agent_id: UUID, fetch_size: Optional[int] = None
+    ) -> AsyncIterator[MemoryEntry]:
+        """Iterate over all of an agent's memories, newest first.
+
+        Rows are fetched ``fetch_size`` (default
+        ``settings.memory_stream_fetch_size``) at a time from a server-side
+        cursor, so memory use does not grow with the number of rows. The
+        session's transaction stays open until iteration finishes.
+        """
+        stmt = (
+            select(MemoryEntry)
+            .where(agent_filter(agent_id))
+            .order_by(MemoryEntry.created_at.desc())
+        )
+        return self._stream(stmt, fetch_size)
+
+    def iter_by_project(
+        self, project_id: UUID, fetch_size: Optional[int] = None
+    ) -> AsyncIterator[MemoryEntry]:
+        """Iterate over all of a project's memories, newest first.
+
+        Streamed like ``iter_by_agent``.
+        """
+        stmt = (
+            select(MemoryEntry)
+            .where(MemoryEntry.project_id == project_id)
+            .order_by(MemoryEntry.created_at.desc())
+        )
+        return self._stream(stmt, fetch_size)
+
+    def iter_all(
+        self,
+        memory_type: Optional[MemoryType] = None,
+        fetch_size: Optional[int] = None,
+    ) -> AsyncIterator[MemoryEntry]:
+        """Iterate over every memory, optionally of one type.
+
+        Streamed like ``iter_by_agent``. Memories come in no particular
+        order, so the scan needs no sort.
+        """
+        stmt = self._filtered(select(MemoryEntry), memory_type=memory_type)
+        return self._stream(stmt, fetch_size)
+
+    async def get_working_memory(self, agent_id: UUID) -> list[WorkingMemoryItem]:
+        """Get an agent's working memory, highest-ranked first."""
+        return await self.working.get(agent_id)
+
+    async def clear_working_memory(self, agent_id: UUID, spill: bool = False) -> int:
+        """Clear an agent's working memory.
+
+        Args:
+            agent_id: Owning agent
+            spill: Save the items as episodic memories first
+
+        Returns:
+            Number of items removed
+        """
+        return await self.working.clear(agent_id, spill=spill)
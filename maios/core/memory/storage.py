@@ -0,0 +1,75 @@
+# maios/core/memory/storage.py
+"""Conversion of stored embeddings to the configured storage format.
+
+Without pgvector, embeddings are packed BLOBs whose first byte names their
+format (see ``maios.models.types.pack_embedding``). Rows written before
+packed storage hold JSON text, and rows written under another
+``settings.memory_embedding_storage`` keep their old format. Both stay
+readable, and ``migrate_embeddings`` rewrites them in batches. PostgreSQL
+needs no conversion: pgvector already stores float32 values.
+"""
+
+import logging
+from collections.abc import Callable
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from maios.core.config import settings
+from maios.models.memory import MemoryEntry
+from maios.models.types import EMBEDDING_FORMATS
+
+logger = logging.getLogger(__name__)
+
+# Rows rewritten per transaction
+MIGRATE_BATCH = 1000
+
+
+async def migrate_embeddings(
+    session_factory: Callable[[], AsyncSession],
+    batch_size: int = MIGRATE_BATCH,
+) -> int:
+    """Rewrite embeddings not yet in the configured storage format.
+
+    Converting to a smaller format is lossy; converting back does not
+    restore the dropped precision.
+
+    Returns:
+        Number of rows rewritten
+    """
+    async with session_factory() as session:
+        if session.get_bind().dialect.name == "postgresql":
+            return 0
+
+    code = EMBEDDING_FORMATS[settings.memory_embedding_storage]
+    # First byte of the stored value; JSON text starts with "[" (5B)
+    stale = func.hex(func.substr(MemoryEntry.embedding, 1, 1)) != f"{code:02X}"
+    migrated = 0
+    last_id: Optional[UUID] = None
+
+    while True:
+        stmt = select(MemoryEntry.id, MemoryEntry.embedding).where(
+            MemoryEntry.embedding.is_not(None), stale
+        )
+        if last_id is not None:
+            stmt = stmt.where(MemoryEntry.id > last_id)
+        stmt = stmt.order_by(MemoryEntry.id).limit(batch_size)
+
+        async with session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+            if rows:
+                await session.execute(
+                    update(MemoryEntry).execution_options(synchronize_session=None),
+                    [{"id": row.id, "embedding": row.embedding} for row in rows],
+                )
+                await session.commit()
+        migrated += len(rows)
+
+        if len(rows) < batch_size:
+            break
+        last_id = rows[-1].id
+
+    logger.info(f"Migrated {migrated} embeddings to {settings.memory_embedding_storage} storage")
+    return migrated
@@ -0,0 +1,406 @@
+# maios/core/memory/vector_index.py
+"""In-process vector index for databases without pgvector.
+
+Embeddings are kept L2-normalized in one contiguous float32 matrix, so a
+query is a blocked matrix-vector product followed by an ``argpartition``
+top-k. The search is exact: it replaces a per-row Python loop with
+vectorized scans over the matrix.
+
+With a directory configured the matrix and its id column are memory-mapped
+files (``vectors.f32``, ``ids.bin``) plus a small ``meta.json`` header, so
+the index survives restarts without re-reading every embedding from the
+database. Appends write in place (capacity doubles when full), deletes
+zero the row and leave a hole, and holes are compacted once they make up
+a quarter of the rows. A directory belongs to one process at a time (held
+with a lock file); other processes keep their index in memory.
+
+Each process has its own index. ``maios.core.memory.index_sync`` keeps
+them in step with writes made elsewhere.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import weakref
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+
+from maios.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.bin"
+META_FILE = "meta.json"
+LOCK_FILE = "index.lock"
+
+# Rows per matrix-vector product; bounds the temporary score array
+SEARCH_BLOCK_ROWS = 65536
+
+# Smallest capacity allocated once the first vector arrives
+MIN_CAPACITY = 1024
+
+# Compact when holes from deletes reach this fraction of used rows
+COMPACT_RATIO = 0.25
+
+
+class VectorIndex:
+    """Exact cosine-distance index over float32 unit vectors.
+
+    Thread-safe. Dimensions are fixed by the first vector added (or the
+    ``dimensions`` argument); vectors of another length are rejected.
+    """
+
+    def __init__(self, path: Optional[str] = None, dimensions: Optional[int] = None):
+        """Open or create an index.
+
+        Args:
+            path: Directory for the memory-mapped files; None keeps the index in memory
+            dimensions: Vector length, if known up front
+        """
+        self.path = Path(path) if path else None
+        self.dimensions = dimensions
+        # Set once the index has been checked against the database
+        self.synced = False
+        # Position in the shared change log the contents reflect
+        self.log_position: Optional[str] = None
+        self._rechecks: set[UUID] = set()
+        self._lock_file = None
+
+        self._lock = threading.RLock()
+        self._count = 0  # Rows used, including holes
+        self._capacity = 0
+        self._vectors: Optional[np.ndarray] = None  # (capacity, dimensions) float32
+        self._ids: Optional[np.ndarray] = None  # (capacity, 16) uint8; zero for holes
+        self._live = np.zeros(0, dtype=bool)
+        self._rows: dict[bytes, int] = {}  # UUID bytes -> row
+
+        if self.path is not None and not self._acquire_directory():
+            logger.warning(
+                f"Vector index directory {self.path} is in use by another process; "
+                "keeping this process's index in memory"
+            )
+            self.path = None
+        if self.path is not None and (self.path / META_FILE).exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, memory_id: object) -> bool:
+        return isinstance(memory_id, UUID) and memory_id.bytes in self._rows
+
+    @property
+    def holes(self) -> int:
+        """Rows freed by deletes and not yet compacted."""
+        return self._count - len(self._rows)
+
+    # Storage
+
+    def _acquire_directory(self) -> bool:
+        """Lock the index directory for this process; False if another holds it."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Kept open for the index's lifetime: closing it releases the lock
+        lock_file = open(self.path / LOCK_FILE, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def close(self) -> None:
+        """Flush a persisted index and release its directory."""
+        self.flush()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _load(self) -> None:
+        meta = json.loads((self.path / META_FILE).read_text())
+        self.dimensions = meta["dimensions"]
+        self._open(meta["capacity"])
+        self._count = meta["count"]
+        self.log_position = meta.get("log_position")
+
+        self._live[: self._count] = self._ids[: self._count].any(axis=1)
+        self._rows = self._row_map(np.flatnonzero(self._live[: self._count]))
+
+    def _row_map(self, rows: np.ndarray) -> dict[bytes, int]:
+        """Map the ids stored at ``rows`` to their row numbers."""
+        raw = self._ids[rows].tobytes()
+        return {raw[i * 16 : i * 16 + 16]: int(row) for i, row in enumerate(rows)}
+
+    def _open(self, capacity: int) -> None:
+        """Map (or allocate) storage for ``capacity`` rows, keeping existing rows."""
+        if self.path is None:
+            vectors = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            ids = np.zeros((capacity, 16), dtype=np.uint8)
+            if self._vectors is not None:
+                vectors[: self._count] = self._vectors[: self._count]
+                ids[: self._count] = self._ids[: self._count]
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if self._vectors is not None:
+                self._vectors.flush()
+                self._ids.flush()
+            self._vectors = self._ids = None  # Drop old maps before resizing the files
+            vectors = self._map(VECTORS_FILE, (capacity, self.dimensions), np.float32)
+            ids = self._map(IDS_FILE, (capacity, 16), np.uint8)
+
+        live = np.zeros(capacity, dtype=bool)
+        live[: self._count] = self._live[: self._count]
+        self._vectors, self._ids, self._live = vectors, ids, live
+        self._capacity = capacity
+
+    def _map(self, name: str, shape: tuple[int, int], dtype) -> np.memmap:
+        file = self.path / name
+        size = shape[0] * shape[1] * np.dtype(dtype).itemsize
+        with open(file, "a+b") as f:
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)  # Sparse extension; new rows read as zeros
+        return np.memmap(file, dtype=dtype, mode="r+", shape=shape)
+
+    def _reserve(self, rows: int) -> None:
+        needed = self._count + rows
+        if needed > self._capacity:
+            self._open(max(needed, self._capacity * 2, MIN_CAPACITY))
+
+    def _write_meta(self) -> None:
+        """Record the header; row writes already sit in the shared mapping."""
+        if self.path is None or self._vectors is None:
+            return
+        meta = {
+            "dimensions": self.dimensions,
+            "count": self._count,
+            "capacity": self._capacity,
+            "log_position": self.log_position,
+        }
+        tmp = self.path / f"{META_FILE}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.path / META_FILE)
+
+    def flush(self) -> None:
+        """Sync mapped rows and the header to disk (no-op in memory)."""
+        if self.path is None or self._vectors is None:
+            return
+        with self._lock:
+            self._vectors.flush()
+            self._ids.flush()
+            self._write_meta()
+
+    # Sync state
+
+    def mark_synced(self, log_position: Optional[str]) -> None:
+        """Record that the index matches the database as of a change log position."""
+        with self._lock:
+            self.synced = True
+            if log_position is not None:
+                self.log_position = log_position
+            self._write_meta()
+
+    def recheck(self, ids: Iterable[UUID]) -> None:
+        """Queue memories to be re-read from the database at the next sync."""
+        with self._lock:
+            self._rechecks.update(ids)
+
+    def take_rechecks(self) -> set[UUID]:
+        """Memories queued by ``recheck``, clearing the queue."""
+        with self._lock:
+            ids, self._rechecks = self._rechecks, set()
+            return ids
+
+    # Mutation
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add(self, ids: list[UUID], vectors: Iterable[Iterable[float]]) -> None:
+        """Insert or replace vectors by memory id.
+
+        Raises:
+            ValueError: If a vector's length does not match the index
+        """
+        matrix = np.asarray(list(vectors), dtype=np.float32)
+        if not ids:
+            return
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError("Expected one vector per id")
+
+        with self._lock:
+            if self.dimensions is None:
+                self.dimensions = matrix.shape[1]
+            if matrix.shape[1] != self.dimensions:
+                raise ValueError(
+                    f"Vector has {matrix.shape[1]} dimensions, index has {self.dimensions}"
+                )
+            if self._vectors is None:
+                self._open(MIN_CAPACITY)
+
+            matrix = self._normalize(matrix)
+            self._reserve(len(ids))
+            rows = []
+            for memory_id in ids:
+                row = self._rows.get(memory_id.bytes)
+                if row is None:
+                    row = self._rows[memory_id.bytes] = self._count
+                    self._count += 1
+                rows.append(row)
+
+            rows = np.asarray(rows, dtype=np.int64)
+            self._vectors[rows] = matrix
+            raw_ids = b"".join(i.bytes for i in ids)
+            self._ids[rows] = np.frombuffer(raw_ids, dtype=np.uint8).reshape(-1, 16)
+            self._live[rows] = True
+            self._write_meta()
+
+    def remove(self, ids: Iterable[UUID]) -> int:
+        """Delete vectors by memory id; unknown ids are ignored.
+
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        with self._lock:
+            for memory_id in ids:
+                row = self._rows.pop(memory_id.bytes, None)
+                if row is None:
+                    continue
+                self._vectors[row] = 0.0
+                self._ids[row] = 0
+                self._live[row] = False
+                removed += 1
+
+            if removed:
+                if self.holes >= MIN_CAPACITY and self.holes >= self._count * COMPACT_RATIO:
+                    self.compact()
+                else:
+                    self._write_meta()
+        return removed
+
+    def compact(self) -> None:
+        """Close holes left by deletes, keeping row order."""
+        with self._lock:
+            if self._vectors is None or not self.holes:
+                return
+            keep = np.flatnonzero(self._live[: self._count])
+            size = len(keep)
+            self._vectors[:size] = self._vectors[keep]
+            self._ids[:size] = self._ids[keep]
+            self._vectors[size : self._count] = 0.0
+            self._ids[size : self._count] = 0
+            self._live[:size] = True
+            self._live[size : self._count] = False
+            self._count = size
+            self._rows = self._row_map(np.arange(size))
+            self._write_meta()
+
+    def clear(self) -> None:
+        """Remove every vector (dimensions are kept)."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors[: self._count] = 0.0
+                self._ids[: self._count] = 0
+                self._live[:] = False
+            self._count = 0
+            self._rows.clear()
+            self._write_meta()
+
+    # Search
+
+    def search(
+        self,
+        query: Iterable[float],
+        k: int,
+        candidates: Optional[Iterable[UUID]] = None,
+    ) -> list[tuple[UUID, float]]:
+        """Find the k nearest vectors by cosine distance.
+
+        Args:
+            query: Query vector
+            k: Number of results
+            candidates: Restrict the search to these ids (e.g. pre-filtered rows)
+
+        Returns:
+            (memory id, cosine distance) pairs, nearest first. Empty if the
+            query's length does not match the index.
+        """
+        q = np.asarray(list(query), dtype=np.float32)
+        if k <= 0 or q.ndim != 1 or q.shape[0] != self.dimensions:
+            return []
+        norm = np.linalg.norm(q)
+        if norm == 0:
+            return []
+        q /= norm
+
+        with self._lock:
+            if not self._rows:
+                return []
+
+            if candidates is not None:
+                rows = np.fromiter(
+                    (self._rows[c.bytes] for c in candidates if c.bytes in self._rows),
+                    dtype=np.int64,
+                )
+                scores = self._vectors[rows] @ q if len(rows) else np.zeros(0, dtype=np.float32)
+                best_rows, best_scores = self._top_k(rows, scores, k)
+            else:
+                best_rows, best_scores = self._scan(q, k)
+
+            return [
+                (UUID(bytes=self._ids[row].tobytes()), float(1.0 - score))
+                for row, score in zip(best_rows, best_scores)
+            ]
+
+    def _scan(self, q: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k over all live rows, one block of rows at a time."""
+        kept_rows, kept_scores = [], []
+        for start in range(0, self._count, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, self._count)
+            scores = self._vectors[start:end] @ q
+            scores[~self._live[start:end]] = -np.inf
+            rows, scores = self._top_k(np.arange(start, end), scores, k)
+            kept_rows.append(rows)
+            kept_scores.append(scores)
+
+        rows, scores = np.concatenate(kept_rows), np.concatenate(kept_scores)
+        rows, scores = self._top_k(rows, scores, k)
+        finite = np.isfinite(scores)
+        return rows[finite], scores[finite]
+
+    @staticmethod
+    def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """The k highest-scoring rows, best first."""
+        if len(scores) > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[part], scores[part]
+        order = np.argsort(-scores, kind="stable")
+        return rows[order], scores[order]
+
+
+# One index per engine, so separate databases (and test engines) never share one
+_indexes: "weakref.WeakKeyDictionary[object, VectorIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(engine: object) -> VectorIndex:
+    """Get the vector index for a database engine, creating it if necessary.
+
+    The index is persisted under ``settings.memory_index_dir`` when set;
+    otherwise it lives in memory and is rebuilt from the database on first use.
+    """
+    with _indexes_lock:
+        index = _indexes.get(engine)
+        if index is None:
+            index = VectorIndex(settings.memory_index_dir or None)
+            _indexes[engine] = index
+        return index
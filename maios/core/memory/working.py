@@ -0,0 +1,284 @@
+# maios/core/memory/working.py
+"""Redis-resident working memory, bounded per agent.
+
+Each agent's scratchpad is a hash of items (``{prefix}:{agent_id}``) plus
+a sorted set ranking them (``{prefix}:{agent_id}:rank``). Adding an item
+and trimming the set to the agent's ``working_memory_limit`` happen in one
+MULTI/EXEC, so concurrent writers never leave more than ``limit`` items.
+
+Items are ranked by importance decayed by age, ``importance * 2 **
+(-age / half_life)``. The rank is stored as ``log2(importance) +
+last_used / half_life``: that orders items the same way at any moment, so
+it never needs recomputing. An item half as important as another
+survives as long as one ``half_life`` fresher, and ``touch`` renews an
+item's recency. The lowest-ranked items are evicted first. When spilling
+is enabled they are saved as episodic memories.
+
+``MemoryService`` routes ``MemoryType.WORKING`` memories here; they are
+never written to the database.
+"""
+
+import logging
+import math
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from maios.core.config import settings
+from maios.core.redis import get_redis_client
+from maios.models.agent import Agent
+from maios.models.memory import MemoryType
+
+logger = logging.getLogger(__name__)
+
+# Limit for agents without a row (matches the Agent.working_memory_limit default)
+DEFAULT_LIMIT = 10
+
+# Importance floor for ranking (log2 of zero is undefined)
+MIN_IMPORTANCE = 1e-6
+
+
+class WorkingMemoryItem(BaseModel):
+    """One entry in an agent's working memory."""
+
+    id: UUID = Field(default_factory=uuid4)
+    content: str
+    importance: float = Field(default=0.5, ge=0.0, le=1.0)
+    project_id: Optional[UUID] = None
+    task_id: Optional[UUID] = None
+    tags: list[str] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class WorkingMemory:
+    """Per-agent working memory in Redis, capped and evicted by rank."""
+
+    def __init__(
+        self,
+        prefix: str = "maios:working",
+        spill: Optional[bool] = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ):
+        """Create a working memory store.
+
+        Args:
+            prefix: Redis key prefix
+            spill: Save evicted items as episodic memories; defaults to
+                ``settings.working_memory_spill``
+            session_factory: Opens the session spilled items are stored with;
+                defaults to the global one
+        """
+        self.prefix = prefix
+        self._spill = spill
+        self._session_factory = session_factory
+
+    @property
+    def spill(self) -> bool:
+        """Whether evicted items are saved as episodic memories."""
+        return self._spill if self._spill is not None else settings.working_memory_spill
+
+    def key(self, agent_id: UUID) -> str:
+        """Hash holding an agent's items by id."""
+        return f"{self.prefix}:{agent_id}"
+
+    def rank_key(self, agent_id: UUID) -> str:
+        """Sorted set ranking an agent's items for eviction."""
+        return f"{self.prefix}:{agent_id}:rank"
+
+    @staticmethod
+    def rank(importance: float, at: Optional[datetime] = None) -> float:
+        """Eviction rank of an item used at ``at``; higher is kept longer."""
+        at = at or datetime.now(timezone.utc)
+        half_life = settings.working_memory_half_life_seconds
+        return math.log2(max(importance, MIN_IMPORTANCE)) + at.timestamp() / half_life
+
+    def _sessions(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is not None:
+            return self._session_factory
+        from maios.core.database import async_session
+
+        return async_session
+
+    async def limit(self, agent_id: UUID, session: Optional[AsyncSession] = None) -> int:
+        """An agent's ``working_memory_limit``; ``DEFAULT_LIMIT`` if it has no row.
+
+        Args:
+            agent_id: Agent to look up
+            session: Session to read with; defaults to a new one
+        """
+        query = select(Agent.working_memory_limit).where(Agent.id == agent_id)
+        if session is not None:
+            limit = await session.scalar(query)
+        else:
+            async with self._sessions()() as own_session:
+                limit = await own_session.scalar(query)
+        return limit if limit is not None else DEFAULT_LIMIT
+
+    async def put(
+        self,
+        agent: Agent | UUID,
+        content: str,
+        importance: float = 0.5,
+        project_id: Optional[UUID] = None,
+        task_id: Optional[UUID] = None,
+        tags: list[str] | None = None,
+        session: Optional[AsyncSession] = None,
+    ) -> WorkingMemoryItem:
+        """Add an item, evicting the lowest-ranked ones beyond the agent's limit.
+
+        Args:
+            agent: Owning agent, or its id (its limit is then loaded)
+            content: Item text
+            importance: Importance from 0 to 1
+            project_id: Project the item belongs to (kept when spilled)
+            task_id: Task the item belongs to (kept when spilled)
+            tags: Tags (kept when spilled)
+            session: Session to load the agent's limit with
+
+        Returns:
+            The stored item
+        """
+        item = WorkingMemoryItem(
+            content=content,
+            importance=importance,
+            project_id=project_id,
+            task_id=task_id,
+            tags=tags or [],
+        )
+        return await self.put_item(agent, item, session)
+
+    async def put_item(
+        self,
+        agent: Agent | UUID,
+        item: WorkingMemoryItem,
+        session: Optional[AsyncSession] = None,
+    ) -> WorkingMemoryItem:
+        """Add a built item (see ``put``)."""
+        if isinstance(agent, Agent):
+            agent_id, limit = agent.id, agent.working_memory_limit
+        else:
+            agent_id, limit = agent, await self.limit(agent, session)
+
+        key, rank_key = self.key(agent_id), self.rank_key(agent_id)
+        member = str(item.id)
+        ttl = settings.working_memory_ttl_seconds
+
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.hset(key, member, item.model_dump_json())
+            pipe.zadd(rank_key, {member: self.rank(item.importance, item.created_at)})
+            # Both run inside the transaction, so the range is exactly what gets removed
+            pipe.zrange(rank_key, 0, -(limit + 1))
+            pipe.zremrangebyrank(rank_key, 0, -(limit + 1))
+            pipe.expire(key, ttl)
+            pipe.expire(rank_key, ttl)
+            evicted_ids = (await pipe.execute())[2]
+
+        if evicted_ids:
+            await self._evict(agent_id, evicted_ids)
+        return item
+
+    async def _evict(self, agent_id: UUID, members: list[str]) -> None:
+        """Drop evicted items' payloads, spilling them first if enabled."""
+        redis = get_redis_client()
+        key = self.key(agent_id)
+        items = []
+        if self.spill:
+            payloads = await redis.hmget(key, members)
+            items = [WorkingMemoryItem.model_validate_json(p) for p in payloads if p is not None]
+        await redis.hdel(key, *members)
+        logger.debug(f"Evicted {len(members)} working memory items for agent {agent_id}")
+
+        if items:
+            await self._spill_items(agent_id, items)
+
+    async def _spill_items(self, agent_id: UUID, items: list[WorkingMemoryItem]) -> None:
+        """Store items as episodic memories."""
+        from maios.core.memory.service import MemoryService
+
+        entries = [
+            {
+                "content": item.content,
+                "memory_type": MemoryType.EPISODIC,
+                "agent_id": agent_id,
+                "project_id": item.project_id,
+                "task_id": item.task_id,
+                "importance": item.importance,
+                "tags": item.tags,
+            }
+            for item in items
+        ]
+        try:
+            async with self._sessions()() as session:
+                await MemoryService(session).store_many(entries)
+                await session.commit()
+        except Exception as e:
+            logger.error(
+                f"Failed to spill {len(items)} working memory items for agent {agent_id}: {e}"
+            )
+
+    async def get(self, agent_id: UUID) -> list[WorkingMemoryItem]:
+        """Get an agent's items, highest-ranked first."""
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.zrange(self.rank_key(agent_id), 0, -1, desc=True)
+            pipe.hgetall(self.key(agent_id))
+            members, payloads = await pipe.execute()
+
+        return [
+            WorkingMemoryItem.model_validate_json(payloads[member])
+            for member in members
+            if member in payloads
+        ]
+
+    async def count(self, agent_id: UUID) -> int:
+        """Number of items an agent holds."""
+        return await get_redis_client().zcard(self.rank_key(agent_id))
+
+    async def touch(self, agent_id: UUID, item_id: UUID) -> bool:
+        """Mark an item as just used, renewing its recency."""
+        redis = get_redis_client()
+        payload = await redis.hget(self.key(agent_id), str(item_id))
+        if payload is None:
+            return False
+        item = WorkingMemoryItem.model_validate_json(payload)
+        # XX: never re-add an item evicted in the meantime
+        await redis.zadd(
+            self.rank_key(agent_id), {str(item_id): self.rank(item.importance)}, xx=True
+        )
+        return True
+
+    async def remove(self, agent_id: UUID, item_id: UUID) -> bool:
+        """Remove one item."""
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.zrem(self.rank_key(agent_id), str(item_id))
+            pipe.hdel(self.key(agent_id), str(item_id))
+            removed, _ = await pipe.execute()
+        return removed > 0
+
+    async def clear(self, agent_id: UUID, spill: bool = False) -> int:
+        """Remove all of an agent's items.
+
+        Args:
+            agent_id: Owning agent
+            spill: Save the items as episodic memories first (e.g. at the end of a task)
+
+        Returns:
+            Number of items removed
+        """
+        items = await self.get(agent_id) if spill else []
+        async with get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.zcard(self.rank_key(agent_id))
+            pipe.delete(self.key(agent_id), self.rank_key(agent_id))
+            count, _ = await pipe.execute()
+
+        if items:
+            await self._spill_items(agent_id, items)
+        return count
+
+
+# Global working memory instance
+working_memory = WorkingMemory()
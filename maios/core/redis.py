@@ -1,15 +1,22 @@
 # maios/core/redis.py
-from redis.asyncio import ConnectionPool, Redis
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 
 from maios.core.config import settings
 
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool, Redis
+
 
-# Create connection pool
+# Connection pool (created on first use)
 _pool: ConnectionPool | None = None
 
 
 def get_redis_client() -> Redis:
     """Get Redis client instance."""
+    from redis.asyncio import ConnectionPool, Redis
+
     global _pool
     if _pool is None:
         _pool = ConnectionPool.from_url(
@@ -4,7 +4,7 @@ This module contains all the core data models for the MAIOS system.
 """
 
 from maios.models.agent import Agent, AgentStatus
-from maios.models.memory import MemoryEntry, MemoryType
+from maios.models.memory import MemoryEntry, MemoryType, SharedMemoryAgent
 from maios.models.project import Project, ProjectStatus
 from maios.models.task import Task, TaskPriority, TaskStatus
 
@@ -22,4 +22,5 @@ __all__ = [
     # Memory models
     "MemoryEntry",
     "MemoryType",
+    "SharedMemoryAgent",
 ]
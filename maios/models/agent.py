@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.types import JSON
 from sqlmodel import Field, SQLModel
 
@@ -22,6 +22,11 @@ class AgentStatus(str, enum.Enum):
 class Agent(SQLModel, table=True):
     """Agent model representing an AI agent in the system."""
 
+    __table_args__ = (
+        # Keyset pagination order for list endpoints
+        Index("ix_agent_created_at_id", "created_at", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,15 +1,117 @@
 """Memory model for MAIOS."""
 
 import enum
+import hashlib
 import math
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from collections.abc import Sequence
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column
+from sqlalchemy import DDL, Column, Index, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.types import JSON
 from sqlmodel import Field, SQLModel
 
+from maios.models.types import Embedding, Vector
+
+# Width of the pgvector embedding column; embedders must produce this many floats
+EMBEDDING_DIMENSIONS = 1536
+
+# Text search configuration for the PostgreSQL content tsvector
+FTS_CONFIG = "english"
+
+# Full-text search over content, created alongside the memoryentry table.
+# PostgreSQL: a generated tsvector column (not mapped on the model) with a GIN index.
+POSTGRES_FTS_DDL = (
+    "ALTER TABLE memoryentry ADD COLUMN IF NOT EXISTS content_tsv tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{FTS_CONFIG}', content)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_memoryentry_content_tsv ON memoryentry USING gin (content_tsv)",
+)
+
+# SQLite: an external-content FTS5 table over memoryentry.rowid, kept in step by
+# triggers. memoryentry's key is a UUID, so its rowid is implicit and VACUUM may
+# renumber it; run SQLITE_FTS_REBUILD (MemoryService.rebuild_search_index, or
+# ``maios rebuild-search-index``) after VACUUM or anything else that rewrites the table.
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memoryentry_fts USING fts5("
+    "content, content='memoryentry', content_rowid='rowid', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS memoryentry_fts_ai AFTER INSERT ON memoryentry BEGIN "
+    "INSERT INTO memoryentry_fts(rowid, content) VALUES (new.rowid, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS memoryentry_fts_ad AFTER DELETE ON memoryentry BEGIN "
+    "INSERT INTO memoryentry_fts(memoryentry_fts, rowid, content) "
+    "VALUES ('delete', old.rowid, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS memoryentry_fts_au AFTER UPDATE OF content ON memoryentry BEGIN "
+    "INSERT INTO memoryentry_fts(memoryentry_fts, rowid, content) "
+    "VALUES ('delete', old.rowid, old.content); "
+    "INSERT INTO memoryentry_fts(rowid, content) VALUES (new.rowid, new.content); END",
+)
+SQLITE_FTS_REBUILD = "INSERT INTO memoryentry_fts(memoryentry_fts) VALUES ('rebuild')"
+
+# Optional PostgreSQL declarative partitioning (settings.memory_partitioning):
+# scheme -> (partition key, unique key). Unique keys of a partitioned table must
+# include the partition key; project_id is nullable, so it can't join the primary
+# key, and NULLS NOT DISTINCT (PostgreSQL 15+) keeps ids of project-less rows unique.
+PARTITION_SCHEMES = {
+    "project": ("LIST (project_id)", "UNIQUE NULLS NOT DISTINCT (id, project_id)"),
+    "time": ("RANGE (created_at)", "PRIMARY KEY (id, created_at)"),
+}
+
+# Project partitioning: memories without a project
+SHARED_PARTITION = "memoryentry_shared"
+
+
+def partition_scheme() -> Optional[str]:
+    """Get the configured partitioning scheme, or None when unpartitioned.
+
+    Raises:
+        ValueError: If the setting names an unknown scheme
+    """
+    from maios.core.config import settings
+
+    scheme = settings.memory_partitioning
+    if not scheme:
+        return None
+    if scheme not in PARTITION_SCHEMES:
+        raise ValueError(
+            f"Unknown memory partitioning {scheme!r}; "
+            f"expected one of {', '.join(PARTITION_SCHEMES)}"
+        )
+    return scheme
+
+
+def partition_for(
+    scheme: str, project_id: Optional[UUID], created_at: datetime
+) -> tuple[str, str]:
+    """Name and CREATE statement of the partition a memory belongs in.
+
+    Project partitions hold one project each; time partitions hold one
+    calendar month (UTC).
+    """
+    if scheme == "project":
+        if project_id is None:
+            return SHARED_PARTITION, (
+                f"CREATE TABLE IF NOT EXISTS {SHARED_PARTITION} "
+                "PARTITION OF memoryentry FOR VALUES IN (NULL)"
+            )
+        name = f"memoryentry_p_{project_id.hex}"
+        return name, (
+            f"CREATE TABLE IF NOT EXISTS {name} "
+            f"PARTITION OF memoryentry FOR VALUES IN ('{project_id}')"
+        )
+
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    start = datetime(created_at.year, created_at.month, 1)
+    end = datetime(created_at.year + created_at.month // 12, created_at.month % 12 + 1, 1)
+    name = f"memoryentry_y{start:%Y}m{start:%m}"
+    return name, (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF memoryentry "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
 
 class MemoryType(str, enum.Enum):
     """Type of memory entry."""
@@ -20,9 +122,73 @@ class MemoryType(str, enum.Enum):
     WORKING = "working"  # Short-term working memory
 
 
+# Types shared by everyone in a scope: identical content is stored once per
+# project and type, or per agent and type outside projects (see content_hash).
+# Agents whose copy was folded into another agent's entry are recorded in
+# SharedMemoryAgent. Episodic and working memories stay per agent.
+SHARED_MEMORY_TYPES = frozenset({MemoryType.SEMANTIC, MemoryType.PROCEDURAL})
+
+
+def content_hash(
+    content: str,
+    memory_type: MemoryType,
+    project_id: Optional[UUID] = None,
+    agent_id: Optional[UUID] = None,
+) -> Optional[str]:
+    """Hash identifying a shared memory's content within its scope.
+
+    The scope (project and type; agent and type for memories outside any
+    project) is part of the hash, so one unique index on the hash enforces
+    one row per content per scope. Returns None for per-agent memory
+    types, which are never deduplicated.
+    """
+    if memory_type not in SHARED_MEMORY_TYPES:
+        return None
+    owner = project_id if project_id is not None else f"agent:{agent_id or ''}"
+    scope = f"{owner}\x1f{memory_type.value}\x1f"
+    return hashlib.sha256((scope + content).encode()).hexdigest()
+
+
+def _content_hash_index(project_key: bool):
+    """ddl_if condition for the content-hash unique index variants.
+
+    A unique index on a partitioned table must include the partition key:
+    partitioned by project it also covers project_id; partitioned by time
+    there is none, and deduplication relies on the lookup in store_many.
+    """
+
+    def condition(ddl, target, bind, **kw) -> bool:
+        scheme = partition_scheme() if kw["dialect"].name == "postgresql" else None
+        return scheme == "project" if project_key else scheme is None
+
+    return condition
+
+
 class MemoryEntry(SQLModel, table=True):
     """Memory entry model for storing agent memories."""
 
+    __table_args__ = (
+        # Approximate nearest-neighbour index for cosine distance (pgvector only)
+        Index(
+            "ix_memoryentry_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Tag membership (?| and ?&) for get_by_tags
+        Index("ix_memoryentry_tags_gin", "tags", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        # One row per shared content per scope; NULL (per-agent types) never conflicts
+        Index("ix_memoryentry_content_hash", "content_hash", unique=True).ddl_if(
+            callable_=_content_hash_index(project_key=False)
+        ),
+        Index(
+            "ix_memoryentry_project_content_hash", "project_id", "content_hash", unique=True
+        ).ddl_if(callable_=_content_hash_index(project_key=True)),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     content: str = Field(..., min_length=1, max_length=50000)
@@ -33,12 +199,19 @@ class MemoryEntry(SQLModel, table=True):
     project_id: Optional[UUID] = Field(default=None, index=True)
     task_id: Optional[UUID] = Field(default=None, index=True)
     team_id: Optional[UUID] = Field(default=None, index=True)
-    embedding: Optional[list[float]] = Field(default=None, sa_column=Column(JSON))
+    # Any float sequence when set, a float32 array when validated or loaded
+    embedding: Optional[Embedding] = Field(
+        default=None, sa_column=Column(Vector(EMBEDDING_DIMENSIONS))
+    )
     importance: float = Field(default=0.5, ge=0.0, le=1.0)
     access_count: int = Field(default=0, ge=0)
     last_accessed: Optional[datetime] = Field(default=None)
     keywords: list[str] = Field(default_factory=list, sa_column=Column(JSON))
-    tags: list[str] = Field(default_factory=list, sa_column=Column(JSON))
+    tags: list[str] = Field(
+        default_factory=list, sa_column=Column(JSON().with_variant(JSONB(), "postgresql"))
+    )
+    # Set by MemoryService for shared memory types (see content_hash)
+    content_hash: Optional[str] = Field(default=None, max_length=64)
 
     def access(self) -> None:
         """Record an access to this memory."""
@@ -81,7 +254,7 @@ class MemoryEntry(SQLModel, table=True):
         """Check if this memory has a specific tag."""
         return tag.lower().strip() in self.tags
 
-    def set_embedding(self, embedding: list[float]) -> None:
+    def set_embedding(self, embedding: Sequence[float]) -> None:
         """Set the vector embedding for this memory."""
         self.embedding = embedding
 
@@ -132,3 +305,57 @@ class MemoryEntry(SQLModel, table=True):
         if team_id and self.team_id == team_id:
             return True
         return False
+
+
+class SharedMemoryAgent(SQLModel, table=True):
+    """An agent that stored a shared memory held by another agent's entry.
+
+    Keeps deduplicated memories visible to every agent that stored them
+    (see ``MemoryService.store_many``).
+    """
+
+    # Agent first, so the key serves "memories shared with this agent"
+    agent_id: UUID = Field(primary_key=True)
+    memory_id: UUID = Field(primary_key=True, index=True)
+
+
+# The vector type and its index need the pgvector extension
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS vector").execute_if(dialect="postgresql"),
+)
+
+for _statement in POSTGRES_FTS_DDL:
+    event.listen(
+        MemoryEntry.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+for _statement in SQLITE_FTS_DDL:
+    event.listen(
+        MemoryEntry.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+
+
+@compiles(CreateTable, "postgresql")
+def _create_table(element, compiler, **kw):
+    """Create memoryentry as a partitioned table when partitioning is configured."""
+    ddl = compiler.visit_create_table(element, **kw)
+    scheme = partition_scheme() if element.element is MemoryEntry.__table__ else None
+    if scheme is None:
+        return ddl
+
+    partition_key, unique_key = PARTITION_SCHEMES[scheme]
+    table = ddl.rstrip().replace("PRIMARY KEY (id)", unique_key)
+    return f"{table} PARTITION BY {partition_key}\n\n"
+
+
+@event.listens_for(MemoryEntry.__table__, "after_create")
+def _create_initial_partitions(target, connection, **kw):
+    # Partitions for project-less memories, or for this month and the next
+    if connection.dialect.name != "postgresql" or (scheme := partition_scheme()) is None:
+        return
+
+    now = datetime.now(timezone.utc)
+    moments = [now, now.replace(day=1) + timedelta(days=31)] if scheme == "time" else [now]
+    for created_at in moments:
+        connection.exec_driver_sql(partition_for(scheme, None, created_at)[1])
@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy.types import JSON
 from sqlmodel import Field, SQLModel
 
@@ -23,6 +23,11 @@ class ProjectStatus(str, enum.Enum):
 class Project(SQLModel, table=True):
     """Project model representing a development project in the system."""
 
+    __table_args__ = (
+        # Keyset pagination order for list endpoints
+        Index("ix_project_created_at_id", "created_at", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
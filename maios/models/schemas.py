@@ -2,13 +2,17 @@
 """Pydantic schemas for the MAIOS API."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Generic, Optional, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
 from maios.models.agent import AgentStatus
+from maios.models.memory import MemoryType
 from maios.models.project import ProjectStatus
+from maios.models.task import TaskPriority, TaskStatus
+
+ReadT = TypeVar("ReadT", bound=BaseModel)
 
 
 class AgentCreate(BaseModel):
@@ -83,3 +87,111 @@ class ProjectUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     status: Optional[ProjectStatus] = None
+
+
+class TaskCreate(BaseModel):
+    """Schema for creating a new task."""
+
+    title: str
+    project_id: UUID
+    description: Optional[str] = None
+    parent_task_id: Optional[UUID] = None
+    dependencies: list[UUID] = []
+    assigned_agent_id: Optional[UUID] = None
+    priority: TaskPriority = TaskPriority.MEDIUM
+    timeout_minutes: int = 30
+    max_retries: int = 3
+    skill_requirements: list[str] = []
+    complexity: str = "medium"
+
+
+class TaskRead(BaseModel):
+    """Schema for reading a task."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    title: str
+    description: Optional[str]
+    project_id: UUID
+    parent_task_id: Optional[UUID]
+    assigned_agent_id: Optional[UUID]
+    status: TaskStatus
+    priority: TaskPriority
+    progress_percent: int
+
+
+class TaskUpdate(BaseModel):
+    """Schema for updating a task."""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assigned_agent_id: Optional[UUID] = None
+    progress_percent: Optional[int] = None
+
+
+class MemoryCreate(BaseModel):
+    """Schema for storing a memory."""
+
+    content: str
+    memory_type: MemoryType = MemoryType.EPISODIC
+    agent_id: Optional[UUID] = None
+    project_id: Optional[UUID] = None
+    task_id: Optional[UUID] = None
+    team_id: Optional[UUID] = None
+    importance: float = 0.5
+    keywords: list[str] = []
+    tags: list[str] = []
+    embedding: Optional[list[float]] = None
+
+
+class AgentBatchUpdate(AgentUpdate):
+    """Schema for one entry of a batch agent update."""
+
+    id: UUID
+
+
+class ProjectBatchUpdate(ProjectUpdate):
+    """Schema for one entry of a batch project update."""
+
+    id: UUID
+
+
+class TaskBatchUpdate(TaskUpdate):
+    """Schema for one entry of a batch task update."""
+
+    id: UUID
+
+
+class BatchItemError(BaseModel):
+    """Error for a single item of a batch request."""
+
+    index: int
+    id: Optional[UUID] = None
+    error: str
+
+
+class BatchResult(BaseModel, Generic[ReadT]):
+    """Result of a batch create or update.
+
+    Items that succeeded are returned in request order; items that failed
+    are reported in ``errors`` by their index in the request.
+    """
+
+    items: list[ReadT]
+    errors: list[BatchItemError] = []
+
+
+class MemoryBatchResult(BaseModel):
+    """Result of a batch memory store.
+
+    Ids of stored memories are returned in request order; invalid items
+    are reported in ``errors`` by their index in the request.
+    """
+
+    ids: list[UUID]
+    errors: list[BatchItemError] = []
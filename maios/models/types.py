@@ -0,0 +1,176 @@
+"""Custom column types for MAIOS models."""
+
+import json
+import struct
+from collections.abc import Sequence
+from typing import Annotated, Any, Optional, Union
+
+import numpy as np
+from pydantic import PlainSerializer, PlainValidator, WithJsonSchema
+from sqlalchemy import Float
+from sqlalchemy.types import LargeBinary, TypeDecorator, UserDefinedType
+
+# Packed embedding layout (databases without pgvector): a 4-byte header whose
+# first byte names the format, then the values. int8 rows add a float32 scale
+# after the header. The header keeps float32 values 4-byte aligned.
+EMBEDDING_FORMATS = {"float32": 1, "float16": 2, "int8": 3}
+EMBEDDING_HEADER_BYTES = 4
+
+
+def pack_embedding(values: Any, storage: str = "float32") -> bytes:
+    """Pack a vector into bytes in a storage format.
+
+    Args:
+        values: Sequence or array of floats
+        storage: ``float32``, ``float16`` (half the size) or ``int8``
+            (a quarter, quantized symmetrically with one scale per vector)
+
+    Raises:
+        ValueError: If the storage format is unknown
+    """
+    if storage not in EMBEDDING_FORMATS:
+        raise ValueError(f"Unknown embedding storage: {storage}")
+    header = struct.pack("<B3x", EMBEDDING_FORMATS[storage])
+    vector = np.asarray(values, dtype=np.float32)
+
+    if storage == "float32":
+        return header + vector.astype("<f4", copy=False).tobytes()
+    if storage == "float16":
+        return header + vector.astype("<f2").tobytes()
+
+    peak = float(np.abs(vector).max()) if vector.size else 0.0
+    scale = peak / 127 if peak else 1.0
+    quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+    return header + struct.pack("<f", scale) + quantized.tobytes()
+
+
+def unpack_embedding(raw: Union[bytes, str]) -> np.ndarray:
+    """Unpack a stored vector into a float32 array.
+
+    float32 rows come back as a read-only view over ``raw`` (no copy).
+    Rows written as JSON text before packed storage are still accepted.
+    """
+    if isinstance(raw, str):
+        return np.asarray(json.loads(raw), dtype=np.float32)
+
+    code = raw[0]
+    offset = EMBEDDING_HEADER_BYTES
+    if code == EMBEDDING_FORMATS["float32"]:
+        return np.frombuffer(raw, dtype="<f4", offset=offset)
+    if code == EMBEDDING_FORMATS["float16"]:
+        return np.frombuffer(raw, dtype="<f2", offset=offset).astype(np.float32)
+    if code == EMBEDDING_FORMATS["int8"]:
+        (scale,) = struct.unpack_from("<f", raw, offset)
+        return np.frombuffer(raw, dtype=np.int8, offset=offset + 4).astype(np.float32) * scale
+    raise ValueError(f"Unknown packed embedding format: {code}")
+
+
+class PackedVector(UserDefinedType):
+    """Embedding packed into a BLOB (see ``pack_embedding``)."""
+
+    cache_ok = True
+
+    def __init__(self, storage: Optional[str] = None):
+        # None reads settings.memory_embedding_storage when first used
+        self.storage = storage
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return "BLOB"
+
+    def bind_processor(self, dialect):
+        from maios.core.config import settings
+
+        def process(value: Any) -> Optional[bytes]:
+            if value is None:
+                return None
+            return pack_embedding(value, self.storage or settings.memory_embedding_storage)
+
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value: Any) -> Optional[np.ndarray]:
+            if value is None:
+                return None
+            return unpack_embedding(value)
+
+        return process
+
+
+class PGVector(UserDefinedType):
+    """pgvector ``vector(n)`` column, exchanged with the driver as text."""
+
+    cache_ok = True
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return f"vector({self.dimensions})"
+
+    def bind_processor(self, dialect):
+        def process(value: Optional[list[float]]) -> Optional[str]:
+            if value is None:
+                return None
+            return "[" + ",".join(str(float(v)) for v in value) + "]"
+
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value: Any) -> Optional[np.ndarray]:
+            if value is None or not isinstance(value, str):
+                return value
+            # Parsed in C, straight into float32
+            return np.fromstring(value.strip("[]"), dtype=np.float32, sep=",")
+
+        return process
+
+
+class Vector(TypeDecorator):
+    """Embedding vector: pgvector on PostgreSQL, a packed BLOB elsewhere.
+
+    Values are written from any float sequence and read back as float32
+    NumPy arrays. Supports ``cosine_distance`` in expressions, which
+    compiles to pgvector's ``<=>`` operator and so can use an HNSW
+    ``vector_cosine_ops`` index.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    class Comparator(TypeDecorator.Comparator):
+        def cosine_distance(self, other: Any):
+            return self.op("<=>", return_type=Float)(other)
+
+    comparator_factory = Comparator
+
+    def __init__(self, dimensions: int):
+        super().__init__()
+        self.dimensions = dimensions
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PGVector(self.dimensions))
+        return dialect.type_descriptor(PackedVector())
+
+
+def as_embedding(value: Any) -> np.ndarray:
+    """Coerce a float sequence to a float32 vector.
+
+    Raises:
+        ValueError: If the value is not a flat sequence of numbers
+    """
+    vector = np.asarray(value, dtype=np.float32)
+    if vector.ndim != 1:
+        raise ValueError("Embedding must be a flat sequence of floats")
+    return vector
+
+
+# Model field for embeddings. Columns load float32 arrays and validation
+# produces one too, so values must not be truth-tested or JSON-dumped as lists;
+# serialization to JSON yields a list
+Embedding = Annotated[
+    Union[Sequence[float], np.ndarray],
+    PlainValidator(as_embedding),
+    PlainSerializer(lambda vector: [float(v) for v in vector], when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+]
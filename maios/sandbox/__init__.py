@@ -7,6 +7,7 @@ from maios.sandbox.models import (
     ContainerType,
     ExecutionRequest,
     ExecutionResult,
+    OutputChunk,
     PreviewRequest,
     PreviewResult,
     TestExecutionRequest,
@@ -21,6 +22,7 @@ __all__ = [
     "ContainerType",
     "ExecutionRequest",
     "ExecutionResult",
+    "OutputChunk",
     "PreviewRequest",
     "PreviewResult",
     "TestExecutionRequest",
@@ -0,0 +1,13 @@
+"""Sandbox execution backends for MAIOS."""
+
+from maios.sandbox.backends.base import RESOURCE_LIMITS, SandboxBackend
+from maios.sandbox.backends.docker_backend import CONTAINER_IMAGES, DockerBackend
+from maios.sandbox.backends.namespace import NamespaceBackend
+
+__all__ = [
+    "CONTAINER_IMAGES",
+    "RESOURCE_LIMITS",
+    "DockerBackend",
+    "NamespaceBackend",
+    "SandboxBackend",
+]
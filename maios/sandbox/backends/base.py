@@ -0,0 +1,115 @@
+# maios/sandbox/backends/base.py
+"""Sandbox backend interface and helpers shared by backends."""
+
+from abc import ABC, abstractmethod
+import threading
+from typing import Any, Optional
+
+from maios.sandbox.models import ContainerType, ExecutionRequest, ExecutionResult
+from maios.sandbox.streaming import OutputBuffer
+
+# Resource limits by container type
+RESOURCE_LIMITS = {
+    ContainerType.EXECUTION: {
+        "mem_limit": "512m",
+        "cpu_period": 100000,
+        "cpu_quota": 100000,  # 1 CPU
+        "pids_limit": 100,
+    },
+    ContainerType.TEST_RUNNER: {
+        "mem_limit": "2g",
+        "cpu_period": 100000,
+        "cpu_quota": 200000,  # 2 CPUs
+        "pids_limit": 200,
+    },
+    ContainerType.PREVIEW: {
+        "mem_limit": "1g",
+        "cpu_period": 100000,
+        "cpu_quota": 100000,
+        "pids_limit": 150,
+    },
+}
+
+_SIZE_UNITS = {"k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    """Convert a Docker-style size such as ``512m`` to bytes."""
+    unit = size[-1].lower()
+    if unit in _SIZE_UNITS:
+        return int(size[:-1]) * _SIZE_UNITS[unit]
+    return int(size)
+
+
+def build_command(
+    language: str, code: str, python: str = "python", node: str = "node"
+) -> list[str]:
+    """Build the interpreter command for a snippet."""
+    if language == "python":
+        return [python, "-c", code]
+    elif language in ("javascript", "typescript"):
+        return [node, "-e", code]
+    else:
+        raise ValueError(f"Unsupported language: {language}")
+
+
+def timeout_command(seconds: int, command: list[str]) -> list[str]:
+    """Wrap a command so it is SIGKILLed after ``seconds``."""
+    return ["timeout", "-s", "KILL", str(seconds), *command]
+
+
+def stream_result(
+    buffer: OutputBuffer,
+    exit_code: int,
+    duration_ms: int,
+    error: Optional[str] = None,
+) -> ExecutionResult:
+    """Build the result of a streamed run from the buffered output tails."""
+    return ExecutionResult(
+        exit_code=exit_code,
+        stdout=buffer.tails["stdout"].text(),
+        stderr=buffer.tails["stderr"].text(),
+        duration_ms=duration_ms,
+        error=error,
+    )
+
+
+class SandboxBackend(ABC):
+    """A way of running untrusted snippets in isolation.
+
+    Methods block and are called from the sandbox manager's executor.
+    """
+
+    name: str
+
+    @abstractmethod
+    def is_healthy(self) -> bool:
+        """Check whether the backend can run code right now."""
+
+    @abstractmethod
+    def supports(self, language: str) -> bool:
+        """Check whether the backend can run a language."""
+
+    @abstractmethod
+    def run(self, request: ExecutionRequest, container_type: ContainerType) -> ExecutionResult:
+        """Run a snippet to completion."""
+
+    @abstractmethod
+    def stream(
+        self,
+        request: ExecutionRequest,
+        container_type: ContainerType,
+        buffer: OutputBuffer,
+        cancel: threading.Event,
+    ) -> ExecutionResult:
+        """Run a snippet, pushing output to ``buffer`` as it is produced.
+
+        Must close ``buffer`` when done and stop early once ``cancel`` is set.
+        """
+
+    def stats(self) -> Optional[dict[str, Any]]:
+        """Return backend-specific metrics, if any."""
+        return None
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
@@ -0,0 +1,434 @@
+# maios/sandbox/backends/docker_backend.py
+"""Docker sandbox backend.
+
+Snippets run in warm containers from ``ContainerPool`` when pooling is
+enabled, falling back to a one-off container when the pool for that key
+is exhausted.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from maios.core.config import settings
+from maios.sandbox.backends.base import (
+    RESOURCE_LIMITS,
+    SandboxBackend,
+    build_command,
+    stream_result,
+    timeout_command,
+)
+from maios.sandbox.models import (
+    ContainerMetrics,
+    ContainerType,
+    ExecutionRequest,
+    ExecutionResult,
+)
+from maios.sandbox.pool import ContainerPool, PoolKey, PooledContainer
+from maios.sandbox.streaming import OutputBuffer
+
+logger = logging.getLogger(__name__)
+
+# Container image mappings
+CONTAINER_IMAGES = {
+    "python": "python:3.12-slim",
+    "javascript": "node:20-slim",
+    "typescript": "node:20-slim",
+}
+
+
+class DockerBackend(SandboxBackend):
+    """Runs snippets in resource-limited Docker containers."""
+
+    name = "docker"
+
+    def __init__(self, use_pool: Optional[bool] = None):
+        self._client = None
+        self._use_pool = use_pool
+        self._pool: Optional[ContainerPool] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Lazy-loaded Docker client."""
+        if self._client is None:
+            import docker
+            from docker import errors as docker_errors
+
+            try:
+                self._client = docker.from_env()
+                logger.info("Docker client initialized successfully")
+            except docker_errors.DockerException as e:
+                logger.error(f"Failed to connect to Docker daemon: {e}")
+                raise
+        return self._client
+
+    @property
+    def pool(self) -> Optional[ContainerPool]:
+        """Lazy-created warm container pool, or None when pooling is off."""
+        use_pool = self._use_pool if self._use_pool is not None else settings.sandbox_pool_enabled
+        if not use_pool:
+            return None
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ContainerPool(
+                        factory=self._create_warm_container,
+                        min_size=settings.sandbox_pool_min_size,
+                        max_size=settings.sandbox_pool_max_size,
+                        idle_ttl_seconds=settings.sandbox_pool_idle_ttl_seconds,
+                    )
+        return self._pool
+
+    def stats(self) -> Optional[dict[str, Any]]:
+        """Return warm pool metrics, or None when pooling is off."""
+        return self._pool.snapshot() if self._pool is not None else None
+
+    def close(self) -> None:
+        """Remove idle warm containers; the pool is recreated on next use."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+    def is_healthy(self) -> bool:
+        """Check if Docker daemon is accessible."""
+        try:
+            self.client.ping()
+            return True
+        except Exception:
+            return False
+
+    def supports(self, language: str) -> bool:
+        """Check whether an image is configured for a language."""
+        return language in CONTAINER_IMAGES
+
+    def run(self, request: ExecutionRequest, container_type: ContainerType) -> ExecutionResult:
+        """Run in a warm container if one is available, else a one-off container."""
+        pool = self.pool
+        if pool is not None:
+            pooled = pool.acquire((request.language, container_type))
+            if pooled is not None:
+                return self._run_warm(pool, pooled, request)
+        return self._run_container(request, container_type)
+
+    def stream(
+        self,
+        request: ExecutionRequest,
+        container_type: ContainerType,
+        buffer: OutputBuffer,
+        cancel: threading.Event,
+    ) -> ExecutionResult:
+        """Run a snippet, pushing output to the buffer as it arrives."""
+        start_time = time.monotonic()
+        command = timeout_command(
+            request.timeout_seconds, build_command(request.language, request.code)
+        )
+
+        pool = self.pool
+        pooled = pool.acquire((request.language, container_type)) if pool else None
+        container = None
+
+        try:
+            if pooled is not None:
+                api = self.client.api
+                exec_id = api.exec_create(
+                    pooled.container.id,
+                    command,
+                    workdir="/tmp",
+                    environment=request.environment or None,
+                )["Id"]
+                output = api.exec_start(exec_id, stream=True, demux=True)
+            else:
+                container = self._create_container(request.language, command, container_type)
+                container.start()
+                output = container.attach(
+                    stdout=True, stderr=True, stream=True, logs=True, demux=True
+                )
+
+            for stdout, stderr in output:
+                if stdout:
+                    buffer.push("stdout", stdout)
+                if stderr:
+                    buffer.push("stderr", stderr)
+                if cancel.is_set():
+                    break
+
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+            if cancel.is_set():
+                return stream_result(buffer, 137, duration_ms, error="Execution cancelled")
+
+            if pooled is not None:
+                exit_code = api.exec_inspect(exec_id)["ExitCode"]
+            else:
+                exit_code = container.wait(timeout=request.timeout_seconds).get("StatusCode", 1)
+
+            if exit_code == 137 and duration_ms >= request.timeout_seconds * 1000:
+                return stream_result(
+                    buffer,
+                    137,  # SIGKILL
+                    duration_ms,
+                    error=f"Execution timed out after {request.timeout_seconds} seconds",
+                )
+            return stream_result(buffer, exit_code if exit_code is not None else 1, duration_ms)
+
+        except Exception as e:
+            logger.exception(f"Streaming execution failed: {e}")
+            return stream_result(
+                buffer, 1, int((time.monotonic() - start_time) * 1000), error=str(e)
+            )
+
+        finally:
+            buffer.close()
+            if pooled is not None:
+                pool.release(pooled)
+            if container is not None:
+                try:
+                    container.remove(force=True)
+                except Exception as e:
+                    logger.warning(f"Failed to remove container: {e}")
+
+    def _create_container(self, language: str, command: list[str], container_type: ContainerType):
+        """Create a one-off sandbox container."""
+        limits = RESOURCE_LIMITS[container_type]
+        return self.client.containers.create(
+            image=CONTAINER_IMAGES[language],
+            command=command,
+            mem_limit=limits["mem_limit"],
+            cpu_period=limits["cpu_period"],
+            cpu_quota=limits["cpu_quota"],
+            pids_limit=limits["pids_limit"],
+            network_disabled=True,  # No network access for security
+            detach=True,
+            labels={
+                "maios.type": "sandbox",
+                "maios.container_type": container_type.value,
+            },
+        )
+
+    def _create_warm_container(self, key: PoolKey):
+        """Create and start an idle container for the warm pool."""
+        language, container_type = key
+        limits = RESOURCE_LIMITS[container_type]
+        container = self.client.containers.create(
+            image=CONTAINER_IMAGES[language],
+            command=["sleep", "infinity"],
+            mem_limit=limits["mem_limit"],
+            cpu_period=limits["cpu_period"],
+            cpu_quota=limits["cpu_quota"],
+            pids_limit=limits["pids_limit"],
+            network_disabled=True,  # No network access for security
+            detach=True,
+            init=True,  # Reap processes left behind by snippets
+            tmpfs={"/tmp": "size=64m"},
+            labels={
+                "maios.type": "sandbox",
+                "maios.container_type": container_type.value,
+                "maios.pool": "warm",
+                "maios.language": language,
+            },
+        )
+        container.start()
+        logger.info(f"Started warm container {container.id[:12]} for {language}")
+        return container
+
+    def _run_warm(
+        self,
+        pool: ContainerPool,
+        pooled: PooledContainer,
+        request: ExecutionRequest,
+    ) -> ExecutionResult:
+        """Run a snippet via exec in a warm container, then retire the container."""
+        start_time = time.monotonic()
+
+        try:
+            command = build_command(request.language, request.code)
+            # exec has no timeout of its own, so bound the run inside the container
+            exit_code, (stdout, stderr) = pooled.container.exec_run(
+                timeout_command(request.timeout_seconds, command),
+                demux=True,
+                workdir="/tmp",
+                environment=request.environment or None,
+            )
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+
+            if exit_code == 137 and duration_ms >= request.timeout_seconds * 1000:
+                return ExecutionResult(
+                    exit_code=137,  # SIGKILL
+                    stdout="",
+                    stderr="",
+                    duration_ms=duration_ms,
+                    error=f"Execution timed out after {request.timeout_seconds} seconds",
+                )
+
+            return ExecutionResult(
+                exit_code=exit_code if exit_code is not None else 1,
+                stdout=(stdout or b"").decode("utf-8", errors="replace"),
+                stderr=(stderr or b"").decode("utf-8", errors="replace"),
+                duration_ms=duration_ms,
+            )
+
+        except Exception as e:
+            logger.exception(f"Warm execution failed: {e}")
+            return ExecutionResult(
+                exit_code=1,
+                stdout="",
+                stderr="",
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                error=str(e),
+            )
+
+        finally:
+            pool.release(pooled)
+
+    def _run_container(
+        self,
+        request: ExecutionRequest,
+        container_type: ContainerType,
+    ) -> ExecutionResult:
+        """Create, run and remove a one-off container."""
+        from docker import errors as docker_errors
+
+        start_time = time.monotonic()
+        container = None
+
+        try:
+            # Build command
+            command = build_command(request.language, request.code)
+
+            # Create container
+            container = self._create_container(request.language, command, container_type)
+
+            logger.info(f"Created container {container.id[:12]} for {request.language} execution")
+
+            # Start container
+            container.start()
+
+            # Wait for completion with timeout
+            try:
+                result = container.wait(timeout=request.timeout_seconds)
+                exit_code = result.get("StatusCode", 1)
+            except Exception as e:
+                if "timeout" in str(e).lower() or "timed out" in str(e).lower():
+                    container.kill()
+                    return ExecutionResult(
+                        exit_code=137,  # SIGKILL
+                        stdout="",
+                        stderr="",
+                        duration_ms=request.timeout_seconds * 1000,
+                        error=f"Execution timed out after {request.timeout_seconds} seconds",
+                    )
+                raise
+
+            # Get logs
+            stdout = container.logs(stdout=True, stderr=False).decode("utf-8", errors="replace")
+            stderr = container.logs(stdout=False, stderr=True).decode("utf-8", errors="replace")
+
+            duration_ms = int((time.monotonic() - start_time) * 1000)
+
+            logger.info(f"Container {container.id[:12]} completed with exit code {exit_code}")
+
+            return ExecutionResult(
+                exit_code=exit_code,
+                stdout=stdout,
+                stderr=stderr,
+                duration_ms=duration_ms,
+            )
+
+        except docker_errors.ImageNotFound as e:
+            return ExecutionResult(
+                exit_code=1,
+                stdout="",
+                stderr="",
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                error=f"Docker image not found: {e}",
+            )
+
+        except docker_errors.APIError as e:
+            return ExecutionResult(
+                exit_code=1,
+                stdout="",
+                stderr="",
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                error=f"Docker API error: {e}",
+            )
+
+        except Exception as e:
+            logger.exception(f"Execution failed: {e}")
+            return ExecutionResult(
+                exit_code=1,
+                stdout="",
+                stderr="",
+                duration_ms=int((time.monotonic() - start_time) * 1000),
+                error=str(e),
+            )
+
+        finally:
+            # Cleanup container
+            if container:
+                try:
+                    container.remove(force=True)
+                    logger.debug(f"Removed container {container.id[:12]}")
+                except Exception as e:
+                    logger.warning(f"Failed to remove container: {e}")
+
+    def stop_container(self, container_id: str) -> bool:
+        """Stop and remove a container."""
+        try:
+            container = self.client.containers.get(container_id)
+            container.stop()
+            container.remove()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to stop container {container_id}: {e}")
+            return False
+
+    def get_metrics(self, container_id: str) -> Optional[ContainerMetrics]:
+        """Get metrics for a running container."""
+        try:
+            container = self.client.containers.get(container_id)
+            stats = container.stats(stream=False)
+            return ContainerMetrics.from_docker_stats(container_id, stats)
+        except Exception as e:
+            logger.error(f"Failed to get metrics for {container_id}: {e}")
+            return None
+
+    def list_containers(self) -> list[dict]:
+        """List all MAIOS sandbox containers."""
+        try:
+            containers = self.client.containers.list(
+                all=True,
+                filters={"label": "maios.type=sandbox"},
+            )
+            return [
+                {
+                    "id": c.id,
+                    "name": c.name,
+                    "status": c.status,
+                    "image": c.image.tags[0] if c.image.tags else c.image.id,
+                    "labels": c.labels,
+                }
+                for c in containers
+            ]
+        except Exception as e:
+            logger.error(f"Failed to list containers: {e}")
+            return []
+
+    def cleanup_all(self) -> int:
+        """Remove all MAIOS sandbox containers."""
+        count = 0
+        try:
+            containers = self.client.containers.list(
+                all=True,
+                filters={"label": "maios.type=sandbox"},
+            )
+            for container in containers:
+                try:
+                    container.remove(force=True)
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"Failed to remove container {container.id}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to cleanup containers: {e}")
+        return count
@@ -0,0 +1,287 @@
+# maios/sandbox/backends/namespace.py
+"""Linux namespace sandbox backend.
+
+Runs snippets as a plain subprocess isolated with ``unshare`` (new user,
+network, PID, mount, IPC and UTS namespaces) and limited with ``prlimit``.
+Inside, the root filesystem is remounted read-only (the run is refused if
+that fails) and a private tmpfs is mounted over ``/tmp`` as the working
+directory. There is
+no network beyond a downed loopback. When the worker runs as root the
+sandbox first drops to an unprivileged user, so host files are protected
+by normal permissions.
+
+Startup takes milliseconds and needs no daemon, at the cost of weaker
+isolation than a container: the host filesystem stays visible read-only,
+a worker not running as root runs snippets as its own user (who can read
+the worker's files), and limits are rlimits, not cgroups (``pids_limit``
+becomes RLIMIT_NPROC, which counts all processes of the sandbox user). It
+is meant for development and CI and must be selected explicitly.
+"""
+
+import logging
+import os
+import pwd
+import selectors
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+from maios.core.config import settings
+from maios.sandbox.backends.base import (
+    RESOURCE_LIMITS,
+    SandboxBackend,
+    build_command,
+    parse_size,
+    stream_result,
+)
+from maios.sandbox.models import ContainerType, ExecutionRequest, ExecutionResult
+from maios.sandbox.streaming import OutputBuffer
+
+logger = logging.getLogger(__name__)
+
+# PATH inside the sandbox; interpreters are resolved against it
+SANDBOX_PATH = "/usr/local/bin:/usr/bin:/bin"
+
+# Size of the private /tmp, also the largest file a snippet may write
+TMPFS_SIZE = "64m"
+
+UNSHARE_FLAGS = [
+    "--user",
+    "--map-root-user",
+    "--net",
+    "--pid",
+    "--fork",
+    "--kill-child",
+    "--mount-proc",
+    "--mount",
+    "--ipc",
+    "--uts",
+]
+
+# Remount / read-only, mount a private /tmp and exec the snippet. Fails closed:
+# nothing runs unless both mounts succeed.
+# Invoked as: sh -c SCRIPT maios-sandbox <tmpfs size> <command...>
+SETUP_SCRIPT = (
+    "mount -o remount,bind,ro / || exit 126; "
+    'mount -t tmpfs -o size="$1",mode=1777 tmpfs /tmp || exit 126; '
+    'cd /tmp && shift && exec "$@"'
+)
+
+INTERPRETERS = {
+    "python": "python3",
+    "javascript": "node",
+    "typescript": "node",
+}
+
+
+class NamespaceBackend(SandboxBackend):
+    """Runs snippets in an unshare'd, rlimited subprocess."""
+
+    name = "namespace"
+
+    def __init__(self, run_as: Optional[str] = None):
+        self._run_as = run_as
+        self._healthy: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    @property
+    def run_as(self) -> Optional[str]:
+        """User the sandbox drops to; only applies when running as root."""
+        if os.geteuid() != 0:
+            return None
+        return self._run_as if self._run_as is not None else settings.sandbox_namespace_user
+
+    def _interpreter(self, language: str) -> Optional[str]:
+        name = INTERPRETERS.get(language)
+        return shutil.which(name, path=SANDBOX_PATH) if name else None
+
+    def supports(self, language: str) -> bool:
+        """Check whether an interpreter for the language is installed."""
+        return self._interpreter(language) is not None
+
+    def is_healthy(self) -> bool:
+        """Check once whether namespaces can be created here."""
+        if self._healthy is None:
+            with self._lock:
+                if self._healthy is None:
+                    self._healthy = self._probe()
+        return self._healthy
+
+    def _probe(self) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        if not (shutil.which("unshare") and shutil.which("prlimit")):
+            logger.info("Namespace sandbox unavailable: unshare/prlimit not installed")
+            return False
+
+        try:
+            proc = subprocess.run(
+                self._wrap(["true"], ContainerType.EXECUTION, timeout_seconds=5),
+                env=self._environment({}),
+                capture_output=True,
+                timeout=10,
+                **self._user_kwargs(),
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.info(f"Namespace sandbox unavailable: {e}")
+            return False
+
+        if proc.returncode != 0:
+            stderr = proc.stderr.decode("utf-8", errors="replace").strip()
+            logger.info(f"Namespace sandbox unavailable: {stderr}")
+        return proc.returncode == 0
+
+    def _wrap(
+        self, command: list[str], container_type: ContainerType, timeout_seconds: int
+    ) -> list[str]:
+        """Wrap a command in prlimit and unshare."""
+        limits = RESOURCE_LIMITS[container_type]
+        return [
+            "prlimit",
+            # RLIMIT_DATA rather than RLIMIT_AS: V8 reserves far more address space than it uses
+            f"--data={parse_size(limits['mem_limit'])}",
+            f"--nproc={limits['pids_limit']}",
+            f"--cpu={timeout_seconds + 1}",
+            f"--fsize={parse_size(TMPFS_SIZE)}",
+            "--nofile=256",
+            "--core=0",
+            "--",
+            "unshare",
+            *UNSHARE_FLAGS,
+            "--",
+            "/bin/sh",
+            "-c",
+            SETUP_SCRIPT,
+            "maios-sandbox",
+            TMPFS_SIZE,
+            *command,
+        ]
+
+    def _environment(self, extra: dict[str, str]) -> dict[str, str]:
+        return {"PATH": SANDBOX_PATH, "HOME": "/tmp", "LANG": "C.UTF-8", **extra}
+
+    def _user_kwargs(self) -> dict:
+        run_as = self.run_as
+        if not run_as:
+            return {}
+        entry = pwd.getpwnam(run_as)
+        return {"user": entry.pw_uid, "group": entry.pw_gid, "extra_groups": []}
+
+    def _execute(
+        self,
+        request: ExecutionRequest,
+        container_type: ContainerType,
+        emit: Callable[[str, bytes], None],
+        cancel: Optional[threading.Event] = None,
+    ) -> tuple[int, int, Optional[str]]:
+        """Run a snippet, passing output to ``emit`` as it is read.
+
+        Returns:
+            (exit_code, duration_ms, error)
+        """
+        start_time = time.monotonic()
+        interpreter = self._interpreter(request.language)
+        if interpreter is None:
+            return 1, 0, f"No interpreter installed for {request.language}"
+
+        command = self._wrap(
+            build_command(request.language, request.code, python=interpreter, node=interpreter),
+            container_type,
+            request.timeout_seconds,
+        )
+        deadline = start_time + request.timeout_seconds
+
+        proc = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=self._environment(request.environment),
+            cwd="/",
+            start_new_session=True,  # Own process group, so a kill reaches everything
+            **self._user_kwargs(),
+        )
+
+        stopped = None
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ, "stdout")
+            selector.register(proc.stderr, selectors.EVENT_READ, "stderr")
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    stopped = f"Execution timed out after {request.timeout_seconds} seconds"
+                    break
+                if cancel is not None and cancel.is_set():
+                    stopped = "Execution cancelled"
+                    break
+                for key, _ in selector.select(timeout=min(remaining, 0.1)):
+                    data = os.read(key.fd, 65536)
+                    if data:
+                        emit(key.data, data)
+                    else:
+                        selector.unregister(key.fileobj)
+
+        if stopped is None:
+            try:
+                proc.wait(timeout=max(deadline - time.monotonic(), 0.01))
+            except subprocess.TimeoutExpired:
+                stopped = f"Execution timed out after {request.timeout_seconds} seconds"
+
+        if stopped is not None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+        if stopped is not None:
+            return 137, duration_ms, stopped  # SIGKILL
+
+        # Report deaths by signal the way a shell (and Docker) does
+        exit_code = proc.returncode if proc.returncode >= 0 else 128 - proc.returncode
+        return exit_code, duration_ms, None
+
+    def run(self, request: ExecutionRequest, container_type: ContainerType) -> ExecutionResult:
+        """Run a snippet to completion."""
+        output: dict[str, list[bytes]] = {"stdout": [], "stderr": []}
+        try:
+            exit_code, duration_ms, error = self._execute(
+                request, container_type, lambda stream, data: output[stream].append(data)
+            )
+        except Exception as e:
+            logger.exception(f"Execution failed: {e}")
+            return ExecutionResult(exit_code=1, stdout="", stderr="", duration_ms=0, error=str(e))
+
+        return ExecutionResult(
+            exit_code=exit_code,
+            stdout=b"".join(output["stdout"]).decode("utf-8", errors="replace"),
+            stderr=b"".join(output["stderr"]).decode("utf-8", errors="replace"),
+            duration_ms=duration_ms,
+            error=error,
+        )
+
+    def stream(
+        self,
+        request: ExecutionRequest,
+        container_type: ContainerType,
+        buffer: OutputBuffer,
+        cancel: threading.Event,
+    ) -> ExecutionResult:
+        """Run a snippet, pushing output to the buffer as it is read."""
+        try:
+            exit_code, duration_ms, error = self._execute(
+                request, container_type, buffer.push, cancel
+            )
+            return stream_result(buffer, exit_code, duration_ms, error=error)
+        except Exception as e:
+            logger.exception(f"Streaming execution failed: {e}")
+            return stream_result(buffer, 1, 0, error=str(e))
+        finally:
+            buffer.close()
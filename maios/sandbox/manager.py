@@ -1,12 +1,32 @@
-"""Sandbox manager for Docker-based code execution."""
+"""Sandbox manager for code execution.
+
+Execution is delegated to a pluggable backend: Docker containers, or a
+namespace-isolated subprocess on Linux hosts without a Docker daemon. The
+backend is chosen by ``SANDBOX_BACKEND``: ``docker`` (the default),
+``namespace`` or ``auto``, which prefers Docker and falls back to
+namespaces. The namespace backend isolates less than a container, so it
+and ``auto`` are opt-ins for development and CI.
+
+Backends block, so every run goes through a bounded thread pool. The pool
+size is the cap on concurrently running sandboxes; executions beyond it
+queue without holding up the event loop.
+"""
 
 import asyncio
 import logging
+import threading
 import time
-from typing import Optional
-
-from docker import errors as docker_errors
-
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from maios.core.config import settings
+from maios.sandbox.backends import (
+    CONTAINER_IMAGES,
+    DockerBackend,
+    NamespaceBackend,
+    SandboxBackend,
+)
+from maios.sandbox.backends.base import build_command
 from maios.sandbox.models import (
     ContainerType,
     ContainerMetrics,
@@ -17,65 +37,150 @@ from maios.sandbox.models import (
     TestExecutionRequest,
     TestExecutionResult,
 )
+from maios.sandbox.streaming import ExecutionStream, OutputBuffer
 
 logger = logging.getLogger(__name__)
 
-# Container image mappings
-CONTAINER_IMAGES = {
-    "python": "python:3.12-slim",
-    "javascript": "node:20-slim",
-    "typescript": "node:20-slim",
-}
-
-# Resource limits by container type
-RESOURCE_LIMITS = {
-    ContainerType.EXECUTION: {
-        "mem_limit": "512m",
-        "cpu_period": 100000,
-        "cpu_quota": 100000,  # 1 CPU
-        "pids_limit": 100,
-    },
-    ContainerType.TEST_RUNNER: {
-        "mem_limit": "2g",
-        "cpu_period": 100000,
-        "cpu_quota": 200000,  # 2 CPUs
-        "pids_limit": 200,
-    },
-    ContainerType.PREVIEW: {
-        "mem_limit": "1g",
-        "cpu_period": 100000,
-        "cpu_quota": 100000,
-        "pids_limit": 150,
-    },
-}
+T = TypeVar("T")
+
+# Seconds an "auto" backend choice is reused before health is checked again
+BACKEND_RECHECK_SECONDS = 30.0
 
 
 class SandboxManager:
-    """Manages Docker-based sandbox containers for code execution."""
+    """Manages sandboxed code execution across backends."""
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        use_pool: Optional[bool] = None,
+        backend: Optional[str] = None,
+    ):
+        self._max_concurrent = max_concurrent
+        self._backend_name = backend
+        self._docker = DockerBackend(use_pool=use_pool)
+        self._namespace = NamespaceBackend()
+        self._auto_backend: Optional[SandboxBackend] = None
+        self._auto_checked_at = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._running = 0
+        self._queued = 0
 
-    def __init__(self):
-        self._client = None
-        self._active_containers: dict[str, dict] = {}
+    @property
+    def docker(self) -> DockerBackend:
+        """The Docker backend, also used for container management."""
+        return self._docker
+
+    @property
+    def namespace(self) -> NamespaceBackend:
+        """The Linux namespace subprocess backend."""
+        return self._namespace
+
+    @property
+    def backend(self) -> SandboxBackend:
+        """The backend new executions run on.
+
+        May block on a Docker ping when the backend is ``auto``.
+        """
+        name = self._backend_name or settings.sandbox_backend
+        if name == "docker":
+            return self._docker
+        if name == "namespace":
+            return self._namespace
+        if name != "auto":
+            raise ValueError(f"Unknown sandbox backend: {name}")
+
+        now = time.monotonic()
+        if self._auto_backend is None or now - self._auto_checked_at > BACKEND_RECHECK_SECONDS:
+            if self._docker.is_healthy() or not self._namespace.is_healthy():
+                self._auto_backend = self._docker
+            else:
+                if self._auto_backend is not self._namespace:
+                    logger.warning("Docker unavailable; sandboxing with the namespace backend")
+                self._auto_backend = self._namespace
+            self._auto_checked_at = now
+        return self._auto_backend
+
+    @property
+    def max_concurrent(self) -> int:
+        """Maximum number of sandboxes run at once by this process."""
+        if self._max_concurrent is not None:
+            return self._max_concurrent
+        return settings.sandbox_max_concurrent
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Lazy-created thread pool that runs blocking executions."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrent,
+                        thread_name_prefix="maios-sandbox",
+                    )
+        return self._executor
 
     @property
     def client(self):
         """Lazy-loaded Docker client."""
-        if self._client is None:
+        return self._docker.client
+
+    def pool_stats(self) -> Optional[dict[str, Any]]:
+        """Return warm container pool metrics, or None when pooling is off."""
+        return self._docker.stats()
+
+    def execution_stats(self) -> dict[str, int]:
+        """Return running and queued execution counts."""
+        with self._stats_lock:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "running": self._running,
+                "queued": self._queued,
+            }
+
+    async def _run_in_executor(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking execution in the bounded pool."""
+        started = False
+        with self._stats_lock:
+            self._queued += 1
+
+        def run() -> T:
+            nonlocal started
+            with self._stats_lock:
+                started = True
+                self._queued -= 1
+                self._running += 1
             try:
-                import docker
-                self._client = docker.from_env()
-                logger.info("Docker client initialized successfully")
-            except docker_errors.DockerException as e:
-                logger.error(f"Failed to connect to Docker daemon: {e}")
-                raise
-        return self._client
+                return func(*args)
+            finally:
+                with self._stats_lock:
+                    self._running -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, run)
+        finally:
+            # Cancelled while still queued: the pool drops the call
+            with self._stats_lock:
+                if not started:
+                    self._queued -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the execution pool and backends; they are recreated on next use."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+        self._docker.close()
+        self._namespace.close()
 
     def is_healthy(self) -> bool:
-        """Check if Docker daemon is accessible."""
+        """Check if the selected sandbox backend can run code."""
         try:
-            self.client.ping()
-            return True
-        except (docker_errors.DockerException, Exception):
+            return self.backend.is_healthy()
+        except Exception:
             return False
 
     def _get_image(self, language: str) -> Optional[str]:
@@ -84,19 +189,23 @@ class SandboxManager:
 
     def _build_command(self, language: str, code: str) -> list[str]:
         """Build container command for code execution."""
-        if language == "python":
-            return ["python", "-c", code]
-        elif language in ("javascript", "typescript"):
-            return ["node", "-e", code]
-        else:
-            raise ValueError(f"Unsupported language: {language}")
+        return build_command(language, code)
+
+    def _validate(self, request: ExecutionRequest) -> Optional[str]:
+        """Return an error message if a request cannot be run."""
+        if request.language not in CONTAINER_IMAGES:
+            supported = list(CONTAINER_IMAGES.keys())
+            return f"Unsupported language: {request.language}. Supported: {supported}"
+        if not request.code or not request.code.strip():
+            return "No code provided"
+        return None
 
     async def execute_code(
         self,
         request: ExecutionRequest,
         container_type: ContainerType = ContainerType.EXECUTION,
     ) -> ExecutionResult:
-        """Execute code in a sandbox container.
+        """Execute code in a sandbox.
 
         Args:
             request: Execution request with code and language
@@ -105,125 +214,44 @@ class SandboxManager:
         Returns:
             ExecutionResult with stdout, stderr, and exit code
         """
-        start_time = time.monotonic()
-        container = None
-
-        try:
-            # Validate language
-            image = self._get_image(request.language)
-            if not image:
-                return ExecutionResult(
-                    exit_code=1,
-                    stdout="",
-                    stderr="",
-                    duration_ms=0,
-                    error=f"Unsupported language: {request.language}. Supported: {list(CONTAINER_IMAGES.keys())}",
-                )
-
-            # Validate code
-            if not request.code or not request.code.strip():
-                return ExecutionResult(
-                    exit_code=1,
-                    stdout="",
-                    stderr="",
-                    duration_ms=0,
-                    error="No code provided",
-                )
+        error = self._validate(request)
+        if error:
+            return ExecutionResult(exit_code=1, stdout="", stderr="", duration_ms=0, error=error)
 
-            # Build command
-            command = self._build_command(request.language, request.code)
-
-            # Get resource limits
-            limits = RESOURCE_LIMITS[container_type]
-
-            # Create container
-            container = self.client.containers.create(
-                image=image,
-                command=command,
-                mem_limit=limits["mem_limit"],
-                cpu_period=limits["cpu_period"],
-                cpu_quota=limits["cpu_quota"],
-                pids_limit=limits["pids_limit"],
-                network_disabled=True,  # No network access for security
-                detach=True,
-                labels={
-                    "maios.type": "sandbox",
-                    "maios.container_type": container_type.value,
-                },
-            )
-
-            logger.info(f"Created container {container.id[:12]} for {request.language} execution")
-
-            # Start container
-            container.start()
-
-            # Wait for completion with timeout
-            try:
-                result = container.wait(timeout=request.timeout_seconds)
-                exit_code = result.get("StatusCode", 1)
-            except Exception as e:
-                if "timeout" in str(e).lower() or "timed out" in str(e).lower():
-                    container.kill()
-                    return ExecutionResult(
-                        exit_code=137,  # SIGKILL
-                        stdout="",
-                        stderr="",
-                        duration_ms=request.timeout_seconds * 1000,
-                        error=f"Execution timed out after {request.timeout_seconds} seconds",
-                    )
-                raise
-
-            # Get logs
-            stdout = container.logs(stdout=True, stderr=False).decode("utf-8", errors="replace")
-            stderr = container.logs(stdout=False, stderr=True).decode("utf-8", errors="replace")
-
-            duration_ms = int((time.monotonic() - start_time) * 1000)
+        return await self._run_in_executor(
+            lambda: self.backend.run(request, container_type)
+        )
 
-            logger.info(f"Container {container.id[:12]} completed with exit code {exit_code}")
+    def stream_code(
+        self,
+        request: ExecutionRequest,
+        container_type: ContainerType = ContainerType.EXECUTION,
+    ) -> ExecutionStream:
+        """Execute code and stream its output as it is produced.
 
-            return ExecutionResult(
-                exit_code=exit_code,
-                stdout=stdout,
-                stderr=stderr,
-                duration_ms=duration_ms,
-            )
+        Iterate the returned stream for ``OutputChunk`` items; the
+        ``ExecutionResult`` is on ``stream.result`` afterwards.
 
-        except docker_errors.ImageNotFound as e:
-            return ExecutionResult(
-                exit_code=1,
-                stdout="",
-                stderr="",
-                duration_ms=int((time.monotonic() - start_time) * 1000),
-                error=f"Docker image not found: {e}",
-            )
+        Args:
+            request: Execution request with code and language
+            container_type: Type of container (affects resource limits)
 
-        except docker_errors.APIError as e:
-            return ExecutionResult(
-                exit_code=1,
-                stdout="",
-                stderr="",
-                duration_ms=int((time.monotonic() - start_time) * 1000),
-                error=f"Docker API error: {e}",
-            )
+        Returns:
+            ExecutionStream yielding stdout/stderr chunks
+        """
+        error = self._validate(request)
 
-        except Exception as e:
-            logger.exception(f"Execution failed: {e}")
-            return ExecutionResult(
-                exit_code=1,
-                stdout="",
-                stderr="",
-                duration_ms=int((time.monotonic() - start_time) * 1000),
-                error=str(e),
+        async def start(buffer: OutputBuffer, cancel: threading.Event) -> ExecutionResult:
+            if error:
+                buffer.close()
+                return ExecutionResult(
+                    exit_code=1, stdout="", stderr="", duration_ms=0, error=error
+                )
+            return await self._run_in_executor(
+                lambda: self.backend.stream(request, container_type, buffer, cancel)
             )
 
-        finally:
-            # Cleanup container
-            if container:
-                try:
-                    container.remove(force=True)
-                    logger.debug(f"Removed container {container.id[:12]}")
-                except Exception as e:
-                    logger.warning(f"Failed to remove container: {e}")
+        return ExecutionStream(start, max_chars=settings.sandbox_stream_buffer_chars)
 
     async def run_tests(self, request: TestExecutionRequest) -> TestExecutionResult:
         """Run tests in a sandbox container.
@@ -254,63 +282,19 @@ class SandboxManager:
 
     async def stop_preview(self, container_id: str) -> bool:
         """Stop a preview container."""
-        try:
-            container = self.client.containers.get(container_id)
-            container.stop()
-            container.remove()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to stop container {container_id}: {e}")
-            return False
+        return await asyncio.to_thread(self._docker.stop_container, container_id)
 
     def get_metrics(self, container_id: str) -> Optional[ContainerMetrics]:
         """Get metrics for a running container."""
-        try:
-            container = self.client.containers.get(container_id)
-            stats = container.stats(stream=False)
-            return ContainerMetrics.from_docker_stats(container_id, stats)
-        except Exception as e:
-            logger.error(f"Failed to get metrics for {container_id}: {e}")
-            return None
+        return self._docker.get_metrics(container_id)
 
     def list_active_containers(self) -> list[dict]:
         """List all MAIOS sandbox containers."""
-        try:
-            containers = self.client.containers.list(
-                all=True,
-                filters={"label": "maios.type=sandbox"},
-            )
-            return [
-                {
-                    "id": c.id,
-                    "name": c.name,
-                    "status": c.status,
-                    "image": c.image.tags[0] if c.image.tags else c.image.id,
-                    "labels": c.labels,
-                }
-                for c in containers
-            ]
-        except Exception as e:
-            logger.error(f"Failed to list containers: {e}")
-            return []
+        return self._docker.list_containers()
 
     def cleanup_all(self) -> int:
         """Remove all MAIOS sandbox containers."""
-        count = 0
-        try:
-            containers = self.client.containers.list(
-                all=True,
-                filters={"label": "maios.type=sandbox"},
-            )
-            for container in containers:
-                try:
-                    container.remove(force=True)
-                    count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to remove container {container.id}: {e}")
-        except Exception as e:
-            logger.error(f"Failed to cleanup containers: {e}")
-        return count
+        return self._docker.cleanup_all()
 
 
 # Global sandbox manager instance
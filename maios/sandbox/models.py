@@ -52,6 +52,14 @@ class ExecutionResult(BaseModel):
         return self.exit_code == 0 and not self.error
 
 
+class OutputChunk(BaseModel):
+    """A piece of output from a streaming execution."""
+
+    stream: str  # stdout or stderr
+    data: str
+    seq: int
+
+
 class TestExecutionRequest(BaseModel):
     """Request to run tests in sandbox."""
 
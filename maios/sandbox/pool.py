@@ -0,0 +1,262 @@
+# maios/sandbox/pool.py
+"""Warm container pool for sandbox execution.
+
+Containers are created and started ahead of time with an idle command, and
+a snippet runs in one via ``exec``, taking container startup off the
+request path. Pools are keyed by (language, ContainerType). Each container
+runs exactly one snippet: files, root filesystem writes and processes a
+snippet leaves behind must never reach the next one, which may come from
+another agent or project. Released containers are removed by the
+maintenance thread, which also keeps each key topped up to ``min_size``
+idle containers and drops idle ones past the TTL.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from maios.sandbox.models import ContainerType
+
+logger = logging.getLogger(__name__)
+
+PoolKey = tuple[str, ContainerType]
+
+# Seconds between maintenance passes when nothing wakes the thread earlier
+MAINTENANCE_INTERVAL_SECONDS = 5.0
+
+
+@dataclass
+class PooledContainer:
+    """A warm container and its usage bookkeeping."""
+
+    container: Any
+    key: PoolKey
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ContainerPool:
+    """Pool of pre-started containers per (language, ContainerType).
+
+    All methods are blocking and thread-safe; call them from the sandbox
+    executor, not the event loop.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[PoolKey], Any],
+        min_size: int = 1,
+        max_size: int = 4,
+        idle_ttl_seconds: float = 300.0,
+    ):
+        """Create a pool.
+
+        Args:
+            factory: Creates and starts a warm container for a key
+            min_size: Idle containers kept ready per key once the key is used
+            max_size: Containers (idle plus busy) allowed per key
+            idle_ttl_seconds: Idle time before a container beyond min_size is removed
+        """
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_ttl_seconds = idle_ttl_seconds
+
+        self._lock = threading.Lock()
+        self._idle: dict[PoolKey, deque[PooledContainer]] = {}
+        self._busy: dict[PoolKey, int] = {}
+        self._creating: dict[PoolKey, int] = {}
+        # Used containers awaiting removal by the maintenance thread
+        self._retired: list[PooledContainer] = []
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "exhausted": 0,
+            "created": 0,
+            "create_errors": 0,
+            "recycled": 0,
+            "evicted_idle": 0,
+        }
+
+    def _incr(self, counter: str) -> None:
+        self._counters[counter] += 1
+
+    def _size(self, key: PoolKey) -> int:
+        return len(self._idle.get(key, ())) + self._busy.get(key, 0) + self._creating.get(key, 0)
+
+    def acquire(self, key: PoolKey) -> Optional[PooledContainer]:
+        """Take an idle container, creating one if the key has room.
+
+        Returns:
+            A container marked busy, or None if the key is at max_size
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            self._idle.setdefault(key, deque())
+            self._busy.setdefault(key, 0)
+            self._ensure_thread()
+
+            if self._idle[key]:
+                pooled = self._idle[key].pop()
+                self._busy[key] += 1
+                self._incr("hits")
+                self._wake.set()
+                return pooled
+
+            if self._size(key) >= self.max_size:
+                self._incr("exhausted")
+                return None
+
+            self._incr("misses")
+            self._creating[key] = self._creating.get(key, 0) + 1
+
+        try:
+            pooled = self._create(key)
+        finally:
+            with self._lock:
+                self._creating[key] -= 1
+
+        if pooled is None:
+            return None
+        with self._lock:
+            self._busy[key] += 1
+        self._wake.set()
+        return pooled
+
+    def release(self, pooled: PooledContainer) -> None:
+        """Retire a container after its run; it is never handed out again."""
+        with self._lock:
+            self._busy[pooled.key] -= 1
+            self._incr("recycled")
+            if not self._closed:
+                self._retired.append(pooled)
+                self._wake.set()
+                return
+
+        self._remove(pooled)
+
+    def _create(self, key: PoolKey) -> Optional[PooledContainer]:
+        try:
+            container = self._factory(key)
+        except Exception as e:
+            logger.warning(f"Failed to create warm {key[0]} container: {e}")
+            with self._lock:
+                self._incr("create_errors")
+            return None
+
+        with self._lock:
+            self._incr("created")
+        return PooledContainer(container=container, key=key)
+
+    def _remove(self, pooled: PooledContainer) -> None:
+        try:
+            pooled.container.remove(force=True)
+        except Exception as e:
+            logger.warning(f"Failed to remove pooled container: {e}")
+
+    def maintain(self) -> None:
+        """Remove used containers, evict idle ones past the TTL and top up to min_size."""
+        now = time.monotonic()
+        to_create: list[PoolKey] = []
+
+        with self._lock:
+            if self._closed:
+                return
+            expired, self._retired = self._retired, []
+            for key, idle in self._idle.items():
+                keep: deque[PooledContainer] = deque()
+                for pooled in idle:
+                    idle_for = now - pooled.last_used
+                    if len(keep) >= self.min_size and idle_for > self.idle_ttl_seconds:
+                        expired.append(pooled)
+                        self._incr("evicted_idle")
+                    else:
+                        keep.append(pooled)
+                self._idle[key] = keep
+
+                missing = min(
+                    self.min_size - len(keep) - self._creating.get(key, 0),
+                    self.max_size - self._size(key),
+                )
+                for _ in range(max(missing, 0)):
+                    self._creating[key] = self._creating.get(key, 0) + 1
+                    to_create.append(key)
+
+        for pooled in expired:
+            self._remove(pooled)
+
+        for key in to_create:
+            pooled = self._create(key)
+            with self._lock:
+                self._creating[key] -= 1
+                if pooled is not None and not self._closed:
+                    self._idle[key].append(pooled)
+                    continue
+            if pooled is not None:
+                self._remove(pooled)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._maintenance_loop, name="maios-sandbox-pool", daemon=True
+            )
+            self._thread.start()
+
+    def _maintenance_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(MAINTENANCE_INTERVAL_SECONDS)
+            self._wake.clear()
+            try:
+                self.maintain()
+            except Exception as e:
+                logger.error(f"Sandbox pool maintenance failed: {e}")
+
+    def warm(self, keys: list[PoolKey]) -> None:
+        """Register keys and fill them to min_size now."""
+        with self._lock:
+            for key in keys:
+                self._idle.setdefault(key, deque())
+                self._busy.setdefault(key, 0)
+        self.maintain()
+
+    def close(self) -> None:
+        """Remove all idle and used containers and stop pooling.
+
+        Busy containers are removed when released.
+        """
+        with self._lock:
+            self._closed = True
+            idle = [pooled for queue in self._idle.values() for pooled in queue]
+            idle.extend(self._retired)
+            self._idle.clear()
+            self._retired.clear()
+        self._wake.set()
+        for pooled in idle:
+            self._remove(pooled)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return pool sizes and counters as a JSON-serializable dict."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "idle_ttl_seconds": self.idle_ttl_seconds,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                **self._counters,
+                "keys": {
+                    f"{language}:{container_type.value}": {
+                        "idle": len(self._idle.get((language, container_type), ())),
+                        "busy": self._busy.get((language, container_type), 0),
+                    }
+                    for language, container_type in self._busy
+                },
+            }
@@ -0,0 +1,160 @@
+# maios/sandbox/streaming.py
+"""Streaming output for sandbox runs.
+
+The blocking producer (a container run in the sandbox executor) pushes
+decoded chunks into an ``OutputBuffer``; the event loop consumes them from
+an ``ExecutionStream``. The buffer is a size-bounded ring (measured in
+decoded characters): when the consumer falls behind, the oldest unread
+chunks are dropped and counted, so a chatty process cannot grow worker
+memory without bound.
+"""
+
+import asyncio
+import codecs
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Optional
+
+from maios.sandbox.models import ExecutionResult, OutputChunk
+
+
+class OutputTail:
+    """Keeps the last ``max_chars`` of a stream's text."""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._parts: deque[str] = deque()
+        self._size = 0
+
+    def append(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        # Drop whole parts only while the rest still covers max_chars
+        while self._size - len(self._parts[0]) >= self.max_chars:
+            self._size -= len(self._parts.popleft())
+
+    def text(self) -> str:
+        return "".join(self._parts)[-self.max_chars:]
+
+
+class OutputBuffer:
+    """Bounded, thread-safe ring buffer of output chunks.
+
+    ``push`` and ``close`` are called from the producer thread; ``get`` is
+    awaited on the event loop that created the buffer.
+    """
+
+    def __init__(self, max_chars: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.max_chars = max_chars
+        self.dropped_chars = 0
+        self.dropped_chunks = 0
+        self._loop = loop or asyncio.get_running_loop()
+        self._chunks: deque[OutputChunk] = deque()
+        self._size = 0
+        self._seq = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._ready = asyncio.Event()
+        self._decoders = {
+            stream: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for stream in ("stdout", "stderr")
+        }
+        self.tails = {stream: OutputTail(max_chars) for stream in ("stdout", "stderr")}
+
+    def push(self, stream: str, data: bytes) -> None:
+        """Decode and enqueue a chunk, evicting the oldest if over capacity."""
+        self._append(stream, self._decoders[stream].decode(data))
+
+    def close(self) -> None:
+        """Mark the producer finished."""
+        for stream, decoder in self._decoders.items():
+            self._append(stream, decoder.decode(b"", final=True))
+        with self._lock:
+            self._closed = True
+        self._wake()
+
+    def _append(self, stream: str, text: str) -> None:
+        if not text:
+            return
+
+        with self._lock:
+            self.tails[stream].append(text)
+            self._chunks.append(OutputChunk(stream=stream, data=text, seq=self._seq))
+            self._seq += 1
+            self._size += len(text)
+            while self._size > self.max_chars and len(self._chunks) > 1:
+                evicted = self._chunks.popleft()
+                self._size -= len(evicted.data)
+                self.dropped_chars += len(evicted.data)
+                self.dropped_chunks += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            pass  # Loop already closed; nobody is waiting
+
+    async def get(self) -> Optional[OutputChunk]:
+        """Wait for the next chunk, or None once the producer is done."""
+        while True:
+            with self._lock:
+                if self._chunks:
+                    chunk = self._chunks.popleft()
+                    self._size -= len(chunk.data)
+                    return chunk
+                if self._closed:
+                    return None
+                self._ready.clear()
+            await self._ready.wait()
+
+
+class ExecutionStream:
+    """Async iterator over a sandbox run's output chunks.
+
+    The final ``ExecutionResult`` is available as ``result`` once iteration
+    ends. Its stdout/stderr hold the last ``max_chars`` of each stream.
+    Leaving iteration early (or calling ``aclose``) stops the run at its
+    next output chunk; a silent run is stopped by its timeout.
+    """
+
+    def __init__(
+        self,
+        start: Callable[[OutputBuffer, threading.Event], Awaitable[ExecutionResult]],
+        max_chars: int,
+    ):
+        self._start = start
+        self._max_chars = max_chars
+        self._buffer: Optional[OutputBuffer] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancel = threading.Event()
+        self.result: Optional[ExecutionResult] = None
+
+    @property
+    def dropped_chars(self) -> int:
+        """Characters discarded because the consumer fell behind."""
+        return self._buffer.dropped_chars if self._buffer else 0
+
+    def __aiter__(self) -> AsyncIterator[OutputChunk]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[OutputChunk]:
+        self._buffer = OutputBuffer(self._max_chars)
+        self._task = asyncio.create_task(self._start(self._buffer, self._cancel))
+        try:
+            while (chunk := await self._buffer.get()) is not None:
+                yield chunk
+            self.result = await self._task
+        finally:
+            if self.result is None:
+                await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop the run and wait for its container to be released."""
+        self._cancel.set()
+        if self._task is not None:
+            try:
+                self.result = await asyncio.shield(self._task)
+            except Exception:
+                pass
@@ -1,4 +1,5 @@
 # maios/skills/builtin/execute_code.py
+import asyncio
 import logging
 from typing import Any
 
@@ -54,7 +55,7 @@ class ExecuteCodeSkill(BaseSkill):
             }
 
         # Check if sandbox is available
-        if not sandbox_manager.is_healthy():
+        if not await asyncio.to_thread(sandbox_manager.is_healthy):
             logger.warning("Docker sandbox not available, returning placeholder response")
             return {
                 "status": "unavailable",
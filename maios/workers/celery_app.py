@@ -1,42 +1,97 @@
 # maios/workers/celery_app.py
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import (
+    task_postrun,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 
 from maios.core.config import settings
-from maios.workers.heartbeat_config import heartbeat_config
+
+
+class CeleryConfig:
+    """Celery configuration, resolved from settings when the app is first configured.
+
+    Broker URLs and the beat schedule are properties so that importing this
+    module (e.g. from ``maios.workers.tasks``) does not load settings.
+    """
+
+    task_serializer = "json"
+    accept_content = ["json"]
+    result_serializer = "json"
+    timezone = "UTC"
+    enable_utc = True
+    task_track_started = True
+    task_time_limit = 3600  # 1 hour hard limit
+    task_soft_time_limit = 3300  # 55 minutes soft limit
+    worker_prefetch_multiplier = 1
+    task_acks_late = True
+
+    @property
+    def broker_url(self) -> str:
+        return settings.redis_url
+
+    @property
+    def result_backend(self) -> str:
+        return settings.redis_url
+
+    @property
+    def beat_schedule(self) -> dict:
+        """Beat schedule for periodic tasks (uses configurable intervals)."""
+        from maios.workers.heartbeat_config import heartbeat_config
+
+        return {
+            "heartbeat-check": {
+                "task": "maios.workers.heartbeat.run_health_checks",
+                "schedule": heartbeat_config.interval_minutes * 60.0,  # Convert minutes to seconds
+            },
+            "daily-summary": {
+                "task": "maios.workers.heartbeat.generate_daily_summary",
+                "schedule": crontab(hour=9, minute=0),  # 9 AM UTC daily
+            },
+            "embed-memories": {
+                "task": "maios.workers.memory.embed_pending_memories",
+                "schedule": settings.memory_embedding_interval_seconds,
+            },
+            "consolidate-memories": {
+                "task": "maios.workers.memory.consolidate_memories",
+                "schedule": settings.memory_consolidation_interval_seconds,
+            },
+        }
+
 
 app = Celery(
     "maios",
-    broker=settings.redis_url,
-    backend=settings.redis_url,
     include=[
         "maios.workers.tasks",
         "maios.workers.heartbeat",
+        "maios.workers.memory",
     ],
 )
+app.config_from_object(CeleryConfig())
+
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """Drop pooled connections inherited from the parent after a prefork."""
+    from maios.core.database import reset_engine_after_fork
+
+    reset_engine_after_fork()
+
+
+@task_postrun.connect
+def flush_memory_accesses(**kwargs):
+    """Write memory accesses a task buffered; the worker loop is idle between tasks."""
+    from maios.core.memory.access import flush_access_trackers
+    from maios.workers.event_loop import run_async
+
+    run_async(flush_access_trackers())
 
-# Configuration
-app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
-    timezone="UTC",
-    enable_utc=True,
-    task_track_started=True,
-    task_time_limit=3600,  # 1 hour hard limit
-    task_soft_time_limit=3300,  # 55 minutes soft limit
-    worker_prefetch_multiplier=1,
-    task_acks_late=True,
-)
 
-# Beat schedule for periodic tasks (uses configurable intervals)
-app.conf.beat_schedule = {
-    "heartbeat-check": {
-        "task": "maios.workers.heartbeat.run_health_checks",
-        "schedule": heartbeat_config.interval_minutes * 60.0,  # Convert minutes to seconds
-    },
-    "daily-summary": {
-        "task": "maios.workers.heartbeat.generate_daily_summary",
-        "schedule": crontab(hour=9, minute=0),  # 9 AM UTC daily
-    },
-}
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_memory_accesses_on_shutdown(**kwargs):
+    """Write buffered memory accesses before a worker process exits or is recycled."""
+    flush_memory_accesses()
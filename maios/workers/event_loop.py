@@ -0,0 +1,43 @@
+"""Persistent event loop for running async code from Celery tasks."""
+
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Seconds run_async waits for background work a coroutine left running
+PENDING_TASK_TIMEOUT_SECONDS = 10.0
+
+_local = threading.local()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get this thread's worker event loop, creating it if necessary.
+
+    Pooled database connections are bound to the loop that opened them, so
+    tasks must share one loop per worker thread instead of calling
+    ``asyncio.run`` (which creates and closes a loop every time).
+    """
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _local.loop = loop
+    return loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the worker event loop.
+
+    The loop only runs during these calls, so background tasks the
+    coroutine started (such as cache invalidations scheduled on commit) are
+    given time to finish before returning.
+    """
+    loop = get_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        pending = asyncio.all_tasks(loop)
+        if pending:
+            loop.run_until_complete(asyncio.wait(pending, timeout=PENDING_TASK_TIMEOUT_SECONDS))
@@ -9,6 +9,7 @@ from celery import shared_task
 from sqlalchemy import func, select
 
 from maios.core.config import settings
+from maios.workers.event_loop import run_async
 from maios.workers.heartbeat_config import heartbeat_config
 
 logger = logging.getLogger(__name__)
@@ -256,7 +257,7 @@ def run_health_checks_task():
     """
     logger.info("Starting health check task...")
 
-    result = asyncio.run(run_all_health_checks())
+    result = run_async(run_all_health_checks())
 
     logger.info(f"Health check task completed: {result['status']}")
     return result
@@ -268,8 +269,6 @@ def generate_daily_summary():
 
     Collects statistics on agents and tasks for the daily report.
     """
-    import asyncio
-
     async def _generate():
         from maios.core.database import async_session
         from maios.models.agent import Agent
@@ -327,4 +326,4 @@ def generate_daily_summary():
             logger.info(f"Daily summary generated: {summary}")
             return summary
 
-    return asyncio.run(_generate())
+    return run_async(_generate())
@@ -0,0 +1,108 @@
+"""Celery tasks for memory maintenance."""
+
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from celery import shared_task
+
+from maios.core.database import async_session
+from maios.core.redis import get_redis_client
+from maios.workers.event_loop import run_async
+
+logger = logging.getLogger(__name__)
+
+# Held while an embedding run is in progress so beat ticks never overlap
+EMBEDDING_LOCK_KEY = "maios:memory:embedding-lock"
+
+# Held while a consolidation run is in progress
+CONSOLIDATION_LOCK_KEY = "maios:memory:consolidation-lock"
+
+# Lock expiry; matches the Celery hard time limit so a killed run cannot wedge it
+EMBEDDING_LOCK_TIMEOUT_SECONDS = 3600
+CONSOLIDATION_LOCK_TIMEOUT_SECONDS = 3600
+
+
+async def _run_exclusive(
+    lock_key: str,
+    timeout: int,
+    name: str,
+    run: Callable[[], Awaitable[Any]],
+) -> dict[str, Any]:
+    """Run a maintenance job unless another worker holds its lock.
+
+    Args:
+        lock_key: Redis lock guarding the job
+        timeout: Lock expiry in seconds
+        name: Job name for log and status messages
+        run: Starts the job; returns stats with a ``snapshot()`` method
+    """
+    lock = get_redis_client().lock(lock_key, timeout=timeout)
+    try:
+        acquired = await lock.acquire(blocking=False)
+    except Exception as e:
+        # Without Redis there is no coordination; a single worker is still safe
+        logger.warning(f"{name.capitalize()} lock unavailable, running unlocked: {e}")
+        lock, acquired = None, True
+
+    if not acquired:
+        return {"status": "skipped", "reason": f"{name.capitalize()} run already in progress"}
+
+    try:
+        stats = await run()
+    finally:
+        if lock is not None:
+            try:
+                await lock.release()
+            except Exception as e:
+                logger.warning(f"Failed to release {name} lock: {e}")
+
+    return {"status": "ok", **stats.snapshot()}
+
+
+async def run_embedding_pipeline() -> dict[str, Any]:
+    """Run one embedding pass unless another worker is already running one."""
+    from maios.core.memory.pipeline import EmbeddingPipeline
+
+    return await _run_exclusive(
+        EMBEDDING_LOCK_KEY,
+        EMBEDDING_LOCK_TIMEOUT_SECONDS,
+        "embedding",
+        lambda: EmbeddingPipeline(async_session).run(),
+    )
+
+
+async def run_memory_consolidation() -> dict[str, Any]:
+    """Run one consolidation pass unless another worker is already running one."""
+    from maios.core.memory.consolidation import MemoryConsolidator
+
+    return await _run_exclusive(
+        CONSOLIDATION_LOCK_KEY,
+        CONSOLIDATION_LOCK_TIMEOUT_SECONDS,
+        "consolidation",
+        lambda: MemoryConsolidator(async_session).run(),
+    )
+
+
+@shared_task(name="maios.workers.memory.embed_pending_memories")
+def embed_pending_memories() -> dict[str, Any]:
+    """Celery task embedding memories that have no embedding yet.
+
+    Scheduled by Celery Beat; each run handles at most
+    ``settings.memory_embedding_max_batches`` batches.
+    """
+    result = run_async(run_embedding_pipeline())
+    logger.info(f"Memory embedding task completed: {result}")
+    return result
+
+
+@shared_task(name="maios.workers.memory.consolidate_memories")
+def consolidate_memories() -> dict[str, Any]:
+    """Celery task deduplicating, decaying, summarizing and pruning memories.
+
+    Scheduled by Celery Beat every
+    ``settings.memory_consolidation_interval_seconds``.
+    """
+    result = run_async(run_memory_consolidation())
+    logger.info(f"Memory consolidation task completed: {result}")
+    return result
@@ -1,6 +1,5 @@
 """Celery tasks for MAIOS."""
 
-import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Optional
@@ -10,10 +9,12 @@ from celery import shared_task
 from sqlalchemy import select
 
 from maios.core.agent_runtime import AgentRuntime
+from maios.core.cache import entity_cache
 from maios.core.database import async_session
 from maios.models.agent import Agent, AgentStatus
 from maios.models.task import Task, TaskStatus
 from maios.workers.celery_app import app
+from maios.workers.event_loop import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ def execute_agent_task(self, task_id: str) -> dict:
     Returns:
         dict with status and result
     """
-    return asyncio.run(_execute_agent_task_async(task_id, self))
+    return run_async(_execute_agent_task_async(task_id, self))
 
 
 async def _execute_agent_task_async(task_id: str, celery_task=None) -> dict:
@@ -84,6 +85,7 @@ async def _execute_agent_task_async(task_id: str, celery_task=None) -> dict:
         task.started_at = datetime.now(timezone.utc)
         agent.status = AgentStatus.WORKING
         await session.commit()
+        await entity_cache.invalidate(Agent, agent.id)
 
         try:
             # 6. Execute using AgentRuntime
@@ -115,6 +117,7 @@ async def _execute_agent_task_async(task_id: str, celery_task=None) -> dict:
             agent.status = AgentStatus.IDLE
             agent.tasks_completed += 1
             await session.commit()
+            await entity_cache.invalidate(Agent, agent.id)
 
             logger.info(f"Task {task_id} completed successfully")
             return {"status": "completed", "task_id": task_id}
@@ -128,6 +131,7 @@ async def _execute_agent_task_async(task_id: str, celery_task=None) -> dict:
             agent.status = AgentStatus.IDLE
             agent.tasks_failed += 1
             await session.commit()
+            await entity_cache.invalidate(Agent, agent.id)
 
             # Retry if under limit and celery_task is available
             if celery_task and task.retry_count < task.max_retries:
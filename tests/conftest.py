@@ -48,6 +48,10 @@ def setup_test_env():
         "ZAI_API_KEY": "test-api-key",
         "DATABASE_URL": "postgresql://localhost:5432/maios_test",
         "REDIS_URL": "redis://localhost:6379/0",
+        # Memory query results must not leak between tests through a real Redis
+        "MEMORY_QUERY_CACHE_TTL_SECONDS": "0",
+        # CI opts into the namespace sandbox when there is no Docker daemon
+        "SANDBOX_BACKEND": "auto",
     }
 
     original_env = {}
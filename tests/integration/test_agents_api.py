@@ -307,3 +307,65 @@ async def test_update_agent_not_found(client, mock_session):
     data = response.json()
     assert "detail" in data
     assert data["detail"] == "Agent not found"
+
+
+@pytest.fixture
+def fake_cache():
+    """Route the entity cache to an in-memory Redis fake."""
+    from maios.core.cache import EntityCache
+    from tests.unit.test_cache import FakeRedis
+
+    redis = FakeRedis()
+    cache = EntityCache()
+    with patch("maios.core.cache.get_redis_client", return_value=redis), patch(
+        "maios.api.routes.agents.entity_cache", cache
+    ):
+        yield cache
+
+
+@pytest.mark.asyncio
+async def test_get_agent_served_from_cache(client, mock_session, mock_agent, fake_cache):
+    """Test a second read is served from cache without touching the database."""
+    mock_session.get = AsyncMock(return_value=mock_agent)
+
+    first = await client.get(f"/api/agents/{mock_agent.id}")
+    second = await client.get(f"/api/agents/{mock_agent.id}")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    mock_session.get.assert_awaited_once()
+    assert fake_cache.stats.snapshot()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_agent_no_cache_header_bypasses_cache(
+    client, mock_session, mock_agent, fake_cache
+):
+    """Test Cache-Control: no-cache forces a database read."""
+    mock_session.get = AsyncMock(return_value=mock_agent)
+
+    await client.get(f"/api/agents/{mock_agent.id}")
+    response = await client.get(
+        f"/api/agents/{mock_agent.id}", headers={"Cache-Control": "no-cache"}
+    )
+
+    assert response.status_code == 200
+    assert mock_session.get.await_count == 2
+    assert fake_cache.stats.snapshot()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_update_agent_invalidates_cache(client, mock_session, mock_agent, fake_cache):
+    """Test PATCH drops the cached entry so the next read sees the change."""
+    mock_session.get = AsyncMock(return_value=mock_agent)
+    mock_session.add = MagicMock()
+    mock_session.commit = AsyncMock()
+    mock_session.refresh = AsyncMock()
+
+    await client.get(f"/api/agents/{mock_agent.id}")
+    await client.patch(f"/api/agents/{mock_agent.id}", json={"name": "Renamed"})
+    response = await client.get(f"/api/agents/{mock_agent.id}")
+
+    assert response.json()["name"] == "Renamed"
+    assert mock_session.get.await_count == 3
+    assert fake_cache.stats.snapshot()["invalidations"] == 1
@@ -0,0 +1,280 @@
+# tests/integration/test_batch_api.py
+"""Integration tests for the batch create/update endpoints."""
+
+import os
+from uuid import UUID, uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+# Set up test environment before importing app
+os.environ.setdefault("ZAI_API_KEY", "test-api-key")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost:5432/maios_test")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+from maios.api.batch import MAX_BATCH_SIZE
+from maios.api.main import app
+from maios.models import Agent, Project, Task
+
+
+@pytest.fixture
+async def db_engine():
+    """Create an in-memory SQLite database with the agent, project and task tables."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            SQLModel.metadata.create_all,
+            tables=[Agent.__table__, Project.__table__, Task.__table__],
+        )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(db_engine):
+    """Create an async test client backed by the SQLite database."""
+    session_factory = async_sessionmaker(
+        db_engine, class_=SQLModelAsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    from maios.core.database import get_session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+def _count_inserts(engine) -> list[str]:
+    """Record INSERT statements executed on an engine."""
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_create_agents_batch_single_insert(client, db_engine):
+    """Test a batch of agents is persisted with one INSERT statement."""
+    inserts = _count_inserts(db_engine)
+    payload = [
+        {"name": f"Agent {i}", "role": "Developer", "persona": "Helpful"} for i in range(200)
+    ]
+
+    response = await client.post("/api/agents/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 200
+    assert data["errors"] == []
+    assert [a["name"] for a in data["items"]] == [p["name"] for p in payload]
+    assert len(inserts) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_agents_batch_reports_item_errors(client):
+    """Test invalid items are reported by index without failing the batch."""
+    payload = [
+        {"name": "Good", "role": "Developer", "persona": "Helpful"},
+        {"role": "Developer", "persona": "Missing name"},
+        {"name": "", "role": "Developer", "persona": "Empty name"},
+        {"name": "Also good", "role": "Reviewer", "persona": "Careful"},
+    ]
+
+    response = await client.post("/api/agents/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["name"] for a in data["items"]] == ["Good", "Also good"]
+    assert [e["index"] for e in data["errors"]] == [1, 2]
+    assert "name" in data["errors"][0]["error"]
+
+
+@pytest.mark.asyncio
+async def test_create_batch_rejects_oversized_request(client):
+    """Test batches above the size limit are rejected outright."""
+    payload = [{"name": "p"}] * (MAX_BATCH_SIZE + 1)
+
+    response = await client.post("/api/projects/batch", json=payload)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_update_agents_batch(client):
+    """Test batch update applies changes and reports unknown or duplicate IDs."""
+    created = await client.post(
+        "/api/agents/batch",
+        json=[{"name": f"Agent {i}", "role": "Developer", "persona": "p"} for i in range(2)],
+    )
+    first, second = created.json()["items"]
+    unknown = str(uuid4())
+
+    response = await client.patch(
+        "/api/agents/batch",
+        json=[
+            {"id": first["id"], "name": "Renamed"},
+            {"id": unknown, "name": "Ghost"},
+            {"id": second["id"], "status": "working"},
+            {"id": first["id"], "role": "Duplicate"},
+            {"name": "No id"},
+        ],
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [(a["id"], a["name"], a["status"]) for a in data["items"]] == [
+        (first["id"], "Renamed", "idle"),
+        (second["id"], "Agent 1", "working"),
+    ]
+    errors = {e["index"]: e["error"] for e in data["errors"]}
+    assert errors[1] == "Agent not found"
+    assert errors[3] == "Duplicate id in batch"
+    assert 4 in errors
+
+
+@pytest.mark.asyncio
+async def test_create_and_update_projects_batch(client):
+    """Test batch endpoints for projects."""
+    created = await client.post(
+        "/api/projects/batch",
+        json=[{"name": "Alpha", "tech_stack": ["python"]}, {"name": "Beta"}],
+    )
+    assert created.status_code == 200
+    alpha, beta = created.json()["items"]
+    assert alpha["tech_stack"] == ["python"]
+
+    response = await client.patch(
+        "/api/projects/batch",
+        json=[{"id": beta["id"], "status": "active", "description": "Now active"}],
+    )
+
+    assert response.status_code == 200
+    (updated,) = response.json()["items"]
+    assert updated["status"] == "active"
+    assert updated["description"] == "Now active"
+
+
+@pytest.mark.asyncio
+async def test_tasks_batch_checks_references(client):
+    """Test task batches reject dangling project and agent references per item."""
+    project = (await client.post("/api/projects/batch", json=[{"name": "P"}])).json()["items"][0]
+
+    response = await client.post(
+        "/api/tasks/batch",
+        json=[
+            {"title": "Design", "project_id": project["id"]},
+            {"title": "Orphan", "project_id": str(uuid4())},
+            {"title": "Build", "project_id": project["id"], "assigned_agent_id": str(uuid4())},
+            {"title": "Test", "project_id": project["id"], "priority": "high"},
+        ],
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["title"] for t in data["items"]] == ["Design", "Test"]
+    assert data["items"][1]["priority"] == "high"
+    assert {e["index"]: e["error"] for e in data["errors"]} == {
+        1: "Project not found",
+        2: "Agent not found",
+    }
+
+    design = data["items"][0]
+    response = await client.patch(
+        "/api/tasks/batch",
+        json=[{"id": design["id"], "status": "in_progress", "progress_percent": 40}],
+    )
+
+    assert response.status_code == 200
+    (updated,) = response.json()["items"]
+    assert updated["status"] == "in_progress"
+    assert updated["progress_percent"] == 40
+
+
+@pytest.fixture
+async def memory_client(db_engine):
+    """Test client whose database also has the memoryentry table."""
+    from maios.models.memory import MemoryEntry
+
+    async with db_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all, tables=[MemoryEntry.__table__])
+
+    session_factory = async_sessionmaker(
+        db_engine, class_=SQLModelAsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    from maios.core.database import get_session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client, session_factory
+
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_store_memories_batch_single_insert(memory_client, db_engine):
+    """Test a batch of memories is stored with one INSERT and returns ids in order."""
+    from maios.models.memory import MemoryEntry
+
+    client, session_factory = memory_client
+    inserts = _count_inserts(db_engine)
+    agent_id = str(uuid4())
+    payload = [
+        {"content": f"Step {i} observation", "agent_id": agent_id, "tags": ["Step"]}
+        for i in range(300)
+    ]
+
+    response = await client.post("/api/memories/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["ids"]) == 300
+    assert data["errors"] == []
+    # FTS triggers insert into memoryentry_fts; only count the table insert
+    assert len([s for s in inserts if "INTO memoryentry " in s]) == 1
+
+    async with session_factory() as session:
+        first = await session.get(MemoryEntry, UUID(data["ids"][0]))
+        last = await session.get(MemoryEntry, UUID(data["ids"][-1]))
+    assert first.content == "Step 0 observation"
+    assert last.content == "Step 299 observation"
+    assert first.tags == ["step"]
+
+
+@pytest.mark.asyncio
+async def test_store_memories_batch_reports_invalid_items(memory_client):
+    """Test invalid memories are reported by index while the rest are stored."""
+    client, _ = memory_client
+    payload = [
+        {"content": "Valid"},
+        {"content": ""},
+        {"content": "Bad importance", "importance": 3},
+        {"content": "Also valid", "memory_type": "semantic"},
+    ]
+
+    response = await client.post("/api/memories/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["ids"]) == 2
+    assert [e["index"] for e in data["errors"]] == [1, 2]
@@ -43,6 +43,27 @@ class TestSystemHealthEndpoint:
         assert data["components"]["docker"]["status"] == "healthy"
 
 
+class TestDatabaseHealthEndpoint:
+    """Tests for /api/health/database endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_database_health_reports_pool(self):
+        """Test database health endpoint reports connection pool stats."""
+        from maios.api.main import app
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/api/health/database")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "timestamp" in data
+        pool = data["pool"]
+        assert pool["type"] == "InstrumentedQueuePool"
+        assert pool["role"] == "api"
+        assert "saturation" in pool
+        assert "avg_wait_ms" in pool
+
+
 class TestTaskHealthEndpoint:
     """Tests for /api/health/tasks endpoint."""
 
@@ -58,11 +79,11 @@ class TestTaskHealthEndpoint:
         mock_result = MagicMock()
         mock_result.all.return_value = []  # Empty status counts
 
-        # Mock the execute result for active count
-        mock_count_result = MagicMock()
-        mock_count_result.scalar.return_value = 0
+        # Mock the execute result for the agent group by query
+        mock_agent_result = MagicMock()
+        mock_agent_result.all.return_value = []
 
-        mock_session.execute.side_effect = [mock_result, mock_count_result]
+        mock_session.execute.side_effect = [mock_result, mock_agent_result]
 
         with patch("maios.api.routes.health_detailed.async_session") as mock_async_session:
             mock_async_session.return_value.__aenter__.return_value = mock_session
@@ -92,11 +113,11 @@ class TestTaskHealthEndpoint:
             (TaskStatus.PENDING, 2),
         ]
 
-        # Mock active count
-        mock_count_result = MagicMock()
-        mock_count_result.scalar.return_value = 2
+        # Mock agent group by result
+        mock_agent_result = MagicMock()
+        mock_agent_result.all.return_value = []
 
-        mock_session.execute.side_effect = [mock_result, mock_count_result]
+        mock_session.execute.side_effect = [mock_result, mock_agent_result]
 
         with patch("maios.api.routes.health_detailed.async_session") as mock_async_session:
             mock_async_session.return_value.__aenter__.return_value = mock_session
@@ -121,19 +142,15 @@ class TestAgentHealthEndpoint:
 
         mock_session = AsyncMock()
 
-        # Mock group by result
+        # Mock task group by result
+        mock_task_result = MagicMock()
+        mock_task_result.all.return_value = []
+
+        # Mock agent group by result
         mock_result = MagicMock()
         mock_result.all.return_value = []
 
-        # Mock working count
-        mock_working_result = MagicMock()
-        mock_working_result.scalar.return_value = 0
-
-        # Mock total count
-        mock_total_result = MagicMock()
-        mock_total_result.scalar.return_value = 0
-
-        mock_session.execute.side_effect = [mock_result, mock_working_result, mock_total_result]
+        mock_session.execute.side_effect = [mock_task_result, mock_result]
 
         with patch("maios.api.routes.health_detailed.async_session") as mock_async_session:
             mock_async_session.return_value.__aenter__.return_value = mock_session
@@ -156,22 +173,18 @@ class TestAgentHealthEndpoint:
 
         mock_session = AsyncMock()
 
-        # Mock group by result
+        # Mock task group by result
+        mock_task_result = MagicMock()
+        mock_task_result.all.return_value = []
+
+        # Mock agent group by result (status, count, completed, failed)
         mock_result = MagicMock()
         mock_result.all.return_value = [
-            (AgentStatus.IDLE, 3),
-            (AgentStatus.WORKING, 1),
+            (AgentStatus.IDLE, 3, 10, 1),
+            (AgentStatus.WORKING, 1, 2, 0),
         ]
 
-        # Mock working count
-        mock_working_result = MagicMock()
-        mock_working_result.scalar.return_value = 1
-
-        # Mock total count
-        mock_total_result = MagicMock()
-        mock_total_result.scalar.return_value = 4
-
-        mock_session.execute.side_effect = [mock_result, mock_working_result, mock_total_result]
+        mock_session.execute.side_effect = [mock_task_result, mock_result]
 
         with patch("maios.api.routes.health_detailed.async_session") as mock_async_session:
             mock_async_session.return_value.__aenter__.return_value = mock_session
@@ -238,9 +251,9 @@ class TestSystemMetricsEndpoint:
         mock_task_result = MagicMock()
         mock_task_result.all.return_value = []
 
-        # Mock agent aggregate result
+        # Mock agent group by result
         mock_agent_result = MagicMock()
-        mock_agent_result.one.return_value = MagicMock(total=0, completed=0, failed=0)
+        mock_agent_result.all.return_value = []
 
         mock_session.execute.side_effect = [mock_task_result, mock_agent_result]
 
@@ -271,9 +284,9 @@ class TestSystemMetricsEndpoint:
         mock_task_result = MagicMock()
         mock_task_result.all.return_value = []
 
-        # Mock agent aggregate result
+        # Mock agent group by result
         mock_agent_result = MagicMock()
-        mock_agent_result.one.return_value = MagicMock(total=0, completed=0, failed=0)
+        mock_agent_result.all.return_value = []
 
         mock_session.execute.side_effect = [mock_task_result, mock_agent_result]
 
@@ -292,6 +305,7 @@ class TestSystemMetricsEndpoint:
     async def test_metrics_includes_agent_stats(self):
         """Test metrics includes agent statistics."""
         from maios.api.main import app
+        from maios.models.agent import AgentStatus
 
         mock_session = AsyncMock()
 
@@ -299,9 +313,12 @@ class TestSystemMetricsEndpoint:
         mock_task_result = MagicMock()
         mock_task_result.all.return_value = []
 
-        # Mock agent aggregate result
+        # Mock agent group by result (status, count, completed, failed)
         mock_agent_result = MagicMock()
-        mock_agent_result.one.return_value = MagicMock(total=5, completed=50, failed=5)
+        mock_agent_result.all.return_value = [
+            (AgentStatus.IDLE, 4, 40, 5),
+            (AgentStatus.WORKING, 1, 10, 0),
+        ]
 
         mock_session.execute.side_effect = [mock_task_result, mock_agent_result]
 
@@ -317,3 +334,130 @@ class TestSystemMetricsEndpoint:
         assert data["agents"]["tasks_completed"] == 50
         assert data["agents"]["tasks_failed"] == 5
         assert "success_rate" in data["agents"]
+
+
+def _mock_health_session(task_rows=(), agent_rows=()):
+    """Build a session mock answering the snapshot's two queries, repeatedly."""
+    session = AsyncMock()
+
+    def execute(statement):
+        result = MagicMock()
+        rows = agent_rows if "agent" in str(statement) else task_rows
+        result.all.return_value = list(rows)
+        return result
+
+    session.execute.side_effect = execute
+    return session
+
+
+class TestHealthSnapshot:
+    """Tests for serving health endpoints from the background snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_runs_two_queries_and_pings_docker_once(self):
+        """Test one refresh collects everything with two queries."""
+        from maios.api.routes.health_detailed import HealthMonitor
+        from maios.models.task import TaskStatus
+
+        session = _mock_health_session(task_rows=[(TaskStatus.IN_PROGRESS, 3)])
+        monitor = HealthMonitor()
+
+        with patch("maios.api.routes.health_detailed.sandbox_manager") as mock_manager, \
+                patch("maios.api.routes.health_detailed.async_session") as mock_async_session:
+            mock_manager.is_healthy.return_value = True
+            mock_manager.list_active_containers.return_value = [{"id": "abc"}]
+            mock_async_session.return_value.__aenter__.return_value = session
+
+            snapshot = await monitor.refresh()
+
+        assert session.execute.await_count == 2
+        assert mock_manager.is_healthy.call_count == 1
+        assert snapshot["tasks"] == {"by_status": {"in_progress": 3}, "total": 3, "active": 3}
+        assert snapshot["containers"]["items"] == [{"id": "abc"}]
+        assert snapshot["database"]["healthy"] is True
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_are_coalesced(self):
+        """Test callers arriving during a refresh share its result."""
+        import asyncio
+
+        from maios.api.routes import health_detailed
+
+        calls = 0
+        gate = asyncio.Event()
+
+        async def slow_collect():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return {"calls": calls}
+
+        monitor = health_detailed.HealthMonitor()
+        with patch.object(health_detailed, "collect_health_snapshot", slow_collect):
+            first = asyncio.create_task(monitor.refresh())
+            await asyncio.sleep(0)
+            second = asyncio.create_task(monitor.refresh())
+            await asyncio.sleep(0)
+            gate.set()
+            results = await asyncio.gather(first, second)
+
+        assert calls == 1
+        assert results[0] is results[1]
+
+    @pytest.mark.asyncio
+    async def test_endpoints_serve_snapshot_from_memory(self):
+        """Test a running monitor serves the cached snapshot until ?fresh=1."""
+        from maios.api.main import app
+        from maios.api.routes import health_detailed
+        from maios.models.agent import AgentStatus
+
+        session = _mock_health_session(agent_rows=[(AgentStatus.WORKING, 2, 7, 1)])
+        monitor = health_detailed.HealthMonitor(interval_seconds=3600)
+
+        with patch("maios.api.routes.health_detailed.sandbox_manager") as mock_manager, \
+                patch("maios.api.routes.health_detailed.async_session") as mock_async_session, \
+                patch.object(health_detailed, "health_monitor", monitor):
+            mock_manager.is_healthy.return_value = True
+            mock_manager.list_active_containers.return_value = []
+            mock_async_session.return_value.__aenter__.return_value = session
+
+            monitor.start()
+            try:
+                await monitor.refresh()
+                transport = ASGITransport(app=app)
+                async with AsyncClient(transport=transport, base_url="http://test") as client:
+                    for path in ("status", "tasks", "agents", "containers", "metrics"):
+                        response = await client.get(f"/api/health/{path}")
+                        assert response.status_code == 200
+                        assert "age_seconds" in response.json()
+                    assert session.execute.await_count == 2
+
+                    response = await client.get("/api/health/agents?fresh=1")
+            finally:
+                await monitor.stop()
+
+        assert response.json()["working"] == 2
+        assert session.execute.await_count == 4
+        assert mock_manager.is_healthy.call_count == 2
+        assert monitor.running is False
+
+    @pytest.mark.asyncio
+    async def test_database_failure_returns_503(self):
+        """Test count endpoints report an unavailable database."""
+        from maios.api.main import app
+
+        session = AsyncMock()
+        session.execute.side_effect = ConnectionError("database is down")
+
+        with patch("maios.api.routes.health_detailed.sandbox_manager") as mock_manager, \
+                patch("maios.api.routes.health_detailed.async_session") as mock_async_session:
+            mock_manager.is_healthy.return_value = False
+            mock_async_session.return_value.__aenter__.return_value = session
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                tasks = await client.get("/api/health/tasks")
+                status = await client.get("/api/health/status")
+
+        assert tasks.status_code == 503
+        assert status.json()["status"] == "unhealthy"
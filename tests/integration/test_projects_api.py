@@ -224,6 +224,49 @@ async def test_list_projects_with_pagination(client, mock_session):
     assert len(data) == 2
 
 
+@pytest.mark.asyncio
+async def test_list_projects_returns_next_cursor(client, mock_session):
+    """Test a full page returns a cursor that decodes to its last row."""
+    from datetime import datetime
+
+    from maios.api.pagination import decode_cursor
+
+    projects = []
+    for i in range(3):
+        project = MagicMock(spec=Project)
+        project.id = uuid4()
+        project.name = f"Cursor Project {i}"
+        project.description = None
+        project.status = ProjectStatus.PLANNING
+        project.initial_request = None
+        project.tech_stack = []
+        project.orchestrator_phase = "PLAN"
+        project.created_at = datetime(2024, 1, 3 - i)
+        project.updated_at = datetime(2024, 1, 3 - i)
+        projects.append(project)
+
+    mock_result = MagicMock()
+    mock_scalars = MagicMock()
+    mock_scalars.all.return_value = projects  # limit + 1 rows: another page exists
+    mock_result.scalars.return_value = mock_scalars
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    response = await client.get("/api/projects?limit=2")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+    assert decode_cursor(cursor) == (projects[1].created_at, projects[1].id)
+
+
+@pytest.mark.asyncio
+async def test_list_projects_invalid_cursor(client, mock_session):
+    """Test an invalid cursor is rejected."""
+    response = await client.get("/api/projects?cursor=garbage")
+
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_get_project(client, mock_session, mock_project):
     """Test getting a specific project by ID."""
@@ -15,3 +15,41 @@ def test_websocket_connection():
         # Receive response
         data = websocket.receive_json()
         assert data["type"] == "pong"
+
+
+def test_websocket_streams_execution_output():
+    """Test execute messages stream output chunks then a result."""
+    from unittest.mock import patch
+
+    from maios.api.main import app
+    from maios.sandbox.models import ExecutionResult
+    from maios.sandbox.streaming import ExecutionStream
+
+    def fake_stream_code(request):
+        async def start(buffer, cancel):
+            buffer.push("stdout", b"hello\n")
+            buffer.push("stderr", b"oops\n")
+            buffer.close()
+            return ExecutionResult(exit_code=0, stdout="hello\n", stderr="oops\n", duration_ms=5)
+
+        return ExecutionStream(start, max_chars=1000)
+
+    client = TestClient(app)
+
+    with patch("maios.api.websocket.sandbox_manager") as mock_manager:
+        mock_manager.stream_code.side_effect = fake_stream_code
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.send_json(
+                {"type": "execute", "id": "run-1", "language": "python", "code": "x"}
+            )
+            messages = [websocket.receive_json() for _ in range(3)]
+
+    assert [(m["type"], m.get("stream"), m.get("data")) for m in messages] == [
+        ("execution_output", "stdout", "hello\n"),
+        ("execution_output", "stderr", "oops\n"),
+        ("execution_result", None, None),
+    ]
+    assert all(m["id"] == "run-1" for m in messages)
+    assert messages[2]["exit_code"] == 0
+    assert messages[2]["dropped_chars"] == 0
@@ -0,0 +1,167 @@
+# tests/unit/test_cache.py
+"""Tests for the Redis entity cache."""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from maios.models.agent import Agent, AgentStatus
+from maios.models.schemas import AgentRead
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis client."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+class BrokenRedis:
+    """Redis client whose every call fails."""
+
+    async def get(self, key):
+        raise ConnectionError("Redis is down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("Redis is down")
+
+    async def delete(self, *keys):
+        raise ConnectionError("Redis is down")
+
+
+@pytest.fixture
+def fake_redis():
+    """Patch the cache's Redis client with an in-memory fake."""
+    redis = FakeRedis()
+    with patch("maios.core.cache.get_redis_client", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def cache():
+    """Create a fresh entity cache."""
+    from maios.core.cache import EntityCache
+
+    return EntityCache(prefix="test")
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_then_hit(fake_redis, cache):
+    """Test a cached row is returned as its read schema."""
+    agent = Agent(name="Cached", role="Developer", status=AgentStatus.WORKING)
+
+    assert await cache.get(Agent, agent.id, AgentRead) is None
+
+    await cache.set(Agent, agent, AgentRead)
+    hit = await cache.get(Agent, agent.id, AgentRead)
+
+    assert isinstance(hit, AgentRead)
+    assert hit.name == "Cached"
+    assert hit.status == AgentStatus.WORKING
+    assert cache.stats.snapshot()["hits"] == 1
+    assert cache.stats.snapshot()["misses"] == 1
+    assert cache.stats.snapshot()["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cache_entries_have_ttl_and_compact_payload(fake_redis, cache, test_env):
+    """Test entries expire by TTL and store compact JSON."""
+    agent = Agent(name="TTL", role="Developer")
+
+    await cache.set(Agent, agent, AgentRead)
+
+    key = cache.key(Agent, agent.id)
+    assert key == f"test:agent:{agent.id}"
+    assert fake_redis.ttls[key] == 60
+    assert ": " not in fake_redis.data[key]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_removes_entries(fake_redis, cache):
+    """Test invalidation drops cached rows."""
+    agents = [Agent(name=f"A{i}", role="Developer") for i in range(2)]
+    for agent in agents:
+        await cache.set(Agent, agent, AgentRead)
+
+    await cache.invalidate(Agent, *(a.id for a in agents))
+
+    assert fake_redis.data == {}
+    assert cache.stats.snapshot()["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_backs_off_when_redis_fails(cache):
+    """Test Redis errors fall through to a miss and pause the cache."""
+    with patch("maios.core.cache.get_redis_client", return_value=BrokenRedis()):
+        assert await cache.get(Agent, uuid4(), AgentRead) is None
+
+    assert cache.stats.snapshot()["errors"] == 1
+    assert cache.available is False
+
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_backoff_and_short_ttl_after(fake_redis, cache, test_env):
+    """Test invalidation ignores the backoff and entries written after an error expire soon."""
+    agent = Agent(name="Flaky", role="Developer")
+    await cache.set(Agent, agent, AgentRead)
+    with patch("maios.core.cache.get_redis_client", return_value=BrokenRedis()):
+        assert await cache.get(Agent, agent.id, AgentRead) is None
+    assert cache.available is False
+
+    await cache.invalidate(Agent, agent.id)
+    assert fake_redis.data == {}
+
+    cache._retry_at = 0.0
+    await cache.set(Agent, agent, AgentRead)
+    assert fake_redis.ttls[cache.key(Agent, agent.id)] == 5
+
+
+@pytest.mark.asyncio
+async def test_unreadable_entry_is_a_miss(fake_redis, cache):
+    """Test an entry that no longer matches the schema is dropped, not raised."""
+    agent_id = uuid4()
+    fake_redis.data[cache.key(Agent, agent_id)] = '{"name":"Old shape"}'
+
+    assert await cache.get(Agent, agent_id, AgentRead) is None
+    assert fake_redis.data == {}
+    assert cache.stats.snapshot()["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_cache_disabled_by_settings(fake_redis, cache, monkeypatch):
+    """Test the cache can be switched off entirely."""
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    import maios.core.config as config_module
+
+    config_module._settings = None
+    try:
+        agent = Agent(name="Off", role="Developer")
+        await cache.set(Agent, agent, AgentRead)
+
+        assert fake_redis.data == {}
+        assert await cache.get(Agent, agent.id, AgentRead) is None
+    finally:
+        config_module._settings = None
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [(None, True), ("max-age=0", True), ("no-cache", False), ("private, No-Store", False)],
+)
+def test_use_cache_dependency(header, expected):
+    """Test Cache-Control directives that bypass the cache."""
+    from maios.api.dependencies import use_cache
+
+    assert use_cache(header) is expected
@@ -5,3 +5,15 @@ def test_celery_app_configuration():
 
     assert app is not None
     assert app.main == "maios"
+
+
+def test_worker_flushes_memory_accesses():
+    """Test buffered memory accesses are flushed after tasks and at worker shutdown."""
+    from celery.signals import task_postrun, worker_process_shutdown
+
+    from maios.workers import celery_app
+
+    assert celery_app.flush_memory_accesses in [ref() for _, ref in task_postrun.receivers]
+    assert celery_app.flush_memory_accesses_on_shutdown in [
+        ref() for _, ref in worker_process_shutdown.receivers
+    ]
@@ -0,0 +1,83 @@
+# tests/unit/test_import_time.py
+"""Import-time budget tests.
+
+Each check runs in a fresh interpreter without MAIOS environment variables,
+so anything that builds an engine or loads settings at import time fails.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Generous wall-clock budget; the module checks below are the strict guard
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Modules that CLI startup must not pull in
+HEAVY_MODULES = [
+    "celery",
+    "docker",
+    "httpx",
+    "sqlalchemy.ext.asyncio",
+    "maios.core.database",
+]
+
+
+def _run_python(code: str) -> tuple[subprocess.CompletedProcess, float]:
+    """Run code in a clean interpreter and return the result and elapsed time."""
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("ZAI_API_KEY", "DATABASE_URL", "REDIS_URL")
+    }
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    return result, time.perf_counter() - start
+
+
+def test_cli_import_within_budget():
+    """Test importing the CLI is fast and skips heavy dependencies."""
+    result, elapsed = _run_python(
+        "import json, sys\n"
+        "import maios.cli.main\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+def test_cli_version_within_budget():
+    """Test `maios --version` runs without settings and within budget."""
+    result, elapsed = _run_python("from maios.cli.main import app\napp(['--version'])\n")
+
+    assert result.returncode == 0, result.stderr
+    assert "MAIOS" in result.stdout
+    assert elapsed < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["maios.core.database", "maios.workers.tasks", "maios.api.main"],
+)
+def test_import_does_not_create_engine(module):
+    """Test importing engine consumers neither loads settings nor builds the engine."""
+    result, _ = _run_python(
+        f"import {module}\n"
+        "import maios.core.config as config\n"
+        "import maios.core.database as database\n"
+        "assert config._settings is None, 'settings loaded at import'\n"
+        "assert database._engine is None, 'engine built at import'\n"
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -1,6 +1,7 @@
 """Tests for MemoryService."""
 
 from typing import AsyncGenerator
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import pytest
@@ -9,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
 
-from maios.models.memory import MemoryEntry, MemoryType
+from maios.models.memory import SQLITE_FTS_DDL, MemoryEntry, MemoryType
 
 
 @pytest.fixture
@@ -39,9 +40,22 @@ async def memory_session() -> AsyncGenerator[AsyncSession, None]:
                 access_count INTEGER NOT NULL DEFAULT 0,
                 last_accessed TEXT,
                 keywords TEXT NOT NULL,
-                tags TEXT NOT NULL
+                tags TEXT NOT NULL,
+                content_hash TEXT
             )
         """))
+        await conn.execute(
+            text("CREATE UNIQUE INDEX ix_memoryentry_content_hash ON memoryentry (content_hash)")
+        )
+        await conn.execute(text("""
+            CREATE TABLE sharedmemoryagent (
+                agent_id TEXT NOT NULL,
+                memory_id TEXT NOT NULL,
+                PRIMARY KEY (agent_id, memory_id)
+            )
+        """))
+        for statement in SQLITE_FTS_DDL:
+            await conn.execute(text(statement))
 
     # Create session factory
     session_factory = async_sessionmaker(
@@ -127,8 +141,241 @@ class TestMemoryServiceStore:
         procedural = await service.store("Procedural memory", memory_type=MemoryType.PROCEDURAL)
         assert procedural.memory_type == MemoryType.PROCEDURAL
 
-        working = await service.store("Working memory", memory_type=MemoryType.WORKING)
-        assert working.memory_type == MemoryType.WORKING
+
+class TestMemoryServiceStoreMany:
+    """Tests for MemoryService.store_many method."""
+
+    @pytest.mark.asyncio
+    async def test_store_many_returns_ids_in_order(self, memory_session: AsyncSession):
+        """Test that entries are stored and their ids returned in order."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        agent_id = uuid4()
+        ids = await service.store_many(
+            [
+                {"content": "First", "agent_id": agent_id, "tags": ["A", "a"]},
+                {"content": "Second", "agent_id": agent_id, "memory_type": MemoryType.SEMANTIC},
+            ]
+        )
+
+        assert len(ids) == 2
+        first = await service.get(ids[0])
+        second = await service.get(ids[1])
+        assert first.content == "First"
+        assert first.tags == ["a"]
+        assert second.memory_type == MemoryType.SEMANTIC
+        assert [m.content for m in await service.search("second")] == ["Second"]
+
+    @pytest.mark.asyncio
+    async def test_store_many_validates_before_writing(self, memory_session: AsyncSession):
+        """Test that one invalid entry stores nothing."""
+        from pydantic import ValidationError
+
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+
+        with pytest.raises(ValidationError):
+            await service.store_many([{"content": "Valid"}, {"content": "Bad", "importance": 2}])
+
+        assert await service.get_recent() == []
+        assert await service.store_many([]) == []
+
+    @pytest.mark.asyncio
+    async def test_store_many_indexes_embeddings(self, memory_session: AsyncSession):
+        """Test that embeddings passed in are searchable immediately."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        ids = await service.store_many(
+            [
+                {"content": "East", "embedding": [1.0, 0.0]},
+                {"content": "North", "embedding": [0.0, 1.0]},
+                {"content": "Unembedded"},
+            ]
+        )
+
+        results = await service.search_semantic([0.1, 1.0], k=1)
+        assert results[0][0].id == ids[1]
+
+    @pytest.mark.asyncio
+    async def test_store_many_uses_copy_for_large_postgres_imports(
+        self, memory_session: AsyncSession, monkeypatch
+    ):
+        """Test that large PostgreSQL imports without embeddings go through COPY."""
+        from unittest.mock import AsyncMock
+
+        from maios.core.memory.service import MemoryService
+
+        monkeypatch.setenv("MEMORY_COPY_THRESHOLD", "3")
+        import maios.core.config as config_module
+
+        monkeypatch.setattr(config_module, "_settings", None)
+        monkeypatch.setattr(MemoryService, "dialect", "postgresql")
+        service = MemoryService(memory_session)
+        service._copy_rows = AsyncMock()
+
+        ids = await service.store_many([{"content": f"Row {i}"} for i in range(3)])
+        rows = service._copy_rows.await_args.args[0]
+        assert [row["id"] for row in rows] == ids
+
+        service._copy_rows.reset_mock()
+        await service.store_many([{"content": "Row", "embedding": [1.0]}] * 3)
+        service._copy_rows.assert_not_awaited()
+
+
+class TestMemoryServiceSharedContent:
+    """Tests for content-addressed deduplication of shared memory types."""
+
+    @pytest.mark.asyncio
+    async def test_same_fact_from_another_agent_is_shared(self, memory_session: AsyncSession):
+        """Test that storing a fact again returns the existing entry with more importance."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        project_id, first_agent, second_agent = uuid4(), uuid4(), uuid4()
+        original = await service.store(
+            "The API runs on port 8000", memory_type=MemoryType.SEMANTIC,
+            agent_id=first_agent, project_id=project_id, importance=0.5,
+        )
+
+        again = await service.store(
+            "The API runs on port 8000", memory_type=MemoryType.SEMANTIC,
+            agent_id=second_agent, project_id=project_id, importance=0.3,
+        )
+
+        assert again.id == original.id
+        assert again.agent_id == first_agent
+        assert again.importance == pytest.approx(0.55)
+        assert again.content_hash is not None
+        assert len(await service.get_by_project(project_id)) == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_fact_stays_visible_to_each_agent(self, memory_session: AsyncSession):
+        """Test that agent-filtered reads find a fact held by another agent's entry."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        project_id, first_agent, second_agent = uuid4(), uuid4(), uuid4()
+        for agent_id in (first_agent, second_agent, second_agent):
+            memory = await service.store(
+                "Deploys need approval", memory_type=MemoryType.SEMANTIC,
+                agent_id=agent_id, project_id=project_id,
+            )
+
+        found = await service.search("approval", agent_id=second_agent)
+        assert [m.id for m in found] == [memory.id]
+        assert [m.id for m in await service.get_recent(agent_id=second_agent)] == [memory.id]
+        assert [m.id for m in await service.get_by_agent(second_agent)] == [memory.id]
+        assert [m.id async for m in service.iter_by_agent(second_agent)] == [memory.id]
+        assert await service.get_recent(agent_id=uuid4()) == []
+
+        assert await service.delete(memory.id) is True
+        links = (await memory_session.execute(text("SELECT count(*) FROM sharedmemoryagent")))
+        assert links.scalar() == 0
+
+    @pytest.mark.asyncio
+    async def test_facts_outside_projects_are_not_merged_across_agents(
+        self, memory_session: AsyncSession
+    ):
+        """Test that without a project the same fact is deduplicated per agent only."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        first_agent, second_agent = uuid4(), uuid4()
+        fact = {"content": "Prefer tabs", "memory_type": MemoryType.SEMANTIC}
+        ids = await service.store_many(
+            [
+                {**fact, "agent_id": first_agent},
+                {**fact, "agent_id": second_agent},
+                {**fact, "agent_id": first_agent},
+            ]
+        )
+
+        assert ids[0] == ids[2] != ids[1]
+        assert (await service.get(ids[1])).agent_id == second_agent
+
+    @pytest.mark.asyncio
+    async def test_scope_and_type_keep_rows_apart(self, memory_session: AsyncSession):
+        """Test that other projects, other types and episodic memories are not merged."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        project_id = uuid4()
+        ids = await service.store_many(
+            [
+                {"content": "Use UTC", "memory_type": MemoryType.SEMANTIC,
+                 "project_id": project_id},
+                {"content": "Use UTC", "memory_type": MemoryType.SEMANTIC, "project_id": uuid4()},
+                {"content": "Use UTC", "memory_type": MemoryType.SEMANTIC},
+                {"content": "Use UTC", "memory_type": MemoryType.PROCEDURAL,
+                 "project_id": project_id},
+                {"content": "Use UTC", "project_id": project_id},
+                {"content": "Use UTC", "project_id": project_id},
+            ]
+        )
+
+        assert len(set(ids)) == 6
+        episodic = await service.get(ids[-1])
+        assert episodic.content_hash is None
+
+    @pytest.mark.asyncio
+    async def test_store_many_folds_repeats_in_and_across_batches(
+        self, memory_session: AsyncSession
+    ):
+        """Test that repeats map to one id and only new contents are inserted."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        (stored,) = await service.store_many(
+            [{"content": "Known fact", "memory_type": MemoryType.SEMANTIC, "importance": 0.2}]
+        )
+
+        ids = await service.store_many(
+            [
+                {"content": "New fact", "memory_type": MemoryType.SEMANTIC, "importance": 0.4},
+                {"content": "Known fact", "memory_type": MemoryType.SEMANTIC, "importance": 0.6},
+                {"content": "New fact", "memory_type": MemoryType.SEMANTIC, "importance": 0.1},
+                {"content": "An episode"},
+            ]
+        )
+
+        assert ids[1] == stored
+        assert ids[2] == ids[0] != stored
+        memory_session.expunge_all()
+        assert (await service.get(stored)).importance == pytest.approx(0.65)
+        assert (await service.get(ids[0])).importance == pytest.approx(0.45)
+        count = (await memory_session.execute(text("SELECT count(*) FROM memoryentry"))).scalar()
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_insert_is_folded(self, memory_session: AsyncSession):
+        """Test that a fact stored between the lookup and the insert is shared, not duplicated."""
+        from unittest.mock import patch
+
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        holder = await service.store("Raced fact", memory_type=MemoryType.SEMANTIC)
+        fold = MemoryService._fold_shared
+        calls = []
+
+        async def stale_lookup(self, rows, ids):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                return rows, [], []  # As if the holder was not committed yet
+            return await fold(self, rows, ids)
+
+        with patch.object(MemoryService, "_fold_shared", stale_lookup):
+            (memory_id,) = await service.store_many(
+                [{"content": "Raced fact", "memory_type": MemoryType.SEMANTIC}]
+            )
+
+        assert memory_id == holder.id
+        assert calls == [1, 1]
+        count = (await memory_session.execute(text("SELECT count(*) FROM memoryentry"))).scalar()
+        assert count == 1
 
 
 class TestMemoryServiceGet:
@@ -182,6 +429,21 @@ class TestMemoryServiceSearch:
         assert "Python has great libraries" in contents
         assert "JavaScript is also popular" not in contents
 
+    @pytest.mark.asyncio
+    async def test_rebuild_search_index(self, memory_session: AsyncSession):
+        """Test that a rebuild restores an index out of step with its table."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Python Programming")
+        await memory_session.execute(
+            text("INSERT INTO memoryentry_fts(memoryentry_fts) VALUES ('delete-all')")
+        )
+        assert await service.search("python") == []
+
+        assert await service.rebuild_search_index() is True
+        assert [m.content for m in await service.search("python")] == ["Python Programming"]
+
     @pytest.mark.asyncio
     async def test_search_case_insensitive(self, memory_session: AsyncSession):
         """Test that search is case insensitive."""
@@ -273,6 +535,87 @@ class TestMemoryServiceSearch:
         assert len(results) == 0
 
 
+    @pytest.mark.asyncio
+    async def test_search_ranks_by_text_relevance(self, memory_session: AsyncSession):
+        """Test that stronger text matches rank above recency."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Deploy notes: the deploy script deploys the deploy bundle")
+        await service.store("Unrelated note that mentions deploy once among many other words")
+
+        results = await service.search("deploy")
+
+        assert results[0].content.startswith("Deploy notes")
+
+    @pytest.mark.asyncio
+    async def test_search_blends_importance(self, memory_session: AsyncSession):
+        """Test that importance orders equally relevant text matches."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Database migration plan", importance=0.9)
+        await service.store("Database migration plan", importance=0.1)
+
+        results = await service.search("migration plan")
+
+        assert [r.importance for r in results] == [0.9, 0.1]
+
+    @pytest.mark.asyncio
+    async def test_search_stems_and_requires_all_words(self, memory_session: AsyncSession):
+        """Test word-stem matching with every query word required."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Agents were programming the parser")
+        await service.store("Programming notes")
+
+        results = await service.search("program parsers")
+
+        assert [r.content for r in results] == ["Agents were programming the parser"]
+
+    @pytest.mark.asyncio
+    async def test_search_treats_query_syntax_literally(self, memory_session: AsyncSession):
+        """Test that FTS operators and quotes in the query are not interpreted."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Use OR and NOT carefully")
+
+        assert len(await service.search('"OR" NOT*')) == 1
+        assert await service.search("!!!") == []
+
+    @pytest.mark.asyncio
+    async def test_search_index_follows_updates_and_deletes(self, memory_session: AsyncSession):
+        """Test that the full-text index tracks content changes and deletes."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Original wording")
+        memory.content = "Revised wording"
+        await memory_session.flush()
+
+        assert await service.search("original") == []
+        assert len(await service.search("revised")) == 1
+
+        await service.delete(memory.id)
+        assert await service.search("wording") == []
+
+    def test_search_postgres_uses_tsvector(self):
+        """Test that PostgreSQL search compiles to a ranked tsvector match."""
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.schema import CreateTable
+
+        from maios.models.memory import POSTGRES_FTS_DDL
+
+        assert "GENERATED ALWAYS AS (to_tsvector('english', content)) STORED" in POSTGRES_FTS_DDL[0]
+        assert "USING gin (content_tsv)" in POSTGRES_FTS_DDL[1]
+        # Generated column is added by DDL, never selected by the ORM
+        assert "content_tsv" not in str(
+            CreateTable(MemoryEntry.__table__).compile(dialect=postgresql.dialect())
+        )
+
+
 class TestMemoryServiceGetByTags:
     """Tests for MemoryService.get_by_tags method."""
 
@@ -353,6 +696,63 @@ class TestMemoryServiceGetByTags:
         assert len(results) == 3
 
 
+    @pytest.mark.asyncio
+    async def test_get_by_tags_case_insensitive(self, memory_session: AsyncSession):
+        """Test that tags are normalized on store and in queries."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Tagged", tags=[" Important ", "important", "URGENT"])
+
+        assert memory.tags == ["important", "urgent"]
+        results = await service.get_by_tags(["IMPORTANT", "Urgent"], match_all=True)
+        assert [r.content for r in results] == ["Tagged"]
+
+    @pytest.mark.asyncio
+    async def test_get_by_tags_match_all_newest_first(self, memory_session: AsyncSession):
+        """Test that match-all results are ordered newest first and limited in the query."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        for i in range(4):
+            await service.store(f"Note {i}", tags=["a", "b", f"n{i}"])
+        await service.store("Only a", tags=["a"])
+
+        results = await service.get_by_tags(["b", "a"], match_all=True, limit=2)
+
+        assert [r.content for r in results] == ["Note 3", "Note 2"]
+
+    @pytest.mark.asyncio
+    async def test_get_by_tags_no_tags(self, memory_session: AsyncSession):
+        """Test that empty or blank tag lists match nothing."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Tagged", tags=["a"])
+
+        assert await service.get_by_tags([]) == []
+        assert await service.get_by_tags(["  "]) == []
+
+    def test_get_by_tags_postgres_uses_jsonb_operators(self):
+        """Test that PostgreSQL tag matching compiles to indexable JSONB operators."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.schema import CreateIndex
+
+        from maios.core.memory.service import tag_filter
+
+        dialect = postgresql.dialect()
+        any_sql = select(MemoryEntry).where(tag_filter(["a"], False, "postgresql"))
+        all_sql = select(MemoryEntry).where(tag_filter(["a"], True, "postgresql"))
+        assert "memoryentry.tags ?| ARRAY" in str(any_sql.compile(dialect=dialect))
+        assert "memoryentry.tags ?& ARRAY" in str(all_sql.compile(dialect=dialect))
+
+        index = next(
+            i for i in MemoryEntry.__table__.indexes if i.name == "ix_memoryentry_tags_gin"
+        )
+        assert "USING gin (tags)" in str(CreateIndex(index).compile(dialect=dialect))
+
+
 class TestMemoryServiceGetRecent:
     """Tests for MemoryService.get_recent method."""
 
@@ -484,6 +884,114 @@ class TestMemoryServiceAccess:
 
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_access_is_buffered_until_flush(self, memory_session: AsyncSession):
+        """Test that accesses are written in one batch by the tracker."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        first = await service.store("First memory")
+        second = await service.store("Second memory")
+        await memory_session.commit()
+
+        for memory_id in (first.id, first.id, second.id):
+            await service.access(memory_id)
+
+        stored = await memory_session.scalar(
+            text("SELECT access_count FROM memoryentry WHERE id = :id"), {"id": first.id.hex}
+        )
+        assert stored == 0
+
+        assert await service.access_tracker.flush() == 2
+        assert service.access_tracker.pending(first.id) == (0, None)
+
+        rows = dict(
+            (await memory_session.execute(text("SELECT id, access_count FROM memoryentry"))).all()
+        )
+        assert rows == {first.id.hex: 2, second.id.hex: 1}
+
+    @pytest.mark.asyncio
+    async def test_pending_access_not_counted_twice(self, memory_session: AsyncSession):
+        """Test that overlaid counts stay correct across flushes and reloads."""
+        from sqlalchemy import select
+
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Test memory")
+        await memory_session.commit()
+
+        await service.access(memory.id)
+        await service.access(memory.id)
+        assert (await service.get(memory.id)).access_count == 2
+
+        await service.access_tracker.flush()
+        await service.access(memory.id)
+        reloaded = await memory_session.scalar(
+            select(MemoryEntry)
+            .where(MemoryEntry.id == memory.id)
+            .execution_options(populate_existing=True)
+        )
+        assert reloaded.access_count == 2
+
+        assert (await service.get(memory.id)).access_count == 3
+        assert memory not in memory_session.dirty
+
+    @pytest.mark.asyncio
+    async def test_relevance_uses_pending_access(self, memory_session: AsyncSession):
+        """Test that relevance scoring sees accesses before they are flushed."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Test memory", importance=0.5)
+        before = memory.get_relevance_score()
+
+        for _ in range(5):
+            await service.access(memory.id)
+
+        results = await service.search("memory")
+        assert results[0].access_count == 5
+        assert results[0].get_relevance_score() > before
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_accesses(self, memory_session: AsyncSession, monkeypatch):
+        """Test that accesses survive a failed flush and are retried."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Test memory")
+        await memory_session.commit()
+        await service.access(memory.id)
+
+        tracker = service.access_tracker
+        write = tracker._write
+
+        async def failing_write(batch):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(tracker, "_write", failing_write)
+        assert await tracker.flush() == 0
+        assert tracker.pending(memory.id)[0] == 1
+
+        monkeypatch.setattr(tracker, "_write", write)
+        assert await tracker.flush() == 1
+        assert tracker.flushed == 1
+
+
+    @pytest.mark.asyncio
+    async def test_flush_access_trackers(self, memory_session: AsyncSession):
+        """Test that every engine's buffered accesses are written, as Celery does after a task."""
+        from maios.core.memory.access import flush_access_trackers
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Test memory")
+        await memory_session.commit()
+        await service.access(memory.id)
+
+        assert await flush_access_trackers() == 1
+        assert service.access_tracker.pending(memory.id) == (0, None)
+
 
 class TestMemoryServiceDelete:
     """Tests for MemoryService.delete method."""
@@ -516,6 +1024,21 @@ class TestMemoryServiceDelete:
 
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_delete_project(self, memory_session: AsyncSession):
+        """Test deleting every memory of one project."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        project_id = uuid4()
+        await service.store("First", project_id=project_id)
+        await service.store("Second", project_id=project_id)
+        other = await service.store("Other project", project_id=uuid4())
+
+        assert await service.delete_project(project_id) == 2
+        assert await service.get_by_project(project_id) == []
+        assert await service.get(other.id) is not None
+
 
 class TestMemoryServiceSetEmbedding:
     """Tests for MemoryService.set_embedding method."""
@@ -638,61 +1161,453 @@ class TestMemoryServiceGetByProject:
         assert len(results) == 5
 
 
-class TestMemoryServiceClearWorkingMemory:
-    """Tests for MemoryService.clear_working_memory method."""
+class TestMemoryServiceIterate:
+    """Tests for the streaming iter_* methods."""
+
+    @pytest.mark.asyncio
+    async def test_iter_by_agent_streams_every_row(self, memory_session: AsyncSession):
+        """Test all of an agent's memories come back newest first across fetch batches."""
+        from datetime import datetime, timedelta, timezone
+
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        agent_id = uuid4()
+        now = datetime.now(timezone.utc)
+        await service.store_many(
+            [{"content": f"Memory {i}", "agent_id": agent_id,
+              "created_at": now + timedelta(seconds=i)} for i in range(5)]
+            + [{"content": "Someone else's", "agent_id": uuid4()}]
+        )
+
+        contents = [m.content async for m in service.iter_by_agent(agent_id, fetch_size=2)]
+
+        assert contents == [f"Memory {i}" for i in reversed(range(5))]
 
     @pytest.mark.asyncio
-    async def test_clear_working_memory(self, memory_session: AsyncSession):
-        """Test clearing working memory for an agent."""
+    async def test_iter_by_project_and_all(self, memory_session: AsyncSession):
+        """Test project and whole-table scans, and stopping a scan early."""
         from maios.core.memory.service import MemoryService
 
         service = MemoryService(memory_session)
+        project_id = uuid4()
+        await service.store_many(
+            [{"content": f"Project memory {i}", "project_id": project_id} for i in range(3)]
+            + [{"content": "A fact", "memory_type": MemoryType.SEMANTIC}]
+        )
+
+        assert len([m async for m in service.iter_by_project(project_id, fetch_size=1)]) == 3
+        assert len([m async for m in service.iter_all()]) == 4
+        facts = [m.content async for m in service.iter_all(memory_type=MemoryType.SEMANTIC)]
+        assert facts == ["A fact"]
+
+        async for memory in service.iter_all(fetch_size=1):
+            break
+        # An abandoned scan leaves the session usable
+        assert len(await service.get_by_project(project_id)) == 3
+
+
+class TestMemoryServiceWorkingMemory:
+    """Tests for routing working memories to WorkingMemory."""
+
+    @pytest.fixture
+    def working(self):
+        from maios.core.memory.working import WorkingMemory
+
+        return AsyncMock(spec=WorkingMemory)
+
+    @pytest.mark.asyncio
+    async def test_store_working_memory_skips_database(
+        self, memory_session: AsyncSession, working
+    ):
+        """Test a working memory goes to the agent's working memory, not a row."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session, working=working)
+        agent_id = uuid4()
+
+        memory = await service.store(
+            "Working memory", agent_id=agent_id, memory_type=MemoryType.WORKING, tags=["Draft"]
+        )
+
+        assert memory.memory_type == MemoryType.WORKING
+        working.put_item.assert_awaited_once()
+        agent, item, session = working.put_item.await_args.args
+        assert agent == agent_id
+        assert (item.id, item.content, item.tags) == (memory.id, "Working memory", ["draft"])
+        assert session is memory_session
+        assert await service.get_by_agent(agent_id) == []
+
+    @pytest.mark.asyncio
+    async def test_store_many_routes_working_memories(
+        self, memory_session: AsyncSession, working
+    ):
+        """Test working entries of a batch keep their ids but are not inserted."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session, working=working)
         agent_id = uuid4()
 
-        await service.store("Working memory 1", agent_id=agent_id, memory_type=MemoryType.WORKING)
-        await service.store("Working memory 2", agent_id=agent_id, memory_type=MemoryType.WORKING)
-        await service.store("Episodic memory", agent_id=agent_id, memory_type=MemoryType.EPISODIC)
+        ids = await service.store_many(
+            [
+                {"content": "Scratch", "memory_type": MemoryType.WORKING, "agent_id": agent_id},
+                {"content": "Episode", "memory_type": MemoryType.EPISODIC, "agent_id": agent_id},
+            ]
+        )
 
-        count = await service.clear_working_memory(agent_id)
+        assert len(ids) == 2
+        assert working.put_item.await_args.args[1].id == ids[0]
+        stored = await service.get_by_agent(agent_id)
+        assert [memory.id for memory in stored] == [ids[1]]
+
+    @pytest.mark.asyncio
+    async def test_working_memory_needs_agent(self, memory_session: AsyncSession, working):
+        """Test a working memory without an agent is rejected before anything is written."""
+        from maios.core.memory.service import MemoryService
 
-        assert count == 2
+        service = MemoryService(memory_session, working=working)
 
-        # Verify working memories were deleted
-        results = await service.get_by_agent(agent_id)
-        assert len(results) == 1
-        assert results[0].memory_type == MemoryType.EPISODIC
+        with pytest.raises(ValueError):
+            await service.store_many(
+                [
+                    {"content": "Episode", "memory_type": MemoryType.EPISODIC},
+                    {"content": "Scratch", "memory_type": MemoryType.WORKING},
+                ]
+            )
+        working.put_item.assert_not_awaited()
+        assert await service.get_recent() == []
 
     @pytest.mark.asyncio
-    async def test_clear_working_memory_no_memories(self, memory_session: AsyncSession):
-        """Test clearing working memory when there are none."""
+    async def test_get_and_clear_working_memory(self, memory_session: AsyncSession, working):
+        """Test reads and clears are answered by the working memory."""
         from maios.core.memory.service import MemoryService
+        from maios.core.memory.working import WorkingMemoryItem
 
-        service = MemoryService(memory_session)
+        service = MemoryService(memory_session, working=working)
         agent_id = uuid4()
+        items = [WorkingMemoryItem(content="Scratch")]
+        working.get.return_value = items
+        working.clear.return_value = 1
+
+        assert await service.get_working_memory(agent_id) == items
+        assert await service.clear_working_memory(agent_id, spill=True) == 1
+        working.get.assert_awaited_once_with(agent_id)
+        working.clear.assert_awaited_once_with(agent_id, spill=True)
 
-        count = await service.clear_working_memory(agent_id)
 
-        assert count == 0
+class TestMemoryServiceSearchSemantic:
+    """Tests for MemoryService.search_semantic method."""
+
+    @pytest.mark.asyncio
+    async def test_search_semantic_orders_by_distance(self, memory_session: AsyncSession):
+        """Test that the nearest embeddings come first with their distances."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        near = await service.store("Near")
+        far = await service.store("Far")
+        opposite = await service.store("Opposite")
+        await service.store("Not embedded")
+        await service.set_embedding(near.id, [1.0, 0.1, 0.0])
+        await service.set_embedding(far.id, [0.0, 1.0, 0.0])
+        await service.set_embedding(opposite.id, [-1.0, 0.0, 0.0])
+
+        results = await service.search_semantic([1.0, 0.0, 0.0], k=3)
+
+        assert [memory.content for memory, _ in results] == ["Near", "Far", "Opposite"]
+        distances = [distance for _, distance in results]
+        # The local index scores in float32
+        assert distances[0] == pytest.approx(1 - 1 / (1.01 ** 0.5), abs=1e-6)
+        assert distances[1] == pytest.approx(1.0, abs=1e-6)
+        assert distances[2] == pytest.approx(2.0, abs=1e-6)
 
     @pytest.mark.asyncio
-    async def test_clear_working_memory_only_for_agent(self, memory_session: AsyncSession):
-        """Test that clearing working memory only affects the specified agent."""
+    async def test_search_semantic_respects_k_and_filters(self, memory_session: AsyncSession):
+        """Test that k limits results and filters narrow candidates."""
         from maios.core.memory.service import MemoryService
 
         service = MemoryService(memory_session)
         agent1 = uuid4()
         agent2 = uuid4()
+        for i in range(4):
+            memory = await service.store(
+                f"Agent 1 fact {i}", agent_id=agent1, memory_type=MemoryType.SEMANTIC
+            )
+            await service.set_embedding(memory.id, [1.0, float(i)])
+        other = await service.store(
+            "Agent 2 fact", agent_id=agent2, memory_type=MemoryType.SEMANTIC
+        )
+        await service.set_embedding(other.id, [1.0, 0.0])
 
-        await service.store("Agent 1 working", agent_id=agent1, memory_type=MemoryType.WORKING)
-        await service.store("Agent 2 working", agent_id=agent2, memory_type=MemoryType.WORKING)
+        results = await service.search_semantic([1.0, 0.0], k=2, agent_id=agent1)
+        assert [memory.content for memory, _ in results] == ["Agent 1 fact 0", "Agent 1 fact 1"]
 
-        count = await service.clear_working_memory(agent1)
+        results = await service.search_semantic(
+            [1.0, 0.0], k=10, agent_id=agent1, memory_type=MemoryType.EPISODIC
+        )
+        assert results == []
 
-        assert count == 1
+    @pytest.mark.asyncio
+    async def test_search_semantic_empty_query(self, memory_session: AsyncSession):
+        """Test that an empty embedding or k <= 0 returns nothing."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        memory = await service.store("Embedded")
+        await service.set_embedding(memory.id, [1.0, 0.0])
+
+        assert await service.search_semantic([], k=5) == []
+        assert await service.search_semantic([1.0, 0.0], k=0) == []
+
+    @pytest.mark.asyncio
+    async def test_search_semantic_skips_deleted_memories(self, memory_session: AsyncSession):
+        """Test that deleted memories leave the index."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        agent_id = uuid4()
+        kept = await service.store("Kept", agent_id=agent_id)
+        deleted = await service.store("Deleted", agent_id=agent_id)
+        for memory in (kept, deleted):
+            await service.set_embedding(memory.id, [1.0, 0.0])
+
+        await service.delete(deleted.id)
+
+        results = await service.search_semantic([1.0, 0.0], k=5)
+        assert [memory.content for memory, _ in results] == ["Kept"]
+        assert len(service.vector_index) == 1
+
+    @pytest.mark.asyncio
+    async def test_sync_vector_index_loads_existing_embeddings(self, memory_session: AsyncSession):
+        """Test that a fresh index is filled from embeddings already in the database."""
+        from maios.core.memory.service import MemoryService
+        from maios.core.memory.vector_index import VectorIndex
+
+        writer = MemoryService(memory_session, vector_index=VectorIndex())
+        for i in range(3):
+            memory = await writer.store(f"Fact {i}")
+            await writer.set_embedding(memory.id, [1.0, float(i)])
+
+        reader = MemoryService(memory_session, vector_index=VectorIndex())
+        results = await reader.search_semantic([1.0, 2.0], k=1)
+
+        assert [memory.content for memory, _ in results] == ["Fact 2"]
+        assert len(reader.vector_index) == 3
+        assert reader.vector_index.synced
+
+    def test_postgres_query_uses_vector_operator(self):
+        """Test that the embedding column and distance compile to pgvector."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.schema import CreateIndex, CreateTable
+
+        from maios.models.memory import EMBEDDING_DIMENSIONS
+
+        dialect = postgresql.dialect()
+        table = MemoryEntry.__table__
+        assert f"embedding vector({EMBEDDING_DIMENSIONS})" in str(
+            CreateTable(table).compile(dialect=dialect)
+        )
+
+        index = next(i for i in table.indexes if i.name == "ix_memoryentry_embedding_hnsw")
+        ddl = str(CreateIndex(index).compile(dialect=dialect))
+        assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+
+        stmt = select(MemoryEntry.embedding.cosine_distance([1.0, 0.0]))
+        assert "<=>" in str(stmt.compile(dialect=dialect))
+
+    def test_vector_type_round_trips_pgvector_text(self):
+        """Test conversion to and from pgvector's text format."""
+        from maios.models.types import PGVector
+
+        vector = PGVector(3)
+        assert vector.bind_processor(None)([1, 0.5, -2]) == "[1.0,0.5,-2.0]"
+        parsed = vector.result_processor(None, None)("[1,0.5,-2]")
+        assert parsed.dtype == "float32"
+        assert parsed.tolist() == [1.0, 0.5, -2.0]
+        assert vector.result_processor(None, None)(None) is None
+
+
+class TestMemoryServiceRecall:
+    """Tests for MemoryService.recall method."""
+
+    @pytest.mark.asyncio
+    async def test_recall_blends_text_and_importance(self, memory_session: AsyncSession):
+        """Test that text matches rank first and scores are broken down."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        await service.store("Lunch menu for Friday", importance=0.9)
+        match = await service.store("The database migration failed", importance=0.5)
+
+        results = await service.recall("database migration")
+
+        assert [r.memory.id for r in results][0] == match.id
+        top = results[0]
+        assert set(top.scores) == {"text", "vector", "recency", "importance", "access"}
+        assert top.scores["text"] == pytest.approx(1.0)  # Best match
+        assert top.scores["vector"] == 0
+        assert top.scores["recency"] == pytest.approx(1.0, abs=1e-3)
+        assert top.scores["importance"] == 0.5
+        assert results[1].scores["text"] == 0
+        assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_recall_uses_vector_similarity(self, memory_session: AsyncSession):
+        """Test that the nearest embedding scores highest on the vector signal."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        near, far, _ = await service.store_many(
+            [
+                {"content": "Near", "embedding": [1.0, 0.0, 0.0]},
+                {"content": "Far", "embedding": [0.0, 1.0, 0.0]},
+                {"content": "No embedding"},
+            ]
+        )
+
+        results = await service.recall(embedding=[0.9, 0.1, 0.0], k=3)
+
+        assert results[0].memory.id == near
+        assert results[0].scores["vector"] == pytest.approx(0.9939, abs=1e-3)
+        scores = {r.memory.id: r.scores["vector"] for r in results}
+        assert scores[far] == pytest.approx(0.1104, abs=1e-3)
+        assert len(results) == 3
+
+    @pytest.mark.asyncio
+    async def test_recall_weights_and_filters(self, memory_session: AsyncSession):
+        """Test that weights steer the ranking and filters scope candidates."""
+        from maios.core.memory.service import MemoryService, RecallWeights
+
+        service = MemoryService(memory_session)
+        agent_id = uuid4()
+        low = await service.store("Low", agent_id=agent_id, importance=0.1)
+        high = await service.store("High", agent_id=agent_id, importance=0.9)
+        await service.store("Other agent", agent_id=uuid4(), importance=1.0)
+
+        weights = RecallWeights(text=0, vector=0, recency=0, importance=1, access=0)
+        results = await service.recall(weights=weights, agent_id=agent_id)
+
+        assert [r.memory.id for r in results] == [high.id, low.id]
+        assert results[0].score == pytest.approx(0.9)
+        assert await service.recall(k=0) == []
+
+    @pytest.mark.asyncio
+    async def test_recall_postgres_is_one_statement(self):
+        """Test that PostgreSQL recall compiles to a single statement using both indexes."""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from sqlalchemy.dialects import postgresql
+
+        from maios.core.memory.service import MemoryService
+
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
+
+        assert await MemoryService(session).recall("deploy", embedding=[1.0, 0.0], k=5) == []
+
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "websearch_to_tsquery" in sql
+        assert "<=>" in sql
+        assert "UNION" in sql
+        assert "exp(" in sql
+
+
+class TestEmbeddingStorage:
+    """Tests for packed embedding storage and its migration."""
+
+    def test_float32_unpacks_without_copying(self):
+        """Test that float32 rows are read as a view over the stored bytes."""
+        from maios.models.types import pack_embedding, unpack_embedding
 
-        # Verify only agent1's working memory was deleted
-        agent1_memories = await service.get_by_agent(agent1)
-        agent2_memories = await service.get_by_agent(agent2)
+        raw = pack_embedding([0.25, -1.0, 3.5])
+        vector = unpack_embedding(raw)
 
-        assert len(agent1_memories) == 0
-        assert len(agent2_memories) == 1
+        assert len(raw) == 4 + 3 * 4
+        assert vector.tolist() == [0.25, -1.0, 3.5]
+        assert vector.base is raw
+        assert not vector.flags.writeable
+
+    def test_smaller_formats_round_trip_approximately(self):
+        """Test float16 and int8 sizes and their precision."""
+        import numpy as np
+
+        from maios.models.types import pack_embedding, unpack_embedding
+
+        values = np.linspace(-1, 1, 64, dtype=np.float32)
+        half = pack_embedding(values, "float16")
+        quantized = pack_embedding(values, "int8")
+
+        assert len(half) == 4 + 64 * 2
+        assert len(quantized) == 4 + 4 + 64
+        assert np.allclose(unpack_embedding(half), values, atol=1e-3)
+        assert np.allclose(unpack_embedding(quantized), values, atol=1 / 127)
+        assert unpack_embedding(pack_embedding([0.0, 0.0], "int8")).tolist() == [0.0, 0.0]
+
+        with pytest.raises(ValueError):
+            pack_embedding(values, "float64")
+
+    def test_legacy_json_text_is_readable(self):
+        """Test that rows stored as JSON arrays before packing still load."""
+        from maios.models.types import unpack_embedding
+
+        vector = unpack_embedding("[0.5, 1.5]")
+        assert vector.dtype == "float32"
+        assert vector.tolist() == [0.5, 1.5]
+
+    @pytest.mark.asyncio
+    async def test_stored_as_packed_blob(self, memory_session: AsyncSession):
+        """Test that embeddings are written as packed bytes and read back as arrays."""
+        from maios.core.memory.service import MemoryService
+
+        service = MemoryService(memory_session)
+        (memory_id,) = await service.store_many([{"content": "Packed", "embedding": [1.0, 2.0]}])
+
+        raw_type, size = (
+            await memory_session.execute(
+                text("SELECT typeof(embedding), length(embedding) FROM memoryentry")
+            )
+        ).one()
+        assert (raw_type, size) == ("blob", 4 + 2 * 4)
+
+        memory_session.expunge_all()
+        memory = await service.get(memory_id)
+        assert memory.embedding.tolist() == [1.0, 2.0]
+        assert memory.has_embedding()
+
+    @pytest.mark.asyncio
+    async def test_migrate_embeddings(self, memory_session: AsyncSession, monkeypatch):
+        """Test that JSON and other-format rows are rewritten in the configured format."""
+        from maios.core import config as config_module
+        from maios.core.memory.service import MemoryService
+        from maios.core.memory.storage import migrate_embeddings
+
+        service = MemoryService(memory_session)
+        packed, legacy = await service.store_many(
+            [
+                {"content": "Packed", "embedding": [1.0, -0.5]},
+                {"content": "Legacy", "embedding": [0.25, 0.75]},
+            ]
+        )
+        await memory_session.execute(
+            text("UPDATE memoryentry SET embedding = '[0.25, 0.75]' WHERE id = :id"),
+            {"id": legacy.hex},
+        )
+        await memory_session.commit()
+        factory = async_sessionmaker(memory_session.bind, class_=SQLModelAsyncSession)
+
+        assert await migrate_embeddings(factory) == 1
+        assert await migrate_embeddings(factory) == 0
+
+        monkeypatch.setenv("MEMORY_EMBEDDING_STORAGE", "int8")
+        monkeypatch.setattr(config_module, "_settings", None)
+        assert await migrate_embeddings(factory, batch_size=1) == 2
+
+        result = await memory_session.execute(text("SELECT id, length(embedding) FROM memoryentry"))
+        sizes = dict(result.all())
+        assert sizes == {packed.hex: 4 + 4 + 2, legacy.hex: 4 + 4 + 2}
+        memory_session.expunge_all()
+        memory = await service.get(legacy)
+        assert memory.embedding.tolist() == pytest.approx([0.25, 0.75], abs=0.01)
@@ -0,0 +1,287 @@
+"""Tests for the memory consolidation job."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from maios.core.memory.consolidation import (
+    SUMMARY_TAG,
+    ConsolidationStats,
+    MemoryConsolidator,
+)
+from maios.models.memory import MemoryEntry, MemoryType, SharedMemoryAgent
+
+
+@pytest.fixture
+async def session_factory(tmp_path, test_env) -> AsyncGenerator[async_sessionmaker, None]:
+    """File-backed SQLite database with the memoryentry table (shared across sessions)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'memory.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: MemoryEntry.__table__.create(sync_conn))
+        await conn.run_sync(lambda sync_conn: SharedMemoryAgent.__table__.create(sync_conn))
+
+    yield async_sessionmaker(engine, class_=SQLModelAsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+def _ago(**kwargs) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(**kwargs)
+
+
+async def _store(session_factory, entries: list[dict]) -> list:
+    from maios.core.memory.service import MemoryService
+
+    async with session_factory() as session:
+        ids = await MemoryService(session).store_many(entries)
+        await session.commit()
+    return ids
+
+
+async def _all(session_factory) -> list[MemoryEntry]:
+    async with session_factory() as session:
+        result = await session.execute(select(MemoryEntry).order_by(MemoryEntry.created_at))
+        return list(result.scalars())
+
+
+class TestMergeDuplicates:
+    """Tests for exact and near-duplicate merging."""
+
+    @pytest.mark.asyncio
+    async def test_identical_content_merged_per_scope(self, session_factory):
+        """Test that identical memories of one agent merge into the oldest."""
+        agent_id, other_agent = uuid4(), uuid4()
+        oldest, *_ = await _store(
+            session_factory,
+            [
+                {"content": "Deploys use blue-green", "agent_id": agent_id,
+                 "created_at": _ago(hours=3), "importance": 0.2, "tags": ["ops"]},
+                {"content": "Deploys use blue-green", "agent_id": agent_id,
+                 "created_at": _ago(hours=2), "importance": 0.8, "access_count": 2,
+                 "tags": ["deploy"]},
+                {"content": "Deploys use blue-green", "agent_id": agent_id,
+                 "created_at": _ago(hours=1), "access_count": 1},
+                {"content": "Deploys use blue-green", "agent_id": other_agent},
+            ],
+        )
+
+        stats = ConsolidationStats()
+        await MemoryConsolidator(session_factory).merge_duplicates(stats)
+
+        memories = await _all(session_factory)
+        assert stats.merged == 2
+        assert len(memories) == 2
+        keeper = next(m for m in memories if m.agent_id == agent_id)
+        assert keeper.id == oldest
+        assert keeper.importance == 0.8
+        assert keeper.access_count == 3
+        assert keeper.tags == ["ops", "deploy"]
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_embeddings_merged(self, session_factory):
+        """Test that a new memory close to an older one is folded into it."""
+        agent_id = uuid4()
+        older, _, unrelated = await _store(
+            session_factory,
+            [
+                {"content": "The API runs on port 8000", "agent_id": agent_id,
+                 "created_at": _ago(minutes=30), "embedding": [1.0, 0.0, 0.0, 0.0]},
+                {"content": "API listens on port 8000", "agent_id": agent_id,
+                 "created_at": _ago(minutes=5), "embedding": [0.99, 0.01, 0.0, 0.0],
+                 "importance": 0.9},
+                {"content": "Lunch is at noon", "agent_id": agent_id,
+                 "embedding": [0.0, 1.0, 0.0, 0.0]},
+            ],
+        )
+
+        stats = ConsolidationStats()
+        await MemoryConsolidator(session_factory).merge_near_duplicates(
+            datetime.now(timezone.utc), stats
+        )
+
+        memories = {m.id: m for m in await _all(session_factory)}
+        assert stats.near_merged == 1
+        assert set(memories) == {older, unrelated}
+        assert memories[older].importance == 0.9
+
+    @pytest.mark.asyncio
+    async def test_merged_shared_memory_keeps_its_agents(self, session_factory):
+        """Test that agents a merged shared memory was stored by can still find the keeper."""
+        from maios.core.memory.service import MemoryService
+
+        agent_id, other_agent, project_id = uuid4(), uuid4(), uuid4()
+        fact = {"content": "API listens on port 8000", "memory_type": MemoryType.SEMANTIC,
+                "project_id": project_id, "embedding": [0.99, 0.01, 0.0, 0.0]}
+        older, newer, shared = await _store(
+            session_factory,
+            [
+                {"content": "The API runs on port 8000", "memory_type": MemoryType.SEMANTIC,
+                 "agent_id": agent_id, "project_id": project_id, "created_at": _ago(minutes=30),
+                 "embedding": [1.0, 0.0, 0.0, 0.0]},
+                {**fact, "agent_id": agent_id, "created_at": _ago(minutes=5)},
+                {**fact, "agent_id": other_agent},
+            ],
+        )
+        assert shared == newer
+
+        await MemoryConsolidator(session_factory).merge_near_duplicates(
+            datetime.now(timezone.utc), ConsolidationStats()
+        )
+
+        async with session_factory() as session:
+            visible = await MemoryService(session).get_by_agent(other_agent)
+        assert [m.id for m in visible] == [older]
+
+
+class TestDecayAndPrune:
+    """Tests for importance decay and pruning."""
+
+    @pytest.mark.asyncio
+    async def test_decay_only_idle_episodic(self, session_factory):
+        """Test that idle episodic memories lose importance; others keep it."""
+        idle, recent, semantic = await _store(
+            session_factory,
+            [
+                {"content": "Idle episode", "created_at": _ago(days=2), "importance": 0.8},
+                {"content": "Recent episode", "created_at": _ago(days=2), "importance": 0.8,
+                 "last_accessed": _ago(minutes=1)},
+                {"content": "A fact", "memory_type": MemoryType.SEMANTIC,
+                 "created_at": _ago(days=2), "importance": 0.8},
+            ],
+        )
+
+        stats = ConsolidationStats()
+        await MemoryConsolidator(session_factory).decay(datetime.now(timezone.utc), stats)
+
+        memories = {m.id: m for m in await _all(session_factory)}
+        # One hourly run of a 30-day half-life
+        assert memories[idle].importance == pytest.approx(0.8 * 0.5 ** (1 / 720))
+        assert memories[recent].importance == 0.8
+        assert memories[semantic].importance == 0.8
+        assert stats.decayed == 1
+
+    @pytest.mark.asyncio
+    async def test_prune_archives_cold_episodes(self, session_factory, tmp_path, monkeypatch):
+        """Test that cold episodes are archived then deleted in batches."""
+        from maios.core import config as config_module
+
+        monkeypatch.setenv("MEMORY_ARCHIVE_DIR", str(tmp_path / "archive"))
+        monkeypatch.setattr(config_module, "_settings", None)
+
+        cold = await _store(
+            session_factory,
+            [{"content": f"Old episode {i}", "created_at": _ago(days=200), "importance": 0.01}
+             for i in range(3)],
+        )
+        warm, _ = await _store(
+            session_factory,
+            [
+                {"content": "Important old episode", "created_at": _ago(days=200),
+                 "importance": 0.9},
+                {"content": "Old fact", "memory_type": MemoryType.SEMANTIC,
+                 "created_at": _ago(days=200), "importance": 0.01},
+            ],
+        )
+
+        stats = ConsolidationStats()
+        await MemoryConsolidator(session_factory, batch_size=2).prune(
+            datetime.now(timezone.utc), stats
+        )
+
+        remaining = {m.id for m in await _all(session_factory)}
+        assert stats.pruned == 3
+        assert not remaining & set(cold)
+        assert warm in remaining and len(remaining) == 2
+
+        (archive,) = (tmp_path / "archive").iterdir()
+        archived = [json.loads(line)["id"] for line in archive.read_text().splitlines()]
+        assert sorted(archived) == sorted(str(i) for i in cold)
+        assert stats.archived == 3
+
+
+class TestSummarize:
+    """Tests for summarizing old task episodes."""
+
+    @pytest.mark.asyncio
+    async def test_old_task_episodes_become_semantic_summary(self, session_factory):
+        """Test that a task's old episodes are replaced by one summary."""
+        agent_id, task_id = uuid4(), uuid4()
+        await _store(
+            session_factory,
+            [
+                {"content": f"Step {i} of the migration", "agent_id": agent_id,
+                 "task_id": task_id, "created_at": _ago(days=10, minutes=-i),
+                 "importance": 0.1 * (i + 1), "tags": ["db"]}
+                for i in range(4)
+            ]
+            + [{"content": "Fresh step", "agent_id": agent_id, "task_id": task_id}],
+        )
+
+        stats = ConsolidationStats()
+        await MemoryConsolidator(session_factory).summarize(datetime.now(timezone.utc), stats)
+
+        memories = await _all(session_factory)
+        summary = next(m for m in memories if m.memory_type == MemoryType.SEMANTIC)
+        assert stats.summaries == 1
+        assert stats.summarized == 4
+        episodes = [m.content for m in memories if m.memory_type == MemoryType.EPISODIC]
+        assert episodes == ["Fresh step"]
+        assert summary.task_id == task_id
+        assert summary.importance == pytest.approx(0.4)
+        assert summary.tags == [SUMMARY_TAG, "db"]
+        assert summary.content.startswith("Summary of 4 episodic memories:")
+        assert "- Step 0 of the migration" in summary.content
+
+    @pytest.mark.asyncio
+    async def test_custom_summarizer(self, session_factory):
+        """Test that a summarizer can be plugged in."""
+        task_id = uuid4()
+        await _store(
+            session_factory,
+            [{"content": f"Episode {i}", "task_id": task_id, "created_at": _ago(days=30)}
+             for i in range(3)],
+        )
+        summarizer = AsyncMock(return_value="Three episodes happened")
+
+        stats = await MemoryConsolidator(session_factory, summarizer=summarizer).run()
+
+        (memory,) = await _all(session_factory)
+        assert memory.content == "Three episodes happened"
+        assert len(summarizer.await_args.args[0]) == 3
+        assert stats.summaries == 1
+
+
+class TestConsolidateMemoriesTask:
+    """Tests for the consolidation Celery task wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_skips_when_another_run_holds_the_lock(self):
+        """Test that overlapping runs are skipped."""
+        from maios.workers.memory import run_memory_consolidation
+
+        lock = MagicMock()
+        lock.acquire = AsyncMock(return_value=False)
+        client = MagicMock()
+        client.lock.return_value = lock
+
+        with patch("maios.workers.memory.get_redis_client", return_value=client), patch(
+            "maios.core.memory.consolidation.MemoryConsolidator"
+        ) as consolidator:
+            result = await run_memory_consolidation()
+
+        assert result["status"] == "skipped"
+        consolidator.assert_not_called()
+
+    def test_scheduled_by_beat(self):
+        """Test that the consolidation task is on the beat schedule."""
+        from maios.workers.celery_app import app
+
+        entry = app.conf.beat_schedule["consolidate-memories"]
+        assert entry["task"] == "maios.workers.memory.consolidate_memories"
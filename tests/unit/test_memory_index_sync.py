@@ -0,0 +1,213 @@
+# tests/unit/test_memory_index_sync.py
+"""Tests for keeping local vector indexes in step across sessions and processes."""
+
+from typing import AsyncGenerator
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from maios.core.memory import index_sync
+from maios.core.memory import service as service_module
+from maios.core.memory.index_sync import IndexChangeLog
+from maios.core.memory.service import MemoryService
+from maios.core.memory.vector_index import VectorIndex
+from maios.models.memory import MemoryEntry, SharedMemoryAgent
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((getattr(self._redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await command(*args, **kwargs) for command, args, kwargs in self._commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the stream commands used."""
+
+    def __init__(self):
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self._next = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._next += 1
+        stream = self.streams.setdefault(key, [])
+        stream.append((f"{self._next}-0", dict(fields)))
+        if maxlen is not None:
+            del stream[:-maxlen]
+        return stream[-1][0]
+
+    async def xlen(self, key):
+        return len(self.streams.get(key, []))
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        entries = self.streams.get(key, [])
+        if min.startswith("("):
+            after = index_sync._stream_id(min[1:])
+            entries = [e for e in entries if index_sync._stream_id(e[0]) > after]
+        return entries[:count]
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+
+@pytest.fixture
+def change_log(test_env, monkeypatch) -> AsyncGenerator[IndexChangeLog, None]:
+    """A change log backed by an in-memory Redis fake."""
+    log = IndexChangeLog(key="test:changes")
+    monkeypatch.setattr(service_module, "vector_index_changes", log)
+    with patch("maios.core.memory.index_sync.get_redis_client", return_value=FakeRedis()):
+        yield log
+
+
+@pytest.fixture
+async def session_factory(tmp_path, test_env) -> AsyncGenerator[async_sessionmaker, None]:
+    """File-backed SQLite database with the memory tables (shared across sessions)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'memory.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: MemoryEntry.__table__.create(sync_conn))
+        await conn.run_sync(lambda sync_conn: SharedMemoryAgent.__table__.create(sync_conn))
+
+    yield async_sessionmaker(engine, class_=SQLModelAsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+async def _store(session_factory, change_log, index, content, embedding):
+    async with session_factory() as session:
+        service = MemoryService(session, vector_index=index)
+        memory = await service.store(content)
+        await service.set_embedding(memory.id, embedding)
+        await session.commit()
+    await change_log.wait_pending()
+    return memory
+
+
+async def _search(session_factory, index, embedding):
+    async with session_factory() as session:
+        results = await MemoryService(session, vector_index=index).search_semantic(embedding, k=5)
+        return [memory.content for memory, _ in results]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_delete_stays_indexed(change_log, session_factory):
+    """Test a delete only leaves the index once it commits."""
+    index = VectorIndex()
+    memory = await _store(session_factory, change_log, index, "Kept", [1.0, 0.0])
+
+    async with session_factory() as session:
+        service = MemoryService(session, vector_index=index)
+        await service.delete(memory.id)
+        assert await service.search_semantic([1.0, 0.0], k=5) == []
+        await session.rollback()
+
+    assert await _search(session_factory, index, [1.0, 0.0]) == ["Kept"]
+    assert memory.id in index
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_embedding_leaves_index(change_log, session_factory):
+    """Test an embedding the session's own search indexed is dropped on rollback."""
+    index = VectorIndex()
+    await _store(session_factory, change_log, index, "Committed", [0.0, 1.0])
+
+    async with session_factory() as session:
+        service = MemoryService(session, vector_index=index)
+        memory = await service.store("Rolled back")
+        await service.set_embedding(memory.id, [1.0, 0.0])
+        results = await service.search_semantic([1.0, 0.0], k=1)
+        assert [m.content for m, _ in results] == ["Rolled back"]
+        await session.rollback()
+
+    assert await _search(session_factory, index, [1.0, 0.0]) == ["Committed"]
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_process_catches_up_from_log(change_log, session_factory):
+    """Test an index learns of another process's writes and deletes."""
+    writer, reader = VectorIndex(), VectorIndex()
+    await _store(session_factory, change_log, writer, "First", [1.0, 0.0])
+    assert await _search(session_factory, reader, [1.0, 0.0]) == ["First"]
+
+    second = await _store(session_factory, change_log, writer, "Second", [0.0, 1.0])
+    assert await _search(session_factory, reader, [0.0, 1.0]) == ["Second", "First"]
+    assert second.id in reader
+
+    async with session_factory() as session:
+        await MemoryService(session, vector_index=writer).delete(second.id)
+        await session.commit()
+    await change_log.wait_pending()
+
+    assert await _search(session_factory, reader, [0.0, 1.0]) == ["First"]
+    assert second.id not in reader
+
+
+@pytest.mark.asyncio
+async def test_lost_changes_reload_the_index(change_log, session_factory, monkeypatch):
+    """Test a reset marker makes a synced index reload in full."""
+    writer, reader = VectorIndex(), VectorIndex()
+    memory = await _store(session_factory, change_log, writer, "Stale", [1.0, 0.0])
+    await _search(session_factory, reader, [1.0, 0.0])
+
+    # A write whose change was never published, then one carrying a reset
+    async with session_factory() as session:
+        await session.execute(
+            update(MemoryEntry).where(MemoryEntry.id == memory.id).values(embedding=[0.0, 1.0])
+        )
+        await session.commit()
+    change_log._lost = True
+    await change_log.publish([uuid4()])
+
+    rebuilds = []
+    rebuild = MemoryService._rebuild_vector_index
+
+    async def counted_rebuild(self, index):
+        rebuilds.append(index)
+        await rebuild(self, index)
+
+    monkeypatch.setattr(MemoryService, "_rebuild_vector_index", counted_rebuild)
+    assert await _search(session_factory, reader, [0.0, 1.0]) == ["Stale"]
+    assert rebuilds == [reader]
+    assert reader.search([0.0, 1.0], k=1)[0][1] == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_read_reports_trimmed_entries(change_log, monkeypatch):
+    """Test a position the stream was trimmed past cannot list its changes."""
+    monkeypatch.setattr(index_sync, "CHANGE_LOG_MAXLEN", 2)
+    await change_log.publish([uuid4()])
+    position = (await change_log.read(None)).position
+
+    changed = uuid4()
+    await change_log.publish([changed])
+    assert (await change_log.read(position)).ids == {changed}
+
+    await change_log.publish([uuid4()])
+    await change_log.publish([uuid4()])
+    read = await change_log.read(position)
+    assert read.ids is None
+    assert read.position == "4-0"
@@ -0,0 +1,135 @@
+# tests/unit/test_memory_partitions.py
+"""Tests for optional partitioning of the memoryentry table."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from maios.core import config as config_module
+from maios.models.memory import SHARED_PARTITION, MemoryEntry, partition_for, partition_scheme
+
+
+@pytest.fixture
+def partitioning(test_env, monkeypatch):
+    """Set settings.memory_partitioning for a test."""
+
+    def configure(scheme: str) -> None:
+        monkeypatch.setenv("MEMORY_PARTITIONING", scheme)
+        monkeypatch.setattr(config_module, "_settings", None)
+
+    return configure
+
+
+def _create_ddl() -> str:
+    return str(CreateTable(MemoryEntry.__table__).compile(dialect=postgresql.dialect()))
+
+
+class TestPartitionDDL:
+    """Tests for the partitioned table and partition statements."""
+
+    def test_unpartitioned_by_default(self, test_env):
+        """Test that the table is a plain table unless partitioning is configured."""
+        assert partition_scheme() is None
+        ddl = _create_ddl()
+        assert "PARTITION BY" not in ddl
+        assert "PRIMARY KEY (id)" in ddl
+
+    def test_project_scheme(self, partitioning):
+        """Test list partitioning by project keeps ids unique, with or without a project."""
+        partitioning("project")
+        ddl = _create_ddl()
+        assert ddl.rstrip().endswith("PARTITION BY LIST (project_id)")
+        assert "UNIQUE NULLS NOT DISTINCT (id, project_id)" in ddl
+        assert "PRIMARY KEY" not in ddl
+
+    def test_time_scheme(self, partitioning):
+        """Test range partitioning by creation time widens the primary key."""
+        partitioning("time")
+        ddl = _create_ddl()
+        assert ddl.rstrip().endswith("PARTITION BY RANGE (created_at)")
+        assert "PRIMARY KEY (id, created_at)" in ddl
+
+    def test_unknown_scheme_rejected(self, partitioning):
+        """Test that a misspelt scheme fails loudly."""
+        partitioning("hash")
+        with pytest.raises(ValueError, match="hash"):
+            partition_scheme()
+
+    def test_project_partitions(self):
+        """Test one partition per project, and one for memories without a project."""
+        project_id = UUID("12345678-1234-5678-1234-567812345678")
+        name, ddl = partition_for("project", project_id, datetime.now(timezone.utc))
+
+        assert name == "memoryentry_p_12345678123456781234567812345678"
+        assert ddl.endswith(f"PARTITION OF memoryentry FOR VALUES IN ('{project_id}')")
+        assert partition_for("project", None, datetime.now(timezone.utc))[0] == SHARED_PARTITION
+
+    def test_month_partitions(self):
+        """Test monthly bounds in UTC, across a year boundary."""
+        local = timezone(timedelta(hours=-5))
+        name, ddl = partition_for("time", uuid4(), datetime(2026, 12, 31, 22, tzinfo=local))
+
+        assert name == "memoryentry_y2027m01"
+        assert ddl.endswith("FOR VALUES FROM ('2027-01-01T00:00:00') TO ('2027-02-01T00:00:00')")
+
+
+class FakeConnection:
+    """Records statements executed on a partition-management connection."""
+
+    def __init__(self, executed: list[str]):
+        self.executed = executed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.executed.append(str(statement))
+
+    async def commit(self):
+        pass
+
+
+class TestEnsurePartitions:
+    """Tests for creating partitions before memories are stored."""
+
+    @pytest.mark.asyncio
+    async def test_creates_missing_partitions_once(self, partitioning):
+        """Test each partition is created once per engine."""
+        from maios.core.memory.partitions import ensure_partitions
+
+        partitioning("project")
+        executed: list[str] = []
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        project_id = uuid4()
+        rows = [{"project_id": project_id}, {"project_id": project_id}, {"project_id": None}]
+
+        with patch("maios.core.memory.partitions.AsyncEngine") as engine:
+            engine.return_value.connect.return_value = FakeConnection(executed)
+            await ensure_partitions(session, rows)
+            await ensure_partitions(session, rows)
+
+        assert len(executed) == 2
+        assert any(project_id.hex in statement for statement in executed)
+        assert any(SHARED_PARTITION in statement for statement in executed)
+
+    @pytest.mark.asyncio
+    async def test_noop_without_postgres(self, partitioning):
+        """Test SQLite databases are never partitioned."""
+        from maios.core.memory.partitions import ensure_partitions
+
+        partitioning("project")
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "sqlite"
+
+        with patch("maios.core.memory.partitions.AsyncEngine") as engine:
+            await ensure_partitions(session, [{"project_id": uuid4()}])
+
+        engine.assert_not_called()
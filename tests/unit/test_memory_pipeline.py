@@ -0,0 +1,290 @@
+"""Tests for memory embedding providers and the batch embedding pipeline."""
+
+from typing import AsyncGenerator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from maios.core.memory.embeddings import EmbeddingProvider, HashingEmbedder
+from maios.models.memory import MemoryEntry, SharedMemoryAgent
+
+
+class FlakyEmbedder(HashingEmbedder):
+    """Fails the first ``failures`` calls, then embeds normally."""
+
+    def __init__(self, failures: int, dimensions: int = 16):
+        super().__init__(dimensions)
+        self.failures = failures
+        self.calls = 0
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("provider unavailable")
+        return await super().embed(texts)
+
+
+@pytest.fixture
+async def session_factory(tmp_path) -> AsyncGenerator[async_sessionmaker, None]:
+    """File-backed SQLite database with the memoryentry table (shared across sessions)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'memory.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: MemoryEntry.__table__.create(sync_conn))
+        await conn.run_sync(lambda sync_conn: SharedMemoryAgent.__table__.create(sync_conn))
+
+    yield async_sessionmaker(engine, class_=SQLModelAsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+async def _seed(session_factory, count: int) -> None:
+    from maios.core.memory.service import MemoryService
+
+    async with session_factory() as session:
+        service = MemoryService(session)
+        for i in range(count):
+            await service.store(f"Memory number {i} about topic {i % 3}")
+        await session.commit()
+
+
+async def _embeddings(session_factory) -> list:
+    async with session_factory() as session:
+        result = await session.execute(select(MemoryEntry.embedding))
+        return [row[0] for row in result.all()]
+
+
+class TestHashingEmbedder:
+    """Tests for HashingEmbedder."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_and_normalized(self):
+        """Test that vectors are stable, unit length and of the configured width."""
+        embedder = HashingEmbedder(dimensions=64)
+        first, second = await embedder.embed(["Deploy the API", "Deploy the API"])
+
+        assert first == second
+        assert len(first) == 64
+        assert sum(v * v for v in first) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_shared_words_are_closer(self):
+        """Test that texts sharing words have higher cosine similarity."""
+        embedder = HashingEmbedder(dimensions=256)
+        query, related, unrelated = await embedder.embed(
+            ["database migration failed", "the database migration failed again", "lunch menu today"]
+        )
+
+        def cosine(a, b):
+            return sum(x * y for x, y in zip(a, b))
+
+        assert cosine(query, related) > cosine(query, unrelated)
+
+    @pytest.mark.asyncio
+    async def test_empty_text(self):
+        """Test that text without words embeds to a zero vector."""
+        (vector,) = await HashingEmbedder(dimensions=8).embed(["!!!"])
+        assert vector == [0.0] * 8
+
+
+class TestGetEmbeddingProvider:
+    """Tests for get_embedding_provider."""
+
+    def test_registered_name(self):
+        """Test selecting a provider by registered name."""
+        from maios.core.memory.embeddings import get_embedding_provider
+        from maios.models.memory import EMBEDDING_DIMENSIONS
+
+        provider = get_embedding_provider("hashing")
+        assert isinstance(provider, HashingEmbedder)
+        assert provider.dimensions == EMBEDDING_DIMENSIONS
+
+    def test_import_path(self):
+        """Test selecting a provider class by module:Class path."""
+        from maios.core.memory.embeddings import get_embedding_provider
+
+        provider = get_embedding_provider("maios.core.memory.embeddings:HashingEmbedder")
+        assert isinstance(provider, EmbeddingProvider)
+
+    @pytest.mark.parametrize(
+        "name", ["nope", "maios.missing:Provider", "maios.core.memory.embeddings:re"]
+    )
+    def test_invalid_provider(self, name):
+        """Test that unknown or non-provider names are rejected."""
+        from maios.core.memory.embeddings import get_embedding_provider
+
+        with pytest.raises(ValueError):
+            get_embedding_provider(name)
+
+
+class TestEmbeddingPipeline:
+    """Tests for EmbeddingPipeline."""
+
+    @pytest.mark.asyncio
+    async def test_embeds_all_pending_memories(self, session_factory):
+        """Test that every memory without an embedding gets one, in batches."""
+        from maios.core.memory.pipeline import EmbeddingPipeline
+
+        await _seed(session_factory, 10)
+        pipeline = EmbeddingPipeline(
+            session_factory,
+            HashingEmbedder(dimensions=16),
+            batch_size=3,
+            concurrency=2,
+            max_batches=None,
+        )
+
+        stats = await pipeline.run()
+
+        assert stats.embedded == 10
+        assert stats.batches == 4
+        assert stats.failed == 0
+        assert not stats.more_pending
+        assert stats.snapshot()["rows_per_second"] > 0
+        embeddings = await _embeddings(session_factory)
+        assert all(e is not None and len(e) == 16 for e in embeddings)
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_max_batches(self, session_factory):
+        """Test that a capped run leaves the rest for the next run."""
+        from maios.core.memory.pipeline import EmbeddingPipeline
+
+        await _seed(session_factory, 5)
+        provider = HashingEmbedder(dimensions=16)
+
+        first = await EmbeddingPipeline(
+            session_factory, provider, batch_size=2, max_batches=1
+        ).run()
+        assert first.embedded == 2
+        assert first.more_pending
+
+        second = await EmbeddingPipeline(
+            session_factory, provider, batch_size=2, max_batches=10
+        ).run()
+        assert second.embedded == 3
+        assert not second.more_pending
+        assert all(e is not None for e in await _embeddings(session_factory))
+
+    @pytest.mark.asyncio
+    async def test_identical_contents_embedded_once(self, session_factory):
+        """Test that a batch sends each distinct content to the provider once."""
+        from maios.core.memory.pipeline import EmbeddingPipeline
+        from maios.core.memory.service import MemoryService
+
+        async with session_factory() as session:
+            await MemoryService(session).store_many(
+                [{"content": "Same episode"} for _ in range(3)] + [{"content": "Other episode"}]
+            )
+            await session.commit()
+        provider = HashingEmbedder(dimensions=16)
+        provider.embed = AsyncMock(wraps=provider.embed)
+
+        stats = await EmbeddingPipeline(session_factory, provider, batch_size=10).run()
+
+        assert stats.embedded == 4
+        assert stats.reused == 2
+        provider.embed.assert_awaited_once()
+        assert sorted(provider.embed.await_args.args[0]) == ["Other episode", "Same episode"]
+        assert all(e is not None for e in await _embeddings(session_factory))
+
+    @pytest.mark.asyncio
+    async def test_retries_provider_failures(self, session_factory, monkeypatch):
+        """Test that transient provider errors are retried."""
+        from maios.core.memory import pipeline as pipeline_module
+
+        monkeypatch.setattr(pipeline_module, "RETRY_BACKOFF_SECONDS", 0)
+        await _seed(session_factory, 2)
+        provider = FlakyEmbedder(failures=2)
+
+        stats = await pipeline_module.EmbeddingPipeline(
+            session_factory, provider, batch_size=5
+        ).run()
+
+        assert stats.embedded == 2
+        assert stats.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_on_persistent_failures(self, session_factory, monkeypatch):
+        """Test that a batch that keeps failing is counted and left pending."""
+        from maios.core.memory import pipeline as pipeline_module
+
+        monkeypatch.setattr(pipeline_module, "RETRY_BACKOFF_SECONDS", 0)
+        await _seed(session_factory, 2)
+
+        stats = await pipeline_module.EmbeddingPipeline(
+            session_factory, FlakyEmbedder(failures=10), batch_size=5
+        ).run()
+
+        assert stats.embedded == 0
+        assert stats.failed == 2
+        assert await _embeddings(session_factory) == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_embedded_memories_are_searchable(self, session_factory):
+        """Test that pipeline output feeds semantic search."""
+        from maios.core.memory.pipeline import EmbeddingPipeline
+        from maios.core.memory.service import MemoryService
+
+        await _seed(session_factory, 6)
+        provider = HashingEmbedder(dimensions=64)
+        await EmbeddingPipeline(session_factory, provider, batch_size=4).run()
+
+        (query,) = await provider.embed(["Memory number 4 about topic 1"])
+        async with session_factory() as session:
+            results = await MemoryService(session).search_semantic(query, k=1)
+
+        assert results[0][0].content == "Memory number 4 about topic 1"
+        assert results[0][1] == pytest.approx(0.0, abs=1e-5)
+
+
+class TestEmbedPendingMemoriesTask:
+    """Tests for the embedding Celery task wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_skips_when_another_run_holds_the_lock(self):
+        """Test that overlapping runs are skipped."""
+        from maios.workers.memory import run_embedding_pipeline
+
+        lock = MagicMock()
+        lock.acquire = AsyncMock(return_value=False)
+        client = MagicMock()
+        client.lock.return_value = lock
+
+        with patch("maios.workers.memory.get_redis_client", return_value=client), patch(
+            "maios.core.memory.pipeline.EmbeddingPipeline"
+        ) as pipeline:
+            result = await run_embedding_pipeline()
+
+        assert result["status"] == "skipped"
+        pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_runs_and_releases_lock(self):
+        """Test that a run reports its stats and releases the lock."""
+        from maios.core.memory.pipeline import EmbeddingRunStats
+        from maios.workers.memory import run_embedding_pipeline
+
+        lock = MagicMock()
+        lock.acquire = AsyncMock(return_value=True)
+        lock.release = AsyncMock()
+        client = MagicMock()
+        client.lock.return_value = lock
+
+        with patch("maios.workers.memory.get_redis_client", return_value=client), patch(
+            "maios.core.memory.pipeline.EmbeddingPipeline"
+        ) as pipeline:
+            pipeline.return_value.run = AsyncMock(return_value=EmbeddingRunStats(embedded=5))
+            result = await run_embedding_pipeline()
+
+        assert result["status"] == "ok"
+        assert result["embedded"] == 5
+        lock.release.assert_awaited_once()
+
+    def test_scheduled_by_beat(self):
+        """Test that the embedding task is on the beat schedule."""
+        from maios.workers.celery_app import app
+
+        entry = app.conf.beat_schedule["embed-memories"]
+        assert entry["task"] == "maios.workers.memory.embed_pending_memories"
@@ -0,0 +1,261 @@
+# tests/unit/test_memory_query_cache.py
+"""Tests for the memory query-result cache."""
+
+from typing import AsyncGenerator
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from maios.core import config as config_module
+from maios.core.memory.query_cache import MemoryQueryCache
+from maios.core.memory.service import MemoryService
+from maios.models.memory import MemoryEntry, SharedMemoryAgent
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((getattr(self._redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await command(*args, **kwargs) for command, args, kwargs in self._commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the string commands used."""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def mget(self, *keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, px=None):
+        self.store[key] = value
+        self.ttls[key] = px
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+
+class BrokenRedis:
+    async def mget(self, *keys):
+        raise ConnectionError("Redis down")
+
+    def pipeline(self, transaction=True):
+        raise ConnectionError("Redis down")
+
+
+@pytest.fixture
+def fake_redis(test_env, monkeypatch):
+    """Enable the query cache against an in-memory Redis fake."""
+    monkeypatch.setenv("MEMORY_QUERY_CACHE_TTL_SECONDS", "5")
+    monkeypatch.setattr(config_module, "_settings", None)
+    redis = FakeRedis()
+    with patch("maios.core.memory.query_cache.get_redis_client", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+async def session_factory(tmp_path, test_env) -> AsyncGenerator[async_sessionmaker, None]:
+    """File-backed SQLite database with the memoryentry table (shared across sessions)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'memory.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: MemoryEntry.__table__.create(sync_conn))
+        await conn.run_sync(lambda sync_conn: SharedMemoryAgent.__table__.create(sync_conn))
+
+    yield async_sessionmaker(engine, class_=SQLModelAsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def cache() -> MemoryQueryCache:
+    return MemoryQueryCache(prefix="test")
+
+
+async def _search(session_factory, cache, query, **filters):
+    async with session_factory() as session:
+        memories = await MemoryService(session, query_cache=cache).search(query, **filters)
+        assert all(memory in session for memory in memories)
+        return memories
+
+
+async def _store(session_factory, cache, content, **fields):
+    async with session_factory() as session:
+        memory = await MemoryService(session, query_cache=cache).store(content, **fields)
+        await session.commit()
+    await cache.wait_pending()
+    return memory
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_skips_the_database(fake_redis, session_factory, cache):
+    """Test a repeated query is answered from the cache."""
+    agent_id = uuid4()
+    stored = await _store(session_factory, cache, "Deploy with blue-green", agent_id=agent_id)
+
+    first = await _search(session_factory, cache, "deploy", agent_id=agent_id)
+    with patch.object(MemoryService, "_search") as query:
+        second = await _search(session_factory, cache, "deploy", agent_id=agent_id)
+
+    query.assert_not_called()
+    assert [m.id for m in first] == [m.id for m in second] == [stored.id]
+    assert second[0].content == "Deploy with blue-green"
+    assert second[0].agent_id == agent_id
+    assert cache.stats.snapshot()["hit_rate"] == 0.5
+    key = cache.key("search", {"agent_id": agent_id, "project_id": None, "query": "deploy",
+                               "memory_type": None, "limit": 10})
+    assert fake_redis.ttls[key] == 5000
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_their_scopes(fake_redis, session_factory, cache):
+    """Test a store expires results for its agent and unscoped queries only."""
+    agent_id, other_agent = uuid4(), uuid4()
+    await _store(session_factory, cache, "Tests run nightly", agent_id=agent_id)
+    await _search(session_factory, cache, "tests", agent_id=agent_id)
+    await _search(session_factory, cache, "tests", agent_id=other_agent)
+    await _search(session_factory, cache, "tests")
+
+    await _store(session_factory, cache, "Tests run on merge", agent_id=agent_id)
+
+    assert len(await _search(session_factory, cache, "tests", agent_id=agent_id)) == 2
+    assert len(await _search(session_factory, cache, "tests")) == 2
+    assert await _search(session_factory, cache, "tests", agent_id=other_agent) == []
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_and_recent(fake_redis, session_factory, cache):
+    """Test get_recent is cached and expired by a delete."""
+    project_id = uuid4()
+    memory = await _store(session_factory, cache, "Kickoff notes", project_id=project_id)
+
+    async with session_factory() as session:
+        service = MemoryService(session, query_cache=cache)
+        assert len(await service.get_recent(project_id=project_id)) == 1
+    async with session_factory() as session:
+        service = MemoryService(session, query_cache=cache)
+        assert await service.delete(memory.id) is True
+        await session.commit()
+    await cache.wait_pending()
+    async with session_factory() as session:
+        service = MemoryService(session, query_cache=cache)
+        assert await service.get_recent(project_id=project_id) == []
+    assert cache.stats.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidation_waits_for_commit(fake_redis, session_factory, cache):
+    """Test counters move only once a write commits, so readers cannot cache pre-commit rows."""
+    generation = cache.generation_keys(None, None)[-1]
+    async with session_factory() as session:
+        await MemoryService(session, query_cache=cache).store("Pending")
+        await session.flush()
+        await cache.wait_pending()
+        assert generation not in fake_redis.store
+
+        await _search(session_factory, cache, "pending")
+        await session.commit()
+    await cache.wait_pending()
+
+    assert fake_redis.store[generation] == "1"
+    assert [m.content for m in await _search(session_factory, cache, "pending")] == ["Pending"]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_does_not_invalidate(fake_redis, session_factory, cache):
+    """Test nothing is bumped for a write that never commits."""
+    async with session_factory() as session:
+        await MemoryService(session, query_cache=cache).store("Discarded")
+        await session.rollback()
+    await cache.wait_pending()
+
+    assert cache.stats.invalidations == 0
+
+
+@pytest.mark.asyncio
+async def test_writer_reads_its_own_writes(fake_redis, session_factory, cache):
+    """Test a service bypasses the cache once it has written."""
+    async with session_factory() as session:
+        service = MemoryService(session, query_cache=cache)
+        assert await service.get_recent() == []
+        await service.store("Uncommitted")
+        assert [m.content for m in await service.get_recent()] == ["Uncommitted"]
+        await session.rollback()
+
+    assert cache.stats.sets == 1
+
+
+@pytest.mark.asyncio
+async def test_embeddings_survive_the_cache(fake_redis, session_factory, cache):
+    """Test cached memories keep their embeddings."""
+    async with session_factory() as session:
+        await MemoryService(session, query_cache=cache).store_many(
+            [{"content": "Embedded", "embedding": [0.5, -0.25]}]
+        )
+        await session.commit()
+
+    await _search(session_factory, cache, "embedded")
+    (memory,) = await _search(session_factory, cache, "embedded")
+
+    assert cache.stats.hits == 1
+    assert memory.embedding.tolist() == [0.5, -0.25]
+
+
+@pytest.mark.asyncio
+async def test_disabled_and_backoff(test_env, cache):
+    """Test the cache is skipped at TTL 0 and backs off when Redis fails."""
+    assert await cache.get("search", None, None, query="x") is None
+
+    with patch.dict("os.environ", {"MEMORY_QUERY_CACHE_TTL_SECONDS": "5"}):
+        config_module._settings = None
+        with patch("maios.core.memory.query_cache.get_redis_client", return_value=BrokenRedis()):
+            assert await cache.get("search", None, None, query="x") is None
+            assert cache.available is False
+    assert cache.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_invalidation_bypasses_until_epoch_bump(fake_redis, cache):
+    """Test invalidations are tried during backoff, and a lost one disables lookups."""
+    cache._retry_at = float("inf")
+    with patch("maios.core.memory.query_cache.get_redis_client", return_value=BrokenRedis()):
+        await cache.invalidate([uuid4()])
+    assert cache.stats.errors == 1
+
+    cache._retry_at = 0.0
+    with patch("maios.core.memory.query_cache.get_redis_client", return_value=BrokenRedis()):
+        assert await cache.get("search", None, None, query="x") is None
+    assert cache.stats.errors == 2
+
+    cache._retry_at = 0.0
+    assert (await cache.get("search", None, None, query="x")).memories is None
+    assert fake_redis.store[f"{cache.prefix}:epoch"] == "1"
@@ -521,6 +521,22 @@ class TestMemoryModel:
         assert memory.has_embedding() is True
         assert memory.embedding == [0.1, 0.2, 0.3]
 
+    def test_memory_embedding_validates_to_array(self):
+        """Test validated embeddings are float32 arrays that serialize as lists."""
+        import json
+
+        import numpy as np
+        from pydantic import ValidationError
+
+        from maios.models.memory import MemoryEntry
+
+        memory = MemoryEntry.model_validate({"content": "Test", "embedding": [1, 0.5]})
+
+        assert memory.embedding.dtype == np.float32
+        assert json.loads(memory.model_dump_json())["embedding"] == [1.0, 0.5]
+        with pytest.raises(ValidationError):
+            MemoryEntry.model_validate({"content": "Test", "embedding": [[1.0], [0.5]]})
+
     def test_memory_type_checks(self):
         """Test memory type check methods."""
         from maios.models.memory import MemoryEntry, MemoryType
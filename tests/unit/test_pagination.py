@@ -0,0 +1,76 @@
+# tests/unit/test_pagination.py
+"""Tests for keyset pagination helpers."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from maios.api.pagination import apply_keyset, decode_cursor, encode_cursor, split_page
+from maios.models.project import Project
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes to the position it was built from."""
+    created_at = datetime(2025, 2, 12, 10, 30, 0, 123456)
+    row_id = uuid4()
+
+    cursor = encode_cursor(created_at, row_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_cursor.__name__])
+def test_decode_invalid_cursor(cursor):
+    """Test malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_split_page_without_more_rows():
+    """Test no cursor is produced when the look-ahead row is missing."""
+    rows = [Project(name=f"p{i}") for i in range(3)]
+
+    page, next_cursor = split_page(rows, limit=3)
+
+    assert page == rows
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_keyset_walks_all_rows_once():
+    """Test following cursors visits every row exactly once, newest first."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Project.__table__.create)
+
+    session_factory = async_sessionmaker(
+        engine, class_=SQLModelAsyncSession, expire_on_commit=False
+    )
+    base = datetime(2025, 1, 1)
+    async with session_factory() as session:
+        # Pairs of rows share a timestamp so the id tiebreaker is exercised
+        for i in range(7):
+            session.add(Project(name=f"p{i}", created_at=base + timedelta(minutes=i // 2)))
+        await session.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            query = apply_keyset(select(Project), Project, cursor, limit=3)
+            result = await session.execute(query)
+            page, cursor = split_page(result.scalars().all(), limit=3)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+    await engine.dispose()
+
+    assert len(seen) == 7
+    assert len({p.id for p in seen}) == 7
+    keys = [(p.created_at, p.id) for p in seen]
+    assert keys == sorted(keys, reverse=True)
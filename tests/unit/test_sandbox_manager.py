@@ -90,7 +90,7 @@ class TestSandboxManager:
             _ = manager.client
 
             assert manager is not None
-            assert manager._client is not None
+            assert manager.docker._client is not None
 
     def test_sandbox_manager_health_check(self, mock_docker_client):
         """Test SandboxManager health check."""
@@ -110,7 +110,7 @@ class TestSandboxManager:
 
             mock_from_env.side_effect = DockerException("Cannot connect")
 
-            manager = SandboxManager()
+            manager = SandboxManager(backend="docker")
             assert manager.is_healthy() is False
 
     def test_get_image_for_language(self, mock_docker_client):
@@ -147,7 +147,7 @@ class TestSandboxManager:
 
 
 class TestSandboxManagerExecute:
-    """Tests for code execution."""
+    """Tests for code execution in one-off containers."""
 
     @pytest.fixture
     def mock_docker_client(self):
@@ -204,7 +204,7 @@ class TestSandboxManagerExecute:
             from maios.sandbox.manager import SandboxManager
             from maios.sandbox.models import ExecutionRequest
 
-            manager = SandboxManager()
+            manager = SandboxManager(use_pool=False, backend="docker")
             request = ExecutionRequest(language="python", code="print('hello')")
 
             result = await manager.execute_code(request)
@@ -238,7 +238,7 @@ class TestSandboxManagerExecute:
             from maios.sandbox.manager import SandboxManager
             from maios.sandbox.models import ExecutionRequest
 
-            manager = SandboxManager()
+            manager = SandboxManager(use_pool=False, backend="docker")
             request = ExecutionRequest(language="python", code="raise Exception('error')")
 
             result = await manager.execute_code(request)
@@ -275,3 +275,493 @@ class TestGlobalSandboxManager:
         assert ContainerType is not None
         assert ExecutionRequest is not None
         assert ExecutionResult is not None
+
+
+def _slow_docker_client(delay: float) -> MagicMock:
+    """Mock Docker client whose containers take ``delay`` seconds to finish."""
+    import time
+
+    client = MagicMock()
+
+    def create(**kwargs):
+        container = MagicMock()
+        container.id = "slow-container-id"
+        container.wait.side_effect = lambda timeout=None: time.sleep(delay) or {"StatusCode": 0}
+        container.logs.return_value = b""
+        return container
+
+    client.containers.create.side_effect = create
+    return client
+
+
+class TestSandboxConcurrency:
+    """Tests for running executions off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_executions_overlap(self):
+        """Test N executions finish in about max(t) rather than sum(t)."""
+        import asyncio
+        import time
+
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        manager = SandboxManager(max_concurrent=4, use_pool=False, backend="docker")
+        manager.docker._client = _slow_docker_client(0.2)
+        request = ExecutionRequest(language="python", code="print(1)")
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(manager.execute_code(request) for _ in range(4)))
+        elapsed = time.monotonic() - start
+        manager.shutdown()
+
+        assert [r.exit_code for r in results] == [0, 0, 0, 0]
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_queues_extra_executions(self):
+        """Test executions beyond the limit wait for a free slot."""
+        import asyncio
+        import time
+
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        manager = SandboxManager(max_concurrent=2, use_pool=False, backend="docker")
+        manager.docker._client = _slow_docker_client(0.2)
+        request = ExecutionRequest(language="python", code="print(1)")
+
+        start = time.monotonic()
+        tasks = [asyncio.create_task(manager.execute_code(request)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        stats = manager.execution_stats()
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - start
+        manager.shutdown()
+
+        assert stats == {"max_concurrent": 2, "running": 2, "queued": 2}
+        assert elapsed >= 0.4
+        assert manager.execution_stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked_during_execution(self):
+        """Test the event loop keeps running while a container executes."""
+        import asyncio
+
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        manager = SandboxManager(max_concurrent=1, use_pool=False, backend="docker")
+        manager.docker._client = _slow_docker_client(0.3)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        await manager.execute_code(ExecutionRequest(language="python", code="print(1)"))
+        ticking.cancel()
+        manager.shutdown()
+
+        assert ticks >= 10
+
+
+def _warm_docker_client(exit_code: int = 0, output=(b"out\n", b"")) -> MagicMock:
+    """Mock Docker client whose containers answer exec_run."""
+    client = MagicMock()
+
+    def create(**kwargs):
+        container = MagicMock()
+        container.id = f"warm-{client.containers.create.call_count}"
+        container.exec_run.return_value = (exit_code, output)
+        client.created.append(container)
+        return container
+
+    client.created = []
+    client.containers.create.side_effect = create
+    return client
+
+
+class TestContainerPool:
+    """Tests for the warm container pool."""
+
+    def _pool(self, **kwargs):
+        from maios.sandbox.pool import ContainerPool
+
+        created = []
+
+        def factory(key):
+            container = MagicMock()
+            created.append(container)
+            return container
+
+        return ContainerPool(factory=factory, **kwargs), created
+
+    def test_released_container_is_never_reused(self):
+        """Test each container serves one run and is removed by maintenance."""
+        from maios.sandbox.models import ContainerType
+
+        pool, created = self._pool(min_size=0, max_size=2)
+        key = ("python", ContainerType.EXECUTION)
+
+        first = pool.acquire(key)
+        pool.release(first)
+        second = pool.acquire(key)
+
+        assert second is not first
+        assert not created[0].remove.called
+        pool.maintain()
+        assert created[0].remove.called
+
+        pool.release(second)
+        pool.close()
+        assert created[1].remove.called
+        stats = pool.snapshot()
+        assert (stats["hits"], stats["misses"], stats["recycled"]) == (0, 2, 2)
+
+    def test_max_size_counts_busy_containers(self):
+        """Test the per-key cap covers containers handed out but not yet released."""
+        from maios.sandbox.models import ContainerType
+
+        pool, created = self._pool(min_size=0, max_size=1)
+        key = ("python", ContainerType.EXECUTION)
+
+        pooled = pool.acquire(key)
+        assert pool.acquire(key) is None
+        pool.release(pooled)
+        assert pool.acquire(key) is not None
+
+        stats = pool.snapshot()
+        pool.close()
+        assert len(created) == 2
+        assert stats["exhausted"] == 1
+        assert stats["keys"]["python:execution"] == {"idle": 0, "busy": 1}
+
+    def test_maintain_fills_min_and_evicts_idle(self):
+        """Test maintenance replaces used containers and drops extras past the TTL."""
+        from maios.sandbox.models import ContainerType
+
+        pool, created = self._pool(min_size=2, max_size=3, idle_ttl_seconds=0)
+        key = ("python", ContainerType.EXECUTION)
+        pool.warm([key])
+        assert len(created) == 2
+
+        used = pool.acquire(key)
+        pool.release(used)
+        pool.maintain()
+        assert len(created) == 3
+        assert used.container.remove.called
+
+        pool.min_size = 1
+        pool.maintain()
+        stats = pool.snapshot()
+        pool.close()
+
+        assert stats["keys"]["python:execution"]["idle"] == 1
+        assert stats["evicted_idle"] == 1
+
+
+class TestSandboxManagerWarmExecute:
+    """Tests for code execution in warm pooled containers."""
+
+    @pytest.fixture(autouse=True)
+    def no_prewarm(self, monkeypatch):
+        """Disable background top-up so container counts are deterministic."""
+        import maios.core.config as config_module
+
+        monkeypatch.setenv("SANDBOX_POOL_MIN_SIZE", "0")
+        config_module._settings = None
+        yield
+        config_module._settings = None
+
+    @pytest.mark.asyncio
+    async def test_execute_code_uses_fresh_container_per_run(self, test_env):
+        """Test each execution execs in its own warm container."""
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        client = _warm_docker_client(output=(b"Hello, World!\n", None))
+        manager = SandboxManager(use_pool=True, backend="docker")
+        manager.docker._client = client
+        request = ExecutionRequest(language="python", code="print('hello')", timeout_seconds=5)
+
+        results = [await manager.execute_code(request) for _ in range(3)]
+        stats = manager.pool_stats()
+        manager.shutdown()
+
+        assert [r.stdout for r in results] == ["Hello, World!\n"] * 3
+        assert client.containers.create.call_count == 3
+        create_kwargs = client.containers.create.call_args[1]
+        assert create_kwargs["network_disabled"] is True
+        assert create_kwargs["command"] == ["sleep", "infinity"]
+        exec_cmd = client.created[0].exec_run.call_args[0][0]
+        assert exec_cmd == ["timeout", "-s", "KILL", "5", "python", "-c", "print('hello')"]
+        assert stats["recycled"] == 3
+
+    @pytest.mark.asyncio
+    async def test_killed_run_recycles_container(self, test_env):
+        """Test a run killed by a signal still reports its exit code."""
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        client = _warm_docker_client(exit_code=137, output=(None, b"Killed\n"))
+        manager = SandboxManager(use_pool=True, backend="docker")
+        manager.docker._client = client
+        request = ExecutionRequest(language="python", code="x = ' ' * 10**10")
+
+        result = await manager.execute_code(request)
+        await manager.execute_code(request)
+        stats = manager.pool_stats()
+        manager.shutdown()
+
+        assert result.exit_code == 137
+        assert result.error is None
+        assert client.containers.create.call_count == 2
+        assert stats["recycled"] == 2
+
+
+class TestOutputStreaming:
+    """Tests for streamed sandbox output."""
+
+    @pytest.mark.asyncio
+    async def test_output_buffer_drops_oldest_when_full(self):
+        """Test the ring buffer keeps the newest chunks within its bound."""
+        from maios.sandbox.streaming import OutputBuffer
+
+        buffer = OutputBuffer(max_chars=10)
+        for i in range(5):
+            buffer.push("stdout", f"line{i}\n".encode())
+        buffer.close()
+
+        chunks = []
+        while (chunk := await buffer.get()) is not None:
+            chunks.append(chunk)
+
+        assert [c.data for c in chunks] == ["line4\n"]
+        assert chunks[0].seq == 4
+        assert buffer.dropped_chunks == 4
+        assert buffer.tails["stdout"].text() == "ne3\nline4\n"
+
+    @pytest.mark.asyncio
+    async def test_output_buffer_decodes_split_utf8(self):
+        """Test multi-byte characters split across chunks decode intact."""
+        from maios.sandbox.streaming import OutputBuffer
+
+        data = "héllo".encode()
+        buffer = OutputBuffer(max_chars=100)
+        buffer.push("stdout", data[:2])
+        buffer.push("stdout", data[2:])
+        buffer.close()
+
+        text = ""
+        while (chunk := await buffer.get()) is not None:
+            text += chunk.data
+        assert text == "héllo"
+
+    @pytest.mark.asyncio
+    async def test_stream_code_in_warm_container(self, monkeypatch, test_env):
+        """Test exec output is streamed chunk by chunk with the exit code."""
+        import maios.core.config as config_module
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        monkeypatch.setenv("SANDBOX_POOL_MIN_SIZE", "0")
+        config_module._settings = None
+
+        client = _warm_docker_client()
+        client.api.exec_create.return_value = {"Id": "exec-1"}
+        client.api.exec_start.return_value = iter(
+            [(b"one\n", None), (None, b"warn\n"), (b"two\n", None)]
+        )
+        client.api.exec_inspect.return_value = {"ExitCode": 0}
+        manager = SandboxManager(use_pool=True, backend="docker")
+        manager.docker._client = client
+
+        stream = manager.stream_code(ExecutionRequest(language="python", code="print(1)"))
+        chunks = [(c.stream, c.data) async for c in stream]
+        manager.shutdown()
+        config_module._settings = None
+
+        assert chunks == [("stdout", "one\n"), ("stderr", "warn\n"), ("stdout", "two\n")]
+        assert stream.result.exit_code == 0
+        assert stream.result.stdout == "one\ntwo\n"
+        assert stream.result.stderr == "warn\n"
+        assert client.api.exec_start.call_args[1] == {"stream": True, "demux": True}
+
+    @pytest.mark.asyncio
+    async def test_stream_code_in_one_off_container(self):
+        """Test a one-off container's attached output is streamed and removed."""
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        client = MagicMock()
+        container = client.containers.create.return_value
+        container.attach.return_value = iter([(b"hi\n", None)])
+        container.wait.return_value = {"StatusCode": 3}
+        manager = SandboxManager(use_pool=False, backend="docker")
+        manager.docker._client = client
+
+        stream = manager.stream_code(ExecutionRequest(language="python", code="print(1)"))
+        chunks = [c.data async for c in stream]
+        manager.shutdown()
+
+        assert chunks == ["hi\n"]
+        assert stream.result.exit_code == 3
+        container.remove.assert_called_once_with(force=True)
+
+    @pytest.mark.asyncio
+    async def test_stream_code_rejects_unsupported_language(self):
+        """Test validation errors end the stream with an error result."""
+        from maios.sandbox.manager import SandboxManager
+        from maios.sandbox.models import ExecutionRequest
+
+        stream = SandboxManager().stream_code(ExecutionRequest(language="ruby", code="puts 1"))
+
+        assert [c async for c in stream] == []
+        assert "Unsupported language" in stream.result.error
+
+
+class TestSandboxBackends:
+    """Tests for backend selection and the namespace backend."""
+
+    def test_default_backend_is_docker(self, test_env, monkeypatch):
+        """Test the weaker namespace backend is never picked unless configured."""
+        import maios.core.config as config_module
+        from maios.sandbox.manager import SandboxManager
+
+        monkeypatch.delenv("SANDBOX_BACKEND", raising=False)
+        monkeypatch.setattr(config_module, "_settings", None)
+
+        manager = SandboxManager()
+        with patch.object(manager.docker, "is_healthy", return_value=False), \
+                patch.object(manager.namespace, "is_healthy", return_value=True):
+            assert manager.backend is manager.docker
+
+    def test_auto_backend_falls_back_to_namespace(self):
+        """Test auto selection prefers Docker and falls back when it is down."""
+        from maios.sandbox.manager import SandboxManager
+
+        manager = SandboxManager(backend="auto")
+        with patch.object(manager.docker, "is_healthy", return_value=False), \
+                patch.object(manager.namespace, "is_healthy", return_value=True):
+            assert manager.backend is manager.namespace
+
+        manager = SandboxManager(backend="auto")
+        with patch.object(manager.docker, "is_healthy", return_value=True):
+            assert manager.backend is manager.docker
+
+    def test_unknown_backend_is_unhealthy(self):
+        """Test a misconfigured backend name reports unhealthy."""
+        from maios.sandbox.manager import SandboxManager
+
+        manager = SandboxManager(backend="firecracker")
+        with pytest.raises(ValueError):
+            manager.backend
+        assert manager.is_healthy() is False
+
+    def test_namespace_command_applies_limits_and_isolation(self):
+        """Test the wrapped command sets rlimits and unshares namespaces."""
+        from maios.sandbox.backends.namespace import NamespaceBackend
+        from maios.sandbox.models import ContainerType
+
+        command = NamespaceBackend()._wrap(["python3", "-c", "1"], ContainerType.EXECUTION, 30)
+
+        assert command[0] == "prlimit"
+        assert f"--data={512 * 1024 * 1024}" in command
+        assert "--nproc=100" in command
+        assert "--cpu=31" in command
+        for flag in ("--user", "--net", "--pid", "--mount"):
+            assert flag in command
+        assert command[-3:] == ["python3", "-c", "1"]
+
+    def test_namespace_setup_fails_closed(self):
+        """Test the snippet is not run when / cannot be remounted read-only."""
+        from maios.sandbox.backends.namespace import SETUP_SCRIPT
+
+        assert "2>/dev/null" not in SETUP_SCRIPT
+        assert SETUP_SCRIPT.startswith("mount -o remount,bind,ro / || exit 126;")
+
+
+def _namespaces_available() -> bool:
+    from maios.sandbox.backends.namespace import NamespaceBackend
+
+    return NamespaceBackend(run_as="nobody").is_healthy()
+
+
+namespace_available = pytest.mark.skipif(
+    not _namespaces_available(), reason="Linux user namespaces not available"
+)
+
+
+@namespace_available
+class TestNamespaceExecution:
+    """Tests that run real snippets in the namespace backend."""
+
+    @pytest.fixture
+    def manager(self, test_env):
+        from maios.sandbox.manager import SandboxManager
+
+        manager = SandboxManager(backend="namespace")
+        yield manager
+        manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_python(self, manager):
+        """Test a snippet runs and reports its output and exit code."""
+        from maios.sandbox.models import ExecutionRequest
+
+        result = await manager.execute_code(ExecutionRequest(
+            language="python",
+            code="import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)",
+        ))
+
+        assert result.exit_code == 3
+        assert result.stdout == "out\n"
+        assert result.stderr == "err\n"
+
+    @pytest.mark.asyncio
+    async def test_no_network_and_private_tmp(self, manager):
+        """Test the sandbox has no network and an empty private /tmp."""
+        from maios.sandbox.models import ExecutionRequest
+
+        code = (
+            "import os, socket\n"
+            "print(os.listdir('/tmp'))\n"
+            "try:\n"
+            "    socket.create_connection(('1.1.1.1', 53), timeout=1)\n"
+            "    print('connected')\n"
+            "except OSError:\n"
+            "    print('offline')\n"
+        )
+        result = await manager.execute_code(ExecutionRequest(language="python", code=code))
+
+        assert result.stdout.splitlines() == ["[]", "offline"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_run(self, manager):
+        """Test a run past its timeout is killed."""
+        from maios.sandbox.models import ExecutionRequest
+
+        result = await manager.execute_code(ExecutionRequest(
+            language="python", code="import time; time.sleep(30)", timeout_seconds=1,
+        ))
+
+        assert result.exit_code == 137
+        assert "timed out" in result.error
+
+    @pytest.mark.asyncio
+    async def test_streams_output(self, manager):
+        """Test output is streamed from the subprocess."""
+        from maios.sandbox.models import ExecutionRequest
+
+        stream = manager.stream_code(ExecutionRequest(
+            language="python",
+            code="import time\nfor i in range(3):\n    print(i, flush=True)\n    time.sleep(0.05)",
+        ))
+        text = "".join([chunk.data async for chunk in stream])
+
+        assert text == "0\n1\n2\n"
+        assert stream.result.exit_code == 0
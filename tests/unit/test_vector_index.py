@@ -0,0 +1,156 @@
+"""Tests for the in-process memory vector index."""
+
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from maios.core.memory import vector_index as vector_index_module
+from maios.core.memory.vector_index import VectorIndex
+
+
+def _random_vectors(count: int, dimensions: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((count, dimensions)).astype(np.float32)
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex."""
+
+    def test_search_matches_brute_force(self):
+        """Test that top-k equals an exact cosine ranking."""
+        ids = [uuid4() for _ in range(500)]
+        vectors = _random_vectors(500)
+        index = VectorIndex()
+        index.add(ids, vectors)
+
+        query = _random_vectors(1, seed=1)[0]
+        results = index.search(query, k=10)
+
+        normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = normalized @ (query / np.linalg.norm(query))
+        expected = [ids[i] for i in np.argsort(-scores)[:10]]
+        assert [memory_id for memory_id, _ in results] == expected
+        assert results[0][1] == pytest.approx(1 - scores.max(), abs=1e-5)
+
+    def test_search_in_blocks(self, monkeypatch):
+        """Test that blocked scans merge per-block top-k correctly."""
+        monkeypatch.setattr(vector_index_module, "SEARCH_BLOCK_ROWS", 7)
+        ids = [uuid4() for _ in range(50)]
+        vectors = _random_vectors(50)
+        index = VectorIndex()
+        index.add(ids, vectors)
+
+        for i in (0, 13, 49):
+            assert index.search(vectors[i], k=1)[0][0] == ids[i]
+        assert len(index.search(vectors[0], k=100)) == 50
+
+    def test_add_replaces_existing_vector(self):
+        """Test that adding a known id overwrites its vector in place."""
+        memory_id = uuid4()
+        index = VectorIndex()
+        index.add([memory_id], [[1.0, 0.0]])
+        index.add([memory_id], [[0.0, 1.0]])
+
+        assert len(index) == 1
+        assert index.search([0.0, 1.0], k=1) == [(memory_id, pytest.approx(0.0, abs=1e-6))]
+
+    def test_remove_and_compact(self, monkeypatch):
+        """Test that removed vectors leave results and holes are compacted."""
+        monkeypatch.setattr(vector_index_module, "MIN_CAPACITY", 4)
+        ids = [uuid4() for _ in range(10)]
+        vectors = _random_vectors(10)
+        index = VectorIndex()
+        index.add(ids, vectors)
+
+        assert index.remove([ids[0], uuid4()]) == 1
+        assert index.holes == 1
+        assert ids[0] not in index
+        assert ids[0] not in [memory_id for memory_id, _ in index.search(vectors[0], k=10)]
+
+        index.remove(ids[1:4])
+        assert index.holes == 0  # 4 holes of 10 rows triggered compaction
+        assert len(index) == 6
+        for i in range(4, 10):
+            assert index.search(vectors[i], k=1)[0][0] == ids[i]
+
+    def test_candidates_restrict_search(self):
+        """Test that only candidate ids are scored."""
+        ids = [uuid4() for _ in range(20)]
+        vectors = _random_vectors(20)
+        index = VectorIndex()
+        index.add(ids, vectors)
+
+        results = index.search(vectors[0], k=5, candidates=[ids[3], ids[7], uuid4()])
+
+        assert {memory_id for memory_id, _ in results} == {ids[3], ids[7]}
+        assert index.search(vectors[0], k=5, candidates=[]) == []
+
+    def test_dimension_mismatch(self):
+        """Test that vectors of the wrong length are rejected and queries return nothing."""
+        index = VectorIndex()
+        index.add([uuid4()], [[1.0, 0.0, 0.0]])
+
+        with pytest.raises(ValueError):
+            index.add([uuid4()], [[1.0, 0.0]])
+        assert index.search([1.0, 0.0], k=1) == []
+        assert index.search([0.0, 0.0, 0.0], k=1) == []
+
+    def test_persists_to_memory_mapped_files(self, tmp_path, monkeypatch):
+        """Test that an index reopened from disk has the same contents."""
+        monkeypatch.setattr(vector_index_module, "MIN_CAPACITY", 4)
+        ids = [uuid4() for _ in range(10)]
+        vectors = _random_vectors(10)
+
+        index = VectorIndex(str(tmp_path))
+        index.add(ids[:3], vectors[:3])
+        index.add(ids[3:], vectors[3:])  # Grows the mapped files
+        index.remove([ids[5]])
+        index.mark_synced("1-0")
+        index.close()
+
+        reopened = VectorIndex(str(tmp_path))
+        assert reopened.dimensions == 8
+        assert reopened.log_position == "1-0"
+        assert not reopened.synced
+        assert len(reopened) == 9
+        assert ids[5] not in reopened
+        assert reopened.search(vectors[9], k=1)[0][0] == ids[9]
+
+        reopened.add([uuid4()], _random_vectors(1, seed=2))
+        assert len(reopened) == 10
+
+    def test_clear(self, tmp_path):
+        """Test that clear empties a persisted index."""
+        index = VectorIndex(str(tmp_path))
+        index.add([uuid4()], [[1.0, 0.0]])
+        index.clear()
+
+        assert len(index) == 0
+        index.close()
+        assert len(VectorIndex(str(tmp_path))) == 0
+
+    def test_directory_held_by_one_index(self, tmp_path):
+        """Test that a second index on a locked directory stays in memory."""
+        index = VectorIndex(str(tmp_path))
+        index.add([uuid4()], [[1.0, 0.0]])
+        index.flush()
+
+        second = VectorIndex(str(tmp_path))
+        assert second.path is None
+        assert len(second) == 0
+
+        index.close()
+        assert VectorIndex(str(tmp_path)).path == tmp_path
+
+
+def test_get_vector_index_per_engine():
+    """Test that each engine gets its own index."""
+
+    class Engine:
+        pass
+
+    first, second = Engine(), Engine()
+    index = vector_index_module.get_vector_index(first)
+
+    assert vector_index_module.get_vector_index(first) is index
+    assert vector_index_module.get_vector_index(second) is not index
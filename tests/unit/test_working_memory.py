@@ -0,0 +1,238 @@
+# tests/unit/test_working_memory.py
+"""Tests for the Redis working memory tier."""
+
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from maios.core.memory.working import DEFAULT_LIMIT, WorkingMemory
+from maios.models.agent import Agent
+
+
+class FakePipeline:
+    """Queues commands and runs them in order on execute."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((getattr(self._redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await command(*args, **kwargs) for command, args, kwargs in self._commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the hash and sorted-set commands used."""
+
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+        return 1
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hmget(self, key, fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hdel(self, key, *fields):
+        values = self.hashes.get(key, {})
+        return sum(values.pop(field, None) is not None for field in fields)
+
+    async def zadd(self, key, mapping, xx=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not xx or member in zset:
+                zset[member] = score
+        return len(mapping)
+
+    def _ordered(self, key):
+        return sorted(self.zsets.get(key, {}), key=lambda m: self.zsets[key][m])
+
+    async def zrange(self, key, start, end, desc=False):
+        members = self._ordered(key)
+        if desc:
+            members.reverse()
+        end = len(members) + end if end < 0 else end
+        return members[start : end + 1]
+
+    async def zremrangebyrank(self, key, start, end):
+        removed = await self.zrange(key, start, end)
+        for member in removed:
+            del self.zsets[key][member]
+        return len(removed)
+
+    async def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(member, None) is not None for member in members)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+    async def delete(self, *keys):
+        return sum(
+            (self.hashes.pop(key, None) is not None) | (self.zsets.pop(key, None) is not None)
+            for key in keys
+        )
+
+
+@pytest.fixture
+def fake_redis():
+    """Patch the working memory's Redis client with an in-memory fake."""
+    redis = FakeRedis()
+    with patch("maios.core.memory.working.get_redis_client", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+async def session_factory(test_env) -> AsyncGenerator[async_sessionmaker, None]:
+    """In-memory SQLite database with the agent table, for agents' limits."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Agent.__table__.create(sync_conn))
+
+    yield async_sessionmaker(engine, class_=SQLModelAsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def working(session_factory):
+    """Create a working memory store that does not spill."""
+    return WorkingMemory(prefix="test", spill=False, session_factory=session_factory)
+
+
+@pytest.mark.asyncio
+async def test_put_and_get_orders_by_rank(fake_redis, working):
+    """Test items come back highest-ranked first."""
+    agent_id = uuid4()
+    low = await working.put(agent_id, "low", importance=0.1)
+    high = await working.put(agent_id, "high", importance=0.9)
+
+    items = await working.get(agent_id)
+
+    assert [item.id for item in items] == [high.id, low.id]
+    assert items[0].content == "high"
+    assert await working.count(agent_id) == 2
+    assert fake_redis.ttls[working.key(agent_id)] == 86400
+
+
+@pytest.mark.asyncio
+async def test_put_evicts_beyond_agent_limit(fake_redis, working, session_factory):
+    """Test the lowest-ranked items are evicted once the agent's limit is reached."""
+    async with session_factory() as session:
+        agent = Agent(name="Scribe", role="writer", working_memory_limit=2)
+        session.add(agent)
+        await session.commit()
+    agent_id = agent.id
+
+    assert await working.limit(agent_id) == 2
+    assert await working.limit(uuid4()) == DEFAULT_LIMIT
+    await working.put(agent_id, "unimportant", importance=0.05)
+    await working.put(agent_id, "important", importance=0.9)
+    await working.put(agent_id, "newest", importance=0.5)
+
+    contents = [item.content for item in await working.get(agent_id)]
+
+    assert contents == ["important", "newest"]
+    assert len(fake_redis.hashes[working.key(agent_id)]) == 2
+
+
+def test_rank_trades_importance_for_recency(test_env):
+    """Test an item half as important ranks equal to one a half-life older."""
+    now = datetime.now(timezone.utc)
+    older = now - timedelta(seconds=600)
+
+    assert WorkingMemory.rank(0.25, now) == pytest.approx(WorkingMemory.rank(0.5, older))
+    assert WorkingMemory.rank(0.5, now) > WorkingMemory.rank(0.5, older)
+    assert WorkingMemory.rank(0.0, now) < WorkingMemory.rank(0.01, now)
+
+
+@pytest.mark.asyncio
+async def test_touch_renews_recency(fake_redis, working):
+    """Test a touched item outranks one added after it."""
+    agent_id = uuid4()
+    first = await working.put(agent_id, "first")
+    rank_key = working.rank_key(agent_id)
+    fake_redis.zsets[rank_key][str(first.id)] -= 10  # As if added long ago
+    second = await working.put(agent_id, "second")
+
+    assert await working.touch(agent_id, first.id) is True
+    assert [item.id for item in await working.get(agent_id)] == [first.id, second.id]
+    assert await working.touch(agent_id, uuid4()) is False
+
+
+@pytest.mark.asyncio
+async def test_remove_and_clear(fake_redis, working):
+    """Test single removal and clearing an agent's items."""
+    agent_id = uuid4()
+    item = await working.put(agent_id, "one")
+    await working.put(agent_id, "two")
+
+    assert await working.remove(agent_id, item.id) is True
+    assert await working.remove(agent_id, item.id) is False
+    assert await working.clear(agent_id) == 1
+    assert await working.get(agent_id) == []
+
+
+@pytest.mark.asyncio
+async def test_evicted_items_spill_to_episodic(fake_redis, test_env):
+    """Test evicted items are stored as episodic memories when spilling."""
+    stored = []
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def commit(self):
+            pass
+
+    async def store_many(self, entries):
+        stored.extend(entries)
+        return [uuid4() for _ in entries]
+
+    agent = Agent(name="Scribe", role="writer", working_memory_limit=1)
+    agent_id, project_id = agent.id, uuid4()
+    working = WorkingMemory(prefix="test", spill=True, session_factory=FakeSession)
+    with patch("maios.core.memory.service.MemoryService.store_many", store_many):
+        await working.put(agent, "evicted", importance=0.1, project_id=project_id)
+        await working.put(agent, "kept", importance=0.9)
+
+    assert [entry["content"] for entry in stored] == ["evicted"]
+    assert stored[0]["memory_type"].value == "episodic"
+    assert stored[0]["agent_id"] == agent_id
+    assert stored[0]["project_id"] == project_id